@@ -1,29 +1,249 @@
 package main
 
 import (
-	"fmt"
+	"encoding/json"
+	"flag"
 	"log"
 	"net/http"
+	"os"
+	"path/filepath"
+	"regexp"
+	"runtime"
+	"strconv"
+	"strings"
+	"sync"
 )
 
+// flushEvery bounds how many records are buffered before they are pushed to
+// the client, so the stream stays live without a syscall per game.
+const flushEvery = 64
+
+var (
+	libraryPathPattern = regexp.MustCompile(`"\d+"\s+"([^"]+)"`)
+	appidPattern       = regexp.MustCompile(`"appid"\s+"(\d+)"`)
+	namePattern        = regexp.MustCompile(`"name"\s+"([^"]+)"`)
+	installdirPattern  = regexp.MustCompile(`"installdir"\s+"([^"]+)"`)
+	sizeOnDiskPattern  = regexp.MustCompile(`"SizeOnDisk"\s+"(\d+)"`)
+)
+
+type scanRecord struct {
+	Type        string `json:"type"`
+	AppID       string `json:"appid,omitempty"`
+	Name        string `json:"name,omitempty"`
+	InstallDir  string `json:"installdir,omitempty"`
+	InstallPath string `json:"install_path,omitempty"`
+	SizeOnDisk  *int64 `json:"size_on_disk,omitempty"`
+	Steamapps   string `json:"steamapps,omitempty"`
+	Count       int    `json:"count,omitempty"`
+}
+
 func main() {
+	addr := flag.String("addr", "127.0.0.1:8080", "address the scan service listens on")
+	flag.Parse()
+
 	http.HandleFunc("/scan", scanHandler)
 
-	port := ":8080"
-	log.Printf("Go REST API server starting on port %s...\n", port)
+	log.Printf("Go scan service starting on %s...\n", *addr)
 
-	err := http.ListenAndServe(port, nil)
+	err := http.ListenAndServe(*addr, nil)
 	if err != nil {
 		log.Fatalf("Server failed to start: %v", err)
 	}
 }
 
+// scanHandler streams one NDJSON record per installed game, followed by a
+// final "done" record. Passing one or more ?steamapps= parameters skips
+// discovery and scans exactly those folders.
 func scanHandler(w http.ResponseWriter, r *http.Request) {
-
 	if r.Method != http.MethodGet {
 		http.Error(w, "Method not allowed", http.StatusMethodNotAllowed)
 		return
 	}
 
-	fmt.Fprintf(w, "Hello from Go REST API!")
+	folders := r.URL.Query()["steamapps"]
+	if len(folders) == 0 {
+		folders = findAllSteamappsFolders()
+	}
+
+	w.Header().Set("Content-Type", "application/x-ndjson")
+	flusher, _ := w.(http.Flusher)
+	encoder := json.NewEncoder(w)
+
+	count := 0
+	for record := range scanFolders(r, folders) {
+		if err := encoder.Encode(record); err != nil {
+			log.Printf("Client went away during scan: %v", err)
+			return
+		}
+		count++
+		if flusher != nil && count%flushEvery == 0 {
+			flusher.Flush()
+		}
+	}
+	encoder.Encode(scanRecord{Type: "done", Count: count})
+}
+
+func scanFolders(r *http.Request, folders []string) <-chan scanRecord {
+	manifests := make(chan [2]string)
+	records := make(chan scanRecord)
+
+	go func() {
+		defer close(manifests)
+		for _, folder := range folders {
+			paths, err := filepath.Glob(filepath.Join(folder, "appmanifest_*.acf"))
+			if err != nil {
+				continue
+			}
+			for _, path := range paths {
+				select {
+				case manifests <- [2]string{folder, path}:
+				case <-r.Context().Done():
+					return
+				}
+			}
+		}
+	}()
+
+	var workers sync.WaitGroup
+	for i := 0; i < runtime.NumCPU(); i++ {
+		workers.Add(1)
+		go func() {
+			defer workers.Done()
+			for manifest := range manifests {
+				record, ok := parseACFFile(manifest[0], manifest[1])
+				if !ok {
+					continue
+				}
+				select {
+				case records <- record:
+				case <-r.Context().Done():
+					return
+				}
+			}
+		}()
+	}
+
+	go func() {
+		workers.Wait()
+		close(records)
+	}()
+	return records
+}
+
+func parseACFFile(steamapps, path string) (scanRecord, bool) {
+	content, err := os.ReadFile(path)
+	if err != nil {
+		log.Printf("Error reading file %s: %v", path, err)
+		return scanRecord{}, false
+	}
+
+	appid := appidPattern.FindSubmatch(content)
+	name := namePattern.FindSubmatch(content)
+	if appid == nil || name == nil {
+		return scanRecord{}, false
+	}
+
+	record := scanRecord{
+		Type:      "game",
+		AppID:     string(appid[1]),
+		Name:      strings.ToValidUTF8(string(name[1]), ""),
+		Steamapps: steamapps,
+	}
+	if installdir := installdirPattern.FindSubmatch(content); installdir != nil {
+		record.InstallDir = string(installdir[1])
+		installPath := filepath.Join(steamapps, "common", record.InstallDir)
+		if info, err := os.Stat(installPath); err == nil && info.IsDir() {
+			record.InstallPath = installPath
+		}
+	}
+	if size := sizeOnDiskPattern.FindSubmatch(content); size != nil {
+		if value, err := strconv.ParseInt(string(size[1]), 10, 64); err == nil {
+			record.SizeOnDisk = &value
+		}
+	}
+	return record, true
+}
+
+func parseLibraryFoldersVDF(path string) []string {
+	content, err := os.ReadFile(path)
+	if err != nil {
+		log.Printf("Error reading file %s: %v", path, err)
+		return nil
+	}
+
+	var libraries []string
+	for _, match := range libraryPathPattern.FindAllSubmatch(content, -1) {
+		libraryPath := strings.ReplaceAll(string(match[1]), `\\`, string(os.PathSeparator))
+		libraries = append(libraries, filepath.Join(libraryPath, "steamapps"))
+	}
+	return libraries
+}
+
+func isDir(path string) bool {
+	info, err := os.Stat(path)
+	return err == nil && info.IsDir()
+}
+
+func findAllSteamappsFolders() []string {
+	found := map[string]bool{}
+	var mainSteamFolders []string
+
+	var candidates []string
+	var commonScanPaths []string
+	home, _ := os.UserHomeDir()
+
+	switch runtime.GOOS {
+	case "windows":
+		candidates = []string{`C:\Program Files (x86)\Steam`, `C:\Program Files\Steam`}
+		for _, drive := range "CDEFGHIJKLMNOPQRSTUVWXYZ" {
+			root := string(drive) + `:\`
+			commonScanPaths = append(commonScanPaths,
+				root+"Steam", root+"SteamLibrary", root+`Games\Steam`, root+"Games")
+		}
+	case "darwin":
+		candidates = []string{filepath.Join(home, "Library", "Application Support", "Steam")}
+		commonScanPaths = []string{"/Applications/Steam.app/Contents/SteamOS"}
+	default:
+		candidates = []string{
+			filepath.Join(home, ".steam", "steam"),
+			filepath.Join(home, ".local", "share", "Steam"),
+		}
+		commonScanPaths = []string{"/opt/steam", "/usr/share/steam", "/mnt", "/media"}
+	}
+
+	for _, candidate := range candidates {
+		steamapps := filepath.Join(candidate, "steamapps")
+		if isDir(steamapps) {
+			log.Printf("Found primary Steam folder: %s", candidate)
+			found[steamapps] = true
+			mainSteamFolders = append(mainSteamFolders, candidate)
+			break
+		}
+	}
+
+	for _, mainFolder := range mainSteamFolders {
+		vdfPath := filepath.Join(mainFolder, "steamapps", "libraryfolders.vdf")
+		for _, library := range parseLibraryFoldersVDF(vdfPath) {
+			if isDir(library) {
+				found[library] = true
+			}
+		}
+	}
+
+	for _, scanPath := range commonScanPaths {
+		if !isDir(scanPath) {
+			continue
+		}
+		if strings.EqualFold(filepath.Base(scanPath), "steamapps") {
+			found[scanPath] = true
+		} else if steamapps := filepath.Join(scanPath, "steamapps"); isDir(steamapps) {
+			found[steamapps] = true
+		}
+	}
+
+	folders := make([]string, 0, len(found))
+	for folder := range found {
+		folders = append(folders, folder)
+	}
+	return folders
 }
@@ -0,0 +1,137 @@
+"""Frame cost of flinging through a gallery of thousands of cover tiles.
+
+Runs offscreen. Every scroller frame moves the gallery and paints the viewport
+before the next frame is timed, so the numbers include layout, cover prefetch
+and painting, not just timer jitter.
+
+Usage (from python_modules): python -m benchmarks.gallery_scroll_frames [--tiles N] [--flings N]
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+try:
+    from PyQt6.QtCore import QEvent, QEventLoop, QObject, QTimer, pyqtSignal
+    from PyQt6.QtGui import QColor, QPixmap
+    from PyQt6.QtWidgets import QApplication
+except ImportError:
+    sys.exit("PyQt6 is required for this benchmark.")
+
+from core.pixmap_budget import PixmapBudget
+from data.game_record import Game
+from ui.game_list_page import GameListPage
+from utils.constants import PIXMAP_BUDGET_BYTES, THUMBNAIL_TILE_SIZES
+
+VIEWPORT_SIZE = (1280, 720)
+COVER_COLOURS = ('#3b5998', '#8b0000', '#2e8b57', '#daa520', '#4b0082', '#708090')
+
+class CoverServer(QObject):
+    """The parts of GameManager the gallery uses, serving covers from memory."""
+    request_display_cover = pyqtSignal(str, QObject, str, bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pixmap_budget = PixmapBudget(PIXMAP_BUDGET_BYTES, self)
+        self.cover_requests = 0
+        self._covers = []
+        for colour in COVER_COLOURS:
+            pixmap = QPixmap(*THUMBNAIL_TILE_SIZES['thumbnail'])
+            pixmap.fill(QColor(colour))
+            self._covers.append(pixmap)
+        self.request_display_cover.connect(self._display_cover)
+
+    def _display_cover(self, appid, target_label, cover_type, is_thumbnail):
+        self.cover_requests += 1
+        target_label.setOriginalPixmap(self._covers[int(appid) % len(self._covers)])
+        self.pixmap_budget.track(target_label)
+
+    def prefetch_game_details(self, appid):
+        pass
+
+def build_gallery(tile_count):
+    cover_server = CoverServer()
+    page = GameListPage(cover_server)
+    page.resize(*VIEWPORT_SIZE)
+    page.show()
+    page.display_games([Game(appid=appid, name=f"Game {appid}") for appid in range(1, tile_count + 1)])
+    page._flush_pending_diff()
+    QApplication.processEvents()
+    return cover_server, page
+
+def time_frames(page):
+    """Wraps the scroll bar so every frame's move is followed by a synchronous paint."""
+    scroll_bar = page.scroll_area.horizontalScrollBar()
+    viewport = page.scroll_area.viewport()
+    set_value = scroll_bar.setValue
+    frame_ms, paint_ms = [], []
+
+    def timed_set_value(value):
+        started = time.perf_counter()
+        set_value(value)
+        painted = time.perf_counter()
+        viewport.repaint()
+        finished = time.perf_counter()
+        frame_ms.append((finished - started) * 1000)
+        paint_ms.append((finished - painted) * 1000)
+
+    scroll_bar.setValue = timed_set_value
+    return frame_ms, paint_ms
+
+def fling(page, distance, notches):
+    """Queues a burst of wheel-sized scroll_by calls and waits for the glide to settle."""
+    loop = QEventLoop()
+    page.scroller.settled.connect(loop.quit)
+    for notch in range(notches):
+        QTimer.singleShot(notch * 8, lambda: page.scroller.scroll_by(distance / notches))
+    loop.exec()
+    page.scroller.settled.disconnect(loop.quit)
+
+def summarize(label, samples, budget_ms):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    late = sum(1 for sample in samples if sample > budget_ms)
+    print(f"  {label}: mean {sum(samples) / len(samples):6.2f} ms  p95 {p95:6.2f} ms  "
+          f"max {samples[-1]:6.2f} ms  over budget {late}")
+    return p95
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tiles', type=int, default=3000)
+    parser.add_argument('--flings', type=int, default=10)
+    parser.add_argument('--fling-pixels', type=int, default=8000)
+    parser.add_argument('--budget-ms', type=float, default=1000 / 60,
+                        help="fail when the 95th percentile frame takes longer than this")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    started = time.perf_counter()
+    cover_server, page = build_gallery(args.tiles)
+    print(f"{args.tiles} tiles laid out in {time.perf_counter() - started:.2f} s")
+
+    frame_ms, paint_ms = time_frames(page)
+    started = time.perf_counter()
+    for index in range(args.flings):
+        # Alternate direction so the flings stay inside the gallery.
+        direction = 1 if index % 2 == 0 else -1
+        fling(page, direction * args.fling_pixels, notches=6)
+    elapsed = time.perf_counter() - started
+
+    if not frame_ms:
+        sys.exit("The scroller never moved; is the gallery wider than the viewport?")
+    usage = cover_server.pixmap_budget.usage()
+    print(f"{args.flings} flings, {len(frame_ms)} frames in {elapsed:.2f} s, "
+          f"{cover_server.cover_requests} cover loads, {usage['bytes'] / 2**20:.1f} MB of pixmaps")
+    p95 = summarize("frame", frame_ms, args.budget_ms)
+    summarize("paint", paint_ms, args.budget_ms)
+
+    # Tear the tiles down while the budget they report to is still alive.
+    page.close()
+    page.deleteLater()
+    app.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    sys.exit(1 if p95 > args.budget_ms else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Memory and access cost of loading the library as Game records versus plain dicts.
+
+Usage (from python_modules): python -m benchmarks.game_record_memory [--sizes 10000 100000]
+"""
+import argparse
+import gc
+import random
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from data.db_manager import DBManager
+from data.game_record import Game
+
+GENRES = ("Action", "Adventure", "RPG", "Strategy", "Simulation", "Puzzle", "Indie", "Shooter", "Platform")
+PLATFORMS = ("PC (Microsoft Windows)", "Linux", "Mac", "PlayStation 4", "Xbox One", "Nintendo Switch")
+
+def populate(db_manager, count):
+    rng = random.Random(count)
+    rows = []
+    for appid in range(1, count + 1):
+        rows.append((
+            appid, f"Game {appid}", "A short summary of the game. " * 4,
+            ", ".join(rng.sample(GENRES, 3)), ", ".join(rng.sample(PLATFORMS, 2)),
+            f"/games/steamapps/common/game_{appid}",
+            f"/home/user/.EchoGL/covers/{appid}_thumbnail.jpg",
+            f"/home/user/.EchoGL/covers/{appid}_detail.jpg",
+            str(appid),
+        ))
+    with db_manager.conn:
+        db_manager.conn.executemany('''
+            INSERT INTO games (appid, name, summary, genres, platforms, install_path,
+                               cover_thumbnail_path, cover_detail_path, external_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+
+def load_dicts(db_manager):
+    cursor = db_manager.conn.cursor()
+    cursor.row_factory = sqlite3.Row
+    cursor.execute('SELECT * FROM games')
+    return [dict(row) for row in cursor.fetchall()]
+
+def load_games(db_manager):
+    return db_manager.get_all_games()
+
+def measure(loader, db_manager):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    records = loader(db_manager)
+    elapsed = time.perf_counter() - started
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return records, retained, elapsed
+
+def access_time(records, is_dict):
+    started = time.perf_counter()
+    if is_dict:
+        for record in records:
+            record['name'], record['genres'], record['cover_thumbnail_path']
+    else:
+        for record in records:
+            record.name, record.genres, record.cover_thumbnail_path
+    return time.perf_counter() - started
+
+def run(count):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DBManager(Path(tmp) / "games.db")
+        try:
+            populate(db_manager, count)
+            results = {}
+            for label, loader in (('dict', load_dicts), ('Game', load_games)):
+                records, retained, elapsed = measure(loader, db_manager)
+                results[label] = (retained, elapsed, access_time(records, label == 'dict'))
+                del records
+        finally:
+            db_manager.close()
+
+    print(f"{count} games:")
+    for label, (retained, elapsed, access) in results.items():
+        print(f"  {label:>5}: {retained / count:7.0f} B/game, {retained / 1024 ** 2:7.1f} MiB total, "
+              f"load {elapsed * 1000:7.1f} ms, 3-field access {access * 1000:6.1f} ms")
+    saved = 1 - results['Game'][0] / results['dict'][0]
+    print(f"  Game records use {saved:.0%} less memory than dict rows")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+    for count in args.sizes:
+        run(count)
+
+if __name__ == '__main__':
+    main()
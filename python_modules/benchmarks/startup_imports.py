@@ -0,0 +1,65 @@
+"""Import-time cost of everything loaded before the main window is shown.
+
+Usage (from python_modules): python -m benchmarks.startup_imports [--module ui.main_window] [--budget-ms N]
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+PYTHON_MODULES_DIR = Path(__file__).resolve().parent.parent
+
+# Loaded on first use; none of these may be imported on the way to the first paint.
+DEFERRED_MODULES = (
+    'requests', 'PIL', 'dotenv', 'numpy', 'psutil',
+    'utils.metadata_updater', 'utils.igdb_api_client', 'data.similarity_index',
+)
+
+def profile_imports(module, env=None):
+    """Returns {module name: (self_us, cumulative_us)} for a fresh `import module`."""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=PYTHON_MODULES_DIR, env=env, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr}")
+
+    timings = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+def loaded_deferred_modules(timings):
+    return [deferred for deferred in DEFERRED_MODULES if deferred in timings]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--module', default='ui.main_window')
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help="fail when importing the module takes longer than this")
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    timings = profile_imports(args.module)
+    total_ms = timings[args.module][1] / 1000
+    print(f"import {args.module}: {total_ms:.1f} ms cumulative, {len(timings)} modules loaded")
+    print(f"Slowest {args.top} modules by self time:")
+    for name, (self_us, cumulative_us) in sorted(timings.items(), key=lambda item: item[1][0],
+                                                 reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:7.1f} ms self {cumulative_us / 1000:8.1f} ms cumulative  {name}")
+
+    failed = False
+    deferred = loaded_deferred_modules(timings)
+    if deferred:
+        print(f"Loaded before the window is shown but should be deferred: {', '.join(deferred)}")
+        failed = True
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"Over the {args.budget_ms:.0f} ms budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
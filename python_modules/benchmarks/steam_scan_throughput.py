@@ -0,0 +1,130 @@
+"""Throughput of the Go scan service against the built-in Python Steam scanner.
+
+Usage (from python_modules): python -m benchmarks.steam_scan_throughput [--games N] [--service-binary PATH]
+"""
+import argparse
+import os
+import random
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from core.scan_service_client import iter_service_scanned_games, ScanServiceUnavailable
+from core.steam_scanner import scan_steam_games
+
+GO_SERVICE_DIR = Path(__file__).resolve().parent.parent.parent / "go_modules" / "steam_scanner"
+
+ACF_TEMPLATE = '''"AppState"
+{{
+\t"appid"\t\t"{appid}"
+\t"Universe"\t\t"1"
+\t"name"\t\t"{name}"
+\t"StateFlags"\t\t"4"
+\t"installdir"\t\t"{installdir}"
+\t"SizeOnDisk"\t\t"{size}"
+\t"buildid"\t\t"{buildid}"
+}}
+'''
+
+def make_steam_library(root, games, libraries=2, seed=0):
+    """Writes a synthetic Steam library and returns its steamapps folders."""
+    rng = random.Random(seed)
+    folders = []
+    for library in range(libraries):
+        steamapps = Path(root) / f"library_{library}" / "steamapps"
+        (steamapps / "common").mkdir(parents=True)
+        folders.append(steamapps)
+
+    for index in range(games):
+        steamapps = folders[index % libraries]
+        appid = 10 + index * 10
+        installdir = f"Game Dir {appid}"
+        name = rng.choice(("Half-Life {n}", "Café Racer {n}", "Witcher {n}: Wild Hunt", "Portal {n}")).format(n=index)
+        manifest = ACF_TEMPLATE.format(appid=appid, name=name, installdir=installdir,
+                                       size=rng.randrange(10 ** 6, 10 ** 11), buildid=rng.randrange(10 ** 7))
+        (steamapps / f"appmanifest_{appid}.acf").write_text(manifest, encoding='utf-8')
+        if index % 3:
+            (steamapps / "common" / installdir).mkdir()
+
+    # Manifests both scanners must skip: no name, and not a manifest name at all.
+    (folders[0] / "appmanifest_999999.acf").write_text('"AppState"\n{\n\t"appid"\t\t"999999"\n}\n', encoding='utf-8')
+    (folders[0] / "libraryfolders.vdf").write_text('"libraryfolders"\n{\n}\n', encoding='utf-8')
+    return folders
+
+def build_scan_service(target):
+    """Builds the Go service; returns None with the compiler output if it cannot be built here."""
+    go = shutil.which('go')
+    if go is None:
+        return None, "go toolchain not found"
+    completed = subprocess.run([go, 'build', '-o', str(target), '.'], cwd=GO_SERVICE_DIR,
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        return None, completed.stderr.strip()
+    return Path(target), None
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_scan_service(binary, timeout=10):
+    port = _free_port()
+    process = subprocess.Popen([str(binary), '-addr', f'127.0.0.1:{port}'],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return process, f"http://127.0.0.1:{port}/scan"
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f"Scan service did not start listening on port {port}")
+
+def game_key(game):
+    return (str(game.appid), game.name, game.installdir, game.install_path, game.size_on_disk)
+
+def time_scan(scan):
+    started = time.perf_counter()
+    games = list(scan())
+    return games, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=5000)
+    parser.add_argument('--service-binary', type=Path, default=None,
+                        help="use an already built scan service instead of running go build")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folders = make_steam_library(Path(tmp) / "steam", args.games)
+        binary, error = (args.service_binary, None) if args.service_binary else \
+            build_scan_service(Path(tmp) / "scan_service")
+        if binary is None:
+            raise SystemExit(f"Cannot build the scan service: {error}")
+
+        python_games, python_seconds = time_scan(lambda: scan_steam_games(folders))
+        process, service_url = start_scan_service(binary)
+        try:
+            service_games, service_seconds = time_scan(
+                lambda: iter_service_scanned_games(service_url, steamapps_folders=folders))
+        except ScanServiceUnavailable as e:
+            raise SystemExit(str(e))
+        finally:
+            process.terminate()
+            process.wait()
+
+    for label, games, seconds in (("python", python_games, python_seconds),
+                                  ("service", service_games, service_seconds)):
+        print(f"{label:>8}: {len(games)} games in {seconds * 1000:7.1f} ms "
+              f"({len(games) / seconds:8.0f} games/s)")
+    same = sorted(map(game_key, python_games)) == sorted(map(game_key, service_games))
+    print(f"Outputs {'match' if same else 'DIFFER'}")
+    if not same:
+        raise SystemExit(1)
+
+if __name__ == '__main__':
+    main()
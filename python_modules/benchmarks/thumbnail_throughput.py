@@ -0,0 +1,86 @@
+"""Throughput of the process-pool thumbnail stage against inline thumbnailing.
+
+Usage (from python_modules): python -m benchmarks.thumbnail_throughput [--covers N] [--workers N]
+"""
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from core.thumbnailer import ThumbnailPipeline, generate_tiles
+
+ORIGINAL_SIZE = (600, 900)
+
+def make_originals(directory, count, seed=0):
+    """Writes synthetic library_600x900-sized JPEG originals and returns their paths."""
+    from PIL import Image, ImageDraw
+
+    rng = random.Random(seed)
+    paths = []
+    for appid in range(1, count + 1):
+        img = Image.new('RGB', ORIGINAL_SIZE, tuple(rng.randrange(256) for _ in range(3)))
+        draw = ImageDraw.Draw(img)
+        for _ in range(40):
+            box = sorted(rng.randrange(ORIGINAL_SIZE[0]) for _ in range(2)), \
+                  sorted(rng.randrange(ORIGINAL_SIZE[1]) for _ in range(2))
+            draw.rectangle((box[0][0], box[1][0], box[0][1], box[1][1]),
+                           fill=tuple(rng.randrange(256) for _ in range(3)))
+        path = Path(directory) / f"{appid}_thumbnail_original"
+        img.save(path, format='JPEG', quality=92)
+        paths.append(path)
+    return paths
+
+def inline_single_tile(originals, covers_dir):
+    """The old path: one 180x270 tile per cover, resized and saved on the calling thread."""
+    from PIL import Image
+
+    for appid, original in enumerate(originals, 1):
+        with Image.open(original) as img:
+            img.resize((180, 270), Image.LANCZOS).save(Path(covers_dir) / f"{appid}_thumbnail.jpg", 'JPEG')
+
+def inline_all_tiles(originals, covers_dir):
+    for appid, original in enumerate(originals, 1):
+        generate_tiles(appid, str(original), covers_dir)
+
+def pipeline_all_tiles(originals, covers_dir, workers):
+    with ThumbnailPipeline(covers_dir, max_workers=workers) as pipeline:
+        for appid, original in enumerate(originals, 1):
+            pipeline.submit(appid, original)
+        failures = sum(1 for _, tiles, _ in pipeline.iter_completed() if tiles is None)
+    if failures:
+        raise RuntimeError(f"{failures} covers failed to generate")
+
+def run(label, stage, originals, workdir):
+    # The pipeline deletes originals once their tiles are written, so each run gets fresh copies.
+    sources = Path(workdir) / f"{label}_sources"
+    covers = Path(workdir) / f"{label}_covers"
+    sources.mkdir()
+    covers.mkdir()
+    copies = [Path(shutil.copy(original, sources / original.name)) for original in originals]
+    started = time.perf_counter()
+    stage(copies, covers)
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<28} {elapsed:7.2f} s  {len(copies) / elapsed:7.1f} covers/s")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--covers', type=int, default=400)
+    parser.add_argument('--workers', type=int, default=None, help="process pool size (default: CPU count)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        originals_dir = Path(tmp) / "originals"
+        originals_dir.mkdir()
+        originals = make_originals(originals_dir, args.covers)
+        print(f"{args.covers} covers of {ORIGINAL_SIZE[0]}x{ORIGINAL_SIZE[1]}:")
+        run("inline, 1x tile only", inline_single_tile, originals, tmp)
+        inline = run("inline, 1x + 2x tiles", inline_all_tiles, originals, tmp)
+        pooled = run("process pool, 1x + 2x tiles",
+                     lambda copies, covers: pipeline_all_tiles(copies, covers, args.workers), originals, tmp)
+        print(f"  process pool speedup for the same work: {inline / pooled:.1f}x")
+
+if __name__ == '__main__':
+    main()
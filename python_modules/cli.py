@@ -0,0 +1,255 @@
+"""Headless entry point for scanning and enriching the library without the UI.
+
+Usage: python cli.py [--jobs N] [--dry-run] [--json] {scan,enrich,covers,export,stats}
+"""
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from data.db_manager import DBManager
+from data.game_record import Game, STORE_STEAM, join_vocabulary
+from utils.constants import COVER_DOWNLOAD_WORKERS
+
+EXPORT_FIELDS = Game.__slots__
+
+class Progress:
+    def __init__(self, as_json, stream):
+        self.as_json = as_json
+        self.stream = stream
+
+    def __call__(self, event, **fields):
+        if self.as_json:
+            self.stream.write(json.dumps({'event': event, **fields}) + "\n")
+        else:
+            details = " ".join(f"{key}={value}" for key, value in fields.items())
+            self.stream.write(f"{event} {details}".rstrip() + "\n")
+        self.stream.flush()
+
+def _game_to_dict(game):
+    record = {field: getattr(game, field) for field in EXPORT_FIELDS}
+    record['genres'] = list(game.genres)
+    record['platforms'] = list(game.platforms)
+    return record
+
+def _covers_dir():
+    return Path.home() / ".EchoGL" / "covers"
+
+def _open_db_manager(args):
+    db_path = Path(args.db) if args.db else Path.home() / ".EchoGL" / "games.db"
+    if not args.dry_run:
+        return DBManager(db_path)
+    # A dry run reads the library without creating or migrating anything on disk.
+    if db_path.is_file():
+        return DBManager(db_path, create_tables=False, read_only=True)
+    return DBManager(':memory:')
+
+def cmd_scan(args, db_manager, progress):
+    from core.cover_downloader import CoverDownloader
+    from core.library_scanner import scan_library
+
+    # A dry run never downloads, so it must not create the covers directory either.
+    cover_downloader = None if args.dry_run else CoverDownloader(db_manager=db_manager)
+    scan_library(db_manager, cover_downloader, download_covers=not args.no_covers,
+                 dry_run=args.dry_run, max_workers=args.jobs, progress=progress)
+    return 0
+
+def cmd_enrich(args, db_manager, progress):
+    if args.from_cache:
+        from utils.metadata_updater import recompute_metadata_from_cache
+
+        if args.dry_run:
+            cached = sum(1 for game in db_manager.get_all_games()
+                         if game.igdb_id is not None and db_manager.get_igdb_response(game.igdb_id))
+            progress('would_recompute', games=cached)
+            return 0
+        progress('enrich_finished', recomputed=recompute_metadata_from_cache(db_manager))
+        return 0
+
+    pending = [game for game in db_manager.get_all_games()
+               if game.igdb_id is None and game.store == STORE_STEAM
+               and db_manager.is_lookup_due(game.appid, 'igdb_metadata')]
+    progress('enrich_started', pending=len(pending), dry_run=args.dry_run)
+    if args.dry_run:
+        for game in pending:
+            progress('would_enrich', appid=game.appid, name=game.name)
+        return 0
+
+    from utils.metadata_updater import update_all_games_with_metadata
+
+    update_all_games_with_metadata(db_manager)
+    enriched = sum(1 for game in pending if db_manager.get_game_by_appid(game.appid).igdb_id is not None)
+    progress('enrich_finished', enriched=enriched, failed=len(pending) - enriched)
+    return 0
+
+def cmd_covers(args, db_manager, progress):
+    missing = []
+    for game in db_manager.get_all_games():
+        if game.store != STORE_STEAM:
+            continue
+        for cover_type, path in (('thumbnail', game.cover_thumbnail_path), ('detail', game.cover_detail_path)):
+            if not path or not os.path.exists(path):
+                missing.append((game, cover_type))
+    progress('covers_started', missing=len(missing), dry_run=args.dry_run)
+    if args.dry_run:
+        for game, cover_type in missing:
+            progress('would_download', appid=game.appid, cover_type=cover_type)
+        return 0
+
+    from core.cover_downloader import CoverDownloader
+
+    cover_downloader = CoverDownloader(db_manager=db_manager)
+    downloaded = 0
+    # Workers only download and write files; lookup bookkeeping and cover paths
+    # are written here, so the shared connection is only ever used by this thread.
+    with ThreadPoolExecutor(max_workers=args.jobs or COVER_DOWNLOAD_WORKERS) as executor:
+        futures = {
+            executor.submit(cover_downloader.fetch_cover, game.appid, cover_type): (game, cover_type)
+            for game, cover_type in missing
+            if cover_downloader.is_cover_due(game.appid, cover_type)
+        }
+        for future in as_completed(futures):
+            game, cover_type = futures[future]
+            try:
+                path, failure_reason = future.result()
+            except Exception as e:
+                print(f"Cover download for {game.appid} failed: {e}", file=sys.stderr)
+                path, failure_reason = None, None
+            if path:
+                downloaded += 1
+                cover_downloader.record_cover_result(game.appid, cover_type, True)
+                if cover_type == 'thumbnail':
+                    game.cover_thumbnail_path = str(path)
+                else:
+                    game.cover_detail_path = str(path)
+                db_manager.update_game_covers(game.appid, game.cover_thumbnail_path, game.cover_detail_path)
+            elif failure_reason:
+                cover_downloader.record_cover_result(game.appid, cover_type, False, failure_reason)
+            progress('cover_done', appid=game.appid, cover_type=cover_type, ok=bool(path))
+    progress('covers_finished', downloaded=downloaded, failed=len(missing) - downloaded)
+    return 0
+
+def cmd_export(args, db_manager, progress):
+    games = db_manager.get_all_games()
+    output = open(args.output, 'w', newline='', encoding='utf-8') if args.output else progress.stream
+    try:
+        if args.format == 'csv':
+            writer = csv.DictWriter(output, fieldnames=EXPORT_FIELDS)
+            writer.writeheader()
+            for game in games:
+                record = _game_to_dict(game)
+                record['genres'] = join_vocabulary(game.genres)
+                record['platforms'] = join_vocabulary(game.platforms)
+                writer.writerow(record)
+        else:
+            json.dump([_game_to_dict(game) for game in games], output, indent=2)
+            output.write("\n")
+    finally:
+        if output is not progress.stream:
+            output.close()
+    if args.output:
+        progress('export_finished', games=len(games), path=args.output, format=args.format)
+    return 0
+
+def cmd_stats(args, db_manager, progress):
+    games = db_manager.get_all_games()
+    stores = {}
+    for game in games:
+        stores[game.store] = stores.get(game.store, 0) + 1
+    stats = {
+        'games': len(games),
+        'stores': stores,
+        'with_metadata': sum(1 for game in games if game.igdb_id is not None),
+        'with_thumbnail': sum(1 for game in games if game.cover_thumbnail_path),
+        'size_on_disk': sum(game.size_on_disk or 0 for game in games),
+        'playtime': db_manager.get_library_playtime_stats(),
+        'libraries': db_manager.get_library_usage(),
+    }
+    progress('stats', **stats)
+    return 0
+
+def cmd_snapshot(args, db_manager, progress):
+    from core.library_snapshot import export_snapshot
+
+    if args.dry_run:
+        progress('would_snapshot', path=args.output)
+        return 0
+    export_snapshot(db_manager, _covers_dir(), args.output, progress)
+    return 0
+
+def cmd_restore(args, db_manager, progress):
+    from core.library_snapshot import import_snapshot
+
+    if args.dry_run:
+        progress('would_restore', path=args.snapshot)
+        return 0
+    import_snapshot(db_manager, _covers_dir(), args.snapshot, progress)
+    return 0
+
+def cmd_check(args, db_manager, progress):
+    from core.integrity import check_library_integrity
+
+    if args.dry_run:
+        progress('would_check', covers_dir=str(_covers_dir()))
+        return 0
+    progress('integrity_checked', **check_library_integrity(db_manager, _covers_dir()))
+    return 0
+
+COMMANDS = {
+    'scan': cmd_scan,
+    'enrich': cmd_enrich,
+    'covers': cmd_covers,
+    'export': cmd_export,
+    'stats': cmd_stats,
+    'snapshot': cmd_snapshot,
+    'restore': cmd_restore,
+    'check': cmd_check,
+}
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Manage the EchoGL game library without starting the UI.")
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help="number of parallel workers for cover downloads and thumbnails")
+    parser.add_argument('--dry-run', action='store_true', help="report what would change without writing anything")
+    parser.add_argument('--json', action='store_true', help="print progress as one JSON object per line")
+    parser.add_argument('--db', default=None, help="path to the games database (defaults to ~/.EchoGL/games.db)")
+
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    scan_parser = subparsers.add_parser('scan', help="scan Steam, Epic and GOG libraries")
+    scan_parser.add_argument('--no-covers', action='store_true', help="skip cover downloads during the scan")
+    enrich_parser = subparsers.add_parser('enrich', help="fetch missing IGDB metadata")
+    enrich_parser.add_argument('--from-cache', action='store_true',
+                               help="recompute metadata columns from cached IGDB responses without network access")
+    subparsers.add_parser('covers', help="download missing Steam covers")
+    export_parser = subparsers.add_parser('export', help="export the library as JSON or CSV")
+    export_parser.add_argument('--format', choices=('json', 'csv'), default='json')
+    export_parser.add_argument('--output', '-o', default=None, help="file to write (defaults to stdout)")
+    subparsers.add_parser('stats', help="print library statistics")
+    snapshot_parser = subparsers.add_parser('snapshot', help="write games, enrichment state and covers to one archive")
+    snapshot_parser.add_argument('output', help="archive to write, e.g. library.tar.gz")
+    restore_parser = subparsers.add_parser('restore', help="load a snapshot written by the snapshot command")
+    restore_parser.add_argument('snapshot', help="archive to read")
+    subparsers.add_parser('check', help="repair temp files and truncated covers left by an interrupted run")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    progress = Progress(args.json, sys.stdout)
+
+    # The library modules report through print(); keep that chatter off stdout
+    # whenever stdout carries machine-readable output.
+    quiet = args.json or (args.command == 'export' and not args.output)
+    log_target = sys.stderr if quiet else progress.stream
+    with contextlib.redirect_stdout(log_target):
+        db_manager = _open_db_manager(args)
+        try:
+            return COMMANDS[args.command](args, db_manager, progress)
+        finally:
+            db_manager.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,20 @@
-import requests
-from PIL import Image
-from io import BytesIO
 from pathlib import Path
 import os 
 import time
 
+from core.thumbnailer import generate_tiles, verify_image, write_atomically
+from data.game_record import is_steam_appid
+
 class CoverDownloader:
-    def __init__(self, base_covers_dir=None):
+    def __init__(self, base_covers_dir=None, db_manager=None):
+        self.db_manager = db_manager
         if base_covers_dir:
             self.covers_dir = Path(base_covers_dir)
         else:
             self.covers_dir = Path.home() / ".EchoGL" / "covers"
         self.covers_dir.mkdir(parents=True, exist_ok=True)
 
-    def download_and_save_cover(self, appid, cover_type, image_data=None):
+    def _cover_config(self, appid, cover_type):
         cover_urls_map = {
             'thumbnail': {
                 'urls': [
@@ -21,7 +22,7 @@ class CoverDownloader:
                     f"https://cdn.akamai.steamstatic.com/steam/apps/{appid}/capsule_231x87.jpg",
                 ],
                 'filename': f"{appid}_thumbnail.jpg",
-                'resize': (180, 270)
+                'tiles': True
             },
             'detail': {
                 'urls': [
@@ -29,51 +30,130 @@ class CoverDownloader:
                     f"https://steamcdn-a.akamaihd.net/steam/apps/{appid}/header.jpg",
                 ],
                 'filename': f"{appid}_detail.jpg",
-                'resize': None
+                'tiles': False
             }
         }
+        return cover_urls_map.get(cover_type)
 
-        cover_config = cover_urls_map.get(cover_type)
+    def get_cached_cover(self, appid, cover_type):
+        cover_config = self._cover_config(appid, cover_type)
         if not cover_config:
             return None
-
         local_path = self.covers_dir / cover_config['filename']
+        return str(local_path) if local_path.is_file() else None
+
+    def is_cover_due(self, appid, cover_type):
+        if not is_steam_appid(appid):
+            return False
+        return not self.db_manager or self.db_manager.is_lookup_due(appid, f"steam_{cover_type}")
 
+    def _download_cover_bytes(self, cover_config):
+        import requests
+
+        image_data = None
+        failure_reason = None
+        max_retries = 3
+        for attempt in range(max_retries):
+            failure_reason = 'not_found'
+            for cover_url in cover_config['urls']:
+                try:
+                    response = requests.get(cover_url, stream=True, timeout=60)
+                    response.raise_for_status()
+                    image_data = response.content
+                    break
+                except requests.exceptions.HTTPError as e:
+                    if e.response is None or e.response.status_code not in (403, 404):
+                        failure_reason = 'http_error'
+                except requests.exceptions.RequestException:
+                    failure_reason = 'network_error'
+            if image_data or failure_reason == 'not_found':
+                break
+            print(f"Failed to get Steam cover on attempt {attempt+1}/{max_retries}, retrying...")
+            time.sleep(5)
+        return image_data, None if image_data else failure_reason
+
+    def _original_path(self, appid, cover_type):
+        return self.covers_dir / f"{appid}_{cover_type}_original"
+
+    def get_cached_original(self, appid, cover_type='thumbnail'):
+        original_path = self._original_path(appid, cover_type)
+        return str(original_path) if original_path.is_file() else None
+
+    # fetch_original and fetch_cover only touch the network and the covers
+    # directory, so they can run on worker threads; the caller records the
+    # returned failure reason with record_cover_result on its own thread.
+    def fetch_original(self, appid, cover_type='thumbnail'):
+        cover_config = self._cover_config(appid, cover_type)
+        if not cover_config or not is_steam_appid(appid):
+            return None, None
+
+        image_data, failure_reason = self._download_cover_bytes(cover_config)
+        if image_data is None:
+            return None, failure_reason
+
+        original_path = self._original_path(appid, cover_type)
+        try:
+            write_atomically(original_path, lambda f: f.write(image_data))
+        except OSError as e:
+            print(f"ERROR: Failed to store original cover for AppID {appid}: {e}")
+            return None, None
+        return str(original_path), None
+
+    def fetch_cover(self, appid, cover_type, image_data=None):
+        cover_config = self._cover_config(appid, cover_type)
+        if not cover_config:
+            return None, None
+
+        local_path = self.covers_dir / cover_config['filename']
         if local_path.is_file():
-            return str(local_path)
+            return str(local_path), None
 
         if image_data is None:
-            max_retries = 3
-            for attempt in range(max_retries):
-                for cover_url in cover_config['urls']:
-                    try:
-                        response = requests.get(cover_url, stream=True, timeout=60)
-                        response.raise_for_status()
-                        image_data = response.content
-                        break
-                    except requests.exceptions.RequestException:
-                        pass
-                if image_data:
-                    break
-                print(f"Failed to get Steam cover on attempt {attempt+1}/{max_retries}, retrying...")
-                time.sleep(5)
+            if not is_steam_appid(appid):
+                return None, None
+            image_data, failure_reason = self._download_cover_bytes(cover_config)
             if image_data is None:
-                return None
+                return None, failure_reason
 
         try:
-            img = Image.open(BytesIO(image_data))
-            if cover_config['resize']:
-                img = img.resize(cover_config['resize'], Image.LANCZOS)
-
-            img.save(local_path)
+            if cover_config['tiles']:
+                local_path = generate_tiles(appid, image_data, self.covers_dir)[cover_type]
+            else:
+                verify_image(image_data)
+                write_atomically(local_path, lambda f: f.write(image_data))
         except Exception:
+            return None, 'decode_error'
+        return str(local_path), None
+
+    def record_cover_result(self, appid, cover_type, succeeded, failure_reason='decode_error'):
+        if not self.db_manager:
+            return
+        lookup = f"steam_{cover_type}"
+        if succeeded:
+            self.db_manager.clear_lookup_failure(appid, lookup)
+        else:
+            self.db_manager.record_lookup_failure(appid, lookup, failure_reason)
+
+    def download_and_save_cover(self, appid, cover_type, image_data=None):
+        cached_path = self.get_cached_cover(appid, cover_type)
+        if cached_path:
+            return cached_path
+        if image_data is None and not self.is_cover_due(appid, cover_type):
             return None
-        return str(local_path)
+
+        local_path, failure_reason = self.fetch_cover(appid, cover_type, image_data)
+        if local_path:
+            self.record_cover_result(appid, cover_type, True)
+        elif failure_reason:
+            self.record_cover_result(appid, cover_type, False, failure_reason)
+        return local_path
     
     def download_igdb_cover(self, igdb_url, game_name):
         if not igdb_url:
             return None
         
+        import requests
+
         igdb_covers_dir = self.covers_dir / "igdb"
         igdb_covers_dir.mkdir(parents=True, exist_ok=True)
 
@@ -94,15 +174,22 @@ class CoverDownloader:
                 response = requests.get(full_url, stream=True, timeout=60)
                 response.raise_for_status()
 
-                with open(local_path, 'wb') as f:
+                def write_chunks(f):
                     for chunk in response.iter_content(chunk_size=8192):
                         f.write(chunk)
+
+                # A download cut short must never leave a truncated file that
+                # the is_file() check above would accept next time.
+                write_atomically(local_path, write_chunks)
                 
                 print(f"Successfully downloaded cover for '{game_name}'")
                 return str(local_path)
             
             except requests.exceptions.RequestException as e:
                 print(f"Error downloading IGDB cover for '{game_name}': {e}")
+                response = getattr(e, 'response', None)
+                if response is not None and response.status_code in (403, 404):
+                    return None
                 if attempt < max_retries - 1:
                     print(f"Retrying in 5 seconds...")
                     time.sleep(5)
@@ -0,0 +1,114 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtGui import QImage
+
+from collections import OrderedDict, deque
+from pathlib import Path
+import threading
+
+from core.cover_downloader import CoverDownloader
+from data.db_manager import DBManager
+
+class DetailPrefetcher(QObject):
+    detail_prefetched = pyqtSignal(str)
+
+    def __init__(self, db_manager, cover_downloader, max_pending=8, max_cached=16, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.cover_downloader = cover_downloader
+        self.max_cached = max_cached
+
+        # Newest requests are served first; once the queue is full the oldest
+        # (most likely stale) hover requests fall off the far end.
+        self._pending = deque(maxlen=max_pending)
+        self._in_flight = None
+        self._cache = OrderedDict()
+        self._generation = 0
+        self._condition = threading.Condition()
+        self._running = True
+
+        self._worker = threading.Thread(target=self._run, name="DetailPrefetcher", daemon=True)
+        self._worker.start()
+
+    def request(self, appid):
+        if not appid:
+            return
+        appid = str(appid)
+        with self._condition:
+            if not self._running or appid in self._cache or appid == self._in_flight:
+                return
+            if appid in self._pending:
+                self._pending.remove(appid)
+            self._pending.appendleft(appid)
+            self._condition.notify()
+
+    def take(self, appid):
+        with self._condition:
+            entry = self._cache.get(str(appid))
+            if entry is not None:
+                self._cache.move_to_end(str(appid))
+            return entry
+
+    def invalidate(self, appid=None):
+        with self._condition:
+            # Loads that started before this call may have read the old row.
+            self._generation += 1
+            if appid is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(str(appid), None)
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._pending.clear()
+            self._condition.notify_all()
+        self._worker.join(timeout=1)
+
+    def _run(self):
+        # The worker reads through its own connection instead of sharing the GUI thread's.
+        db_manager = DBManager(self.db_manager.db_path, create_tables=False)
+        cover_downloader = CoverDownloader(self.cover_downloader.covers_dir, db_manager)
+        try:
+            self._serve(db_manager, cover_downloader)
+        finally:
+            db_manager.close()
+
+    def _serve(self, db_manager, cover_downloader):
+        while True:
+            with self._condition:
+                while self._running and not self._pending:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                appid = self._pending.popleft()
+                self._in_flight = appid
+                generation = self._generation
+
+            entry = self._load(db_manager, cover_downloader, appid)
+
+            with self._condition:
+                self._in_flight = None
+                if entry is None or not self._running or generation != self._generation:
+                    continue
+                self._cache[appid] = entry
+                while len(self._cache) > self.max_cached:
+                    self._cache.popitem(last=False)
+            self.detail_prefetched.emit(appid)
+
+    def _load(self, db_manager, cover_downloader, appid):
+        try:
+            game_row = db_manager.get_game_by_appid(appid)
+            if not game_row:
+                return None
+
+            detail_path = game_row.cover_detail_path
+            if not detail_path or not Path(detail_path).is_file():
+                detail_path = cover_downloader.download_and_save_cover(appid, 'detail')
+
+            detail_image = QImage()
+            if detail_path and Path(detail_path).is_file():
+                detail_image = QImage(str(detail_path))
+            return game_row, detail_image
+        except Exception as e:
+            print(f"ERROR: Failed to prefetch details for AppID {appid}: {e}")
+            return None
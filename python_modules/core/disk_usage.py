@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import time
+
+from core.steam_scanner import find_all_potential_steamapps_folders, parse_acf_file
+
+def directory_size(root):
+    total = 0
+    pending = [root]
+    while pending:
+        path = pending.pop()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+def _collect_manifests(steamapps_folders):
+    manifests = []
+    for steamapps_folder in steamapps_folders:
+        for acf_file in steamapps_folder.glob('appmanifest_*.acf'):
+            acf_info = parse_acf_file(acf_file)
+            if not acf_info.get('appid'):
+                continue
+            install_path = steamapps_folder / "common" / acf_info.get('installdir', '')
+            manifests.append((steamapps_folder, acf_file, acf_info, install_path))
+    return manifests
+
+def analyze_disk_usage(db_manager, verify=False, max_workers=8, steamapps_folders=None):
+    if steamapps_folders is None:
+        steamapps_folders = find_all_potential_steamapps_folders()
+    manifests = _collect_manifests(steamapps_folders)
+    cache = db_manager.get_disk_usage_cache() if verify else {}
+
+    def verify_install(manifest):
+        _, acf_file, _, install_path = manifest
+        try:
+            dir_mtime_ns = install_path.stat().st_mtime_ns
+            manifest_mtime_ns = acf_file.stat().st_mtime_ns
+        except OSError:
+            return None, None
+        cached = cache.get(str(install_path))
+        # Steam rewrites the manifest on every install or update, so an unchanged
+        # manifest plus an unchanged top-level directory means the tree is as we
+        # last measured it.
+        if cached and cached[0] == dir_mtime_ns and cached[1] == manifest_mtime_ns:
+            return cached[2], None
+        size = directory_size(install_path)
+        return size, (str(install_path), dir_mtime_ns, manifest_mtime_ns, size)
+
+    if verify:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="DiskUsage") as executor:
+            verified = list(executor.map(verify_install, manifests))
+    else:
+        verified = [(None, None)] * len(manifests)
+
+    game_sizes = []
+    cache_updates = []
+    libraries = {}
+    for (steamapps_folder, _, acf_info, _), (verified_size, cache_update) in zip(manifests, verified):
+        size_on_disk = acf_info.get('size_on_disk') or 0
+        game_sizes.append((acf_info['appid'], size_on_disk, verified_size))
+        if cache_update:
+            cache_updates.append(cache_update)
+
+        library = libraries.setdefault(str(steamapps_folder), [0, 0, None])
+        library[0] += 1
+        library[1] += size_on_disk
+        if verified_size is not None:
+            library[2] = (library[2] or 0) + verified_size
+
+    analyzed_at = time.time()
+    library_totals = [(path, count, manifest_bytes, verified_bytes, analyzed_at)
+                      for path, (count, manifest_bytes, verified_bytes) in libraries.items()]
+    db_manager.save_disk_usage(game_sizes, cache_updates, library_totals)
+    return db_manager.get_library_usage()
@@ -0,0 +1,58 @@
+import json
+import os
+from pathlib import Path
+
+from core.store_scanner import StoreScanner
+from data.game_record import Game
+
+def find_epic_manifests_dir():
+    if os.name == 'nt':
+        program_data = Path(os.environ.get('PROGRAMDATA', 'C:/ProgramData'))
+        manifests_dir = program_data / "Epic" / "EpicGamesLauncher" / "Data" / "Manifests"
+        if manifests_dir.is_dir():
+            return manifests_dir
+    return None
+
+def parse_item_file(file_path):
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error reading file {file_path}: {e}")
+        return None
+
+class EpicScanner(StoreScanner):
+    store = 'epic'
+
+    def __init__(self, manifests_dir=None):
+        self.manifests_dir = Path(manifests_dir) if manifests_dir else find_epic_manifests_dir()
+
+    def scan(self):
+        if not self.manifests_dir or not self.manifests_dir.is_dir():
+            return
+        for item_file in self.manifests_dir.glob('*.item'):
+            item = parse_item_file(item_file)
+            if not item or not item.get('AppName') or not item.get('DisplayName'):
+                continue
+            if item.get('bIsIncompleteInstall'):
+                continue
+            categories = item.get('AppCategories') or []
+            if categories and 'games' not in categories:
+                continue
+
+            install_location = item.get('InstallLocation')
+            if install_location and Path(install_location).is_dir():
+                install_path = str(Path(install_location))
+            else:
+                install_path = 'N/A - Not Found'
+
+            yield Game(
+                name=item['DisplayName'],
+                installdir=Path(install_location).name if install_location else None,
+                install_path=install_path,
+                store=self.store,
+                external_id=item['AppName'],
+            )
+
+    def launch_url(self, game):
+        return f"com.epicgames.launcher://apps/{game.external_id}?action=launch&silent=true"
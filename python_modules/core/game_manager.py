@@ -1,79 +1,331 @@
-from PyQt6.QtCore import QObject, pyqtSignal, QUrl
-from PyQt6.QtGui import QDesktopServices, QPixmap 
+from PyQt6.QtCore import QObject, pyqtSignal, QUrl, QTimer
+from PyQt6.QtGui import QDesktopServices, QPixmap, QImage, QGuiApplication
 from PyQt6.QtCore import Qt 
 
 from pathlib import Path
 import os 
+import threading
 
-from core.steam_scanner import find_all_potential_steamapps_folders, parse_acf_file
+from core.steam_scanner import find_all_potential_steamapps_folders
+from core.library_scanner import scan_library, default_store_scanners, has_interrupted_scan
+from core.integrity import check_library_integrity
 from core.cover_downloader import CoverDownloader
+from core.detail_prefetcher import DetailPrefetcher
+from core.thumbnailer import tile_path
+from core.pixmap_budget import PixmapBudget
+from core.disk_usage import analyze_disk_usage
+from core.job_scheduler import JobScheduler, PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW
 from data.db_manager import get_db_manager
-from utils.metadata_updater import update_all_games_with_metadata
+from data.cover_atlas import CoverAtlas
+from utils.constants import (
+    SCHEDULER_IDLE_DELAY_SECONDS, MAINTENANCE_INTERVAL_MS, COVER_ATLAS_ENABLED, PIXMAP_BUDGET_BYTES,
+)
 
 class GameManager(QObject):
     scan_started = pyqtSignal()
-    scan_finished = pyqtSignal(list) 
+    scan_finished = pyqtSignal()
+    library_load_started = pyqtSignal()
+    library_page_loaded = pyqtSignal(list)
+    library_loaded = pyqtSignal()
     game_launched = pyqtSignal(str) 
+    game_session_ended = pyqtSignal(str, float)
+    library_stale = pyqtSignal()
+    ready = pyqtSignal()
+    interrupted_scan_found = pyqtSignal()
     
     request_display_cover = pyqtSignal(str, QObject, str, bool) 
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.db_manager = None
+        self.cover_downloader = None
+        self.detail_prefetcher = None
+        self.job_scheduler = None
+        self.maintenance_timer = None
+        self.cover_atlas = None
+        self.session_monitor = None
+        self.similarity_index = None
+        self.pixmap_budget = PixmapBudget(PIXMAP_BUDGET_BYTES, self)
+        self.store_scanners = []
+        self._scanners_by_store = {}
+        self._library_pages = None
+        self._scan_thread = None
+        self._integrity_checked = threading.Event()
+        # Scans run on a worker thread; the library is reloaded back on the GUI thread.
+        self.scan_finished.connect(self.load_library)
+        self.interrupted_scan_found.connect(self.scan_for_games)
+
+    def initialize(self):
+        if self.db_manager:
+            return
+        # numpy and psutil are only needed once the window is up.
+        from core.session_monitor import SessionMonitor
+        from data.similarity_index import SimilarityIndex
+
+        # Store scanners probe the filesystem for their manifest directories.
+        self.store_scanners = default_store_scanners()
+        self._scanners_by_store = {scanner.store: scanner for scanner in self.store_scanners}
         self.db_manager = get_db_manager()
         self.covers_dir = Path.home() / ".EchoGL" / "covers" 
         self.covers_dir.mkdir(parents=True, exist_ok=True)
-        self.cover_downloader = CoverDownloader(self.covers_dir) 
+        self.cover_downloader = CoverDownloader(self.covers_dir, self.db_manager)
+        self.detail_prefetcher = DetailPrefetcher(self.db_manager, self.cover_downloader, parent=self)
+        self.db_manager.metadata_listeners.append(self.detail_prefetcher.invalidate)
+        self.similarity_index = SimilarityIndex(Path.home() / ".EchoGL" / "similarity", self.db_manager)
+        if self.similarity_index.available:
+            self.db_manager.metadata_listeners.append(self.similarity_index.update_game)
+        self.session_monitor = SessionMonitor(self.db_manager, parent=self)
+        self.session_monitor.session_ended.connect(self._on_session_ended)
+        if COVER_ATLAS_ENABLED:
+            # One atlas, packed at the tile size the screen actually shows.
+            screen = QGuiApplication.primaryScreen()
+            if screen is not None and screen.devicePixelRatio() > 1:
+                self.cover_atlas = CoverAtlas(self.covers_dir / "thumbnails@2x.atlas", self.db_manager,
+                                              'thumbnail@2x')
+            else:
+                self.cover_atlas = CoverAtlas(self.covers_dir / "thumbnails.atlas", self.db_manager)
+            self.db_manager.cover_listeners.append(self.cover_atlas.discard)
+
+        self.job_scheduler = JobScheduler(self.db_manager, SCHEDULER_IDLE_DELAY_SECONDS, parent=self)
+        self.job_scheduler.register('retry_missing_metadata', self._retry_missing_metadata)
+        self.job_scheduler.register('revalidate_covers', self._revalidate_covers)
+        self.job_scheduler.register('stale_scan_check', self._check_for_stale_scan)
+        self.job_scheduler.register('pack_cover_atlas', self._pack_cover_atlas)
+        self.job_scheduler.register('rebuild_similarity_index', self._rebuild_similarity_index)
+        self.job_scheduler.register('update_similarity', self._update_similarity)
+        self.job_scheduler.register('analyze_disk_usage', self._analyze_disk_usage)
+        self.job_scheduler.start()
+
+        self.maintenance_timer = QTimer(self)
+        self.maintenance_timer.timeout.connect(self.schedule_maintenance)
+        self.maintenance_timer.start(MAINTENANCE_INTERVAL_MS)
+        self.schedule_maintenance()
+
+        self.ready.emit()
+
+        # The integrity pass reads covers from disk for every game, so it runs off
+        # the GUI thread; maintenance and scans wait for it to finish.
+        self.job_scheduler.pause('integrity')
+        threading.Thread(target=self._run_startup_checks, name="IntegrityCheck", daemon=True).start()
+
+    def _run_startup_checks(self):
+        # Worker threads write through their own connection and close it when done.
+        try:
+            check_library_integrity(self.db_manager, self.covers_dir)
+        finally:
+            self._integrity_checked.set()
+            self.job_scheduler.resume('integrity')
+        try:
+            interrupted = has_interrupted_scan(self.db_manager)
+        finally:
+            self.db_manager.release_thread_connection()
+        if interrupted:
+            print("The previous scan did not finish; resuming it.")
+            self.interrupted_scan_found.emit()
+
+    def _iter_manifest_files(self):
+        for steamapps_folder in find_all_potential_steamapps_folders():
+            for acf_file in steamapps_folder.glob('appmanifest_*.acf'):
+                yield steamapps_folder, acf_file
 
     def scan_for_games(self):
+        if self._scan_thread is not None and self._scan_thread.is_alive():
+            return
         self.scan_started.emit()
+        self.job_scheduler.pause('scan')
+        self._scan_thread = threading.Thread(target=self._run_scan, name="LibraryScan", daemon=True)
+        self._scan_thread.start()
+
+    def _run_scan(self):
+        self._integrity_checked.wait()
         print("Games scanning starts...")
+        try:
+            scan_library(self.db_manager, self.cover_downloader, self.store_scanners)
 
-        all_steamapps_folders = find_all_potential_steamapps_folders()
-        
-        found_games_this_scan = []
-        for steamapps_folder in all_steamapps_folders:
-            acf_files = list(steamapps_folder.glob('appmanifest_*.acf'))
-            for acf_file in acf_files:
-                game_info = parse_acf_file(acf_file)
-                if game_info and 'appid' in game_info and 'name' in game_info:
-                    appid = game_info['appid']
-                    common_path = steamapps_folder / "common"
-                    game_install_path = common_path / game_info.get('installdir', '')
-                    if game_install_path.is_dir():
-                        game_info['full_install_path'] = str(game_install_path)
-                    else:
-                        game_info['full_install_path'] = 'N/A - Not Found'
-
-                    thumbnail_path = self.cover_downloader.download_and_save_cover(appid, 'thumbnail')
-                    detail_path = self.cover_downloader.download_and_save_cover(appid, 'detail')
-                    
-                    game_info['cover_thumbnail_path'] = str(thumbnail_path) if thumbnail_path else None
-                    game_info['cover_detail_path'] = str(detail_path) if detail_path else None
-
-                    self.db_manager.add_or_update_game(game_info)
-                    found_games_this_scan.append(game_info)
-        
-        all_current_games_from_db = self.db_manager.get_all_games()
-        self.scan_finished.emit(all_current_games_from_db)
-        print("Scaning is finished.")
+            self.detail_prefetcher.invalidate()
+            print("Scaning is finished.")
+
+            self.job_scheduler.schedule('retry_missing_metadata', priority=PRIORITY_HIGH)
+            if self.cover_atlas:
+                self.job_scheduler.schedule('pack_cover_atlas', priority=PRIORITY_NORMAL)
+            if self.similarity_index.available:
+                self.job_scheduler.schedule('rebuild_similarity_index', priority=PRIORITY_LOW)
+        finally:
+            self.db_manager.release_thread_connection()
+            self.job_scheduler.resume('scan')
+            self.scan_finished.emit()
+
+    def schedule_maintenance(self):
+        self.job_scheduler.schedule('stale_scan_check', priority=PRIORITY_NORMAL)
+        self.job_scheduler.schedule('retry_missing_metadata', priority=PRIORITY_NORMAL)
+        self.job_scheduler.schedule('revalidate_covers', priority=PRIORITY_LOW)
+        self.job_scheduler.schedule('analyze_disk_usage', {'verify': True}, priority=PRIORITY_LOW)
+        if self.similarity_index.available and not len(self.similarity_index):
+            self.job_scheduler.schedule('rebuild_similarity_index', priority=PRIORITY_LOW)
+
+    def notify_user_activity(self):
+        if self.job_scheduler:
+            self.job_scheduler.notify_activity()
+
+    def pause_maintenance(self, reason):
+        if self.job_scheduler:
+            self.job_scheduler.pause(reason)
+
+    def resume_maintenance(self, reason):
+        if self.job_scheduler:
+            self.job_scheduler.resume(reason)
+
+    def _retry_missing_metadata(self):
+        from utils.metadata_updater import update_all_games_with_metadata
 
         print("Starting updating metadata and covers with IGDB...")
-        update_all_games_with_metadata()
+        update_all_games_with_metadata(self.db_manager)
+        if self.similarity_index.available:
+            self.similarity_index.save()
         print("Metadate's update is finished")
 
+    def _revalidate_covers(self):
+        for game in self.db_manager.get_all_games():
+            thumbnail_path = game.cover_thumbnail_path
+            detail_path = game.cover_detail_path
+            if thumbnail_path and Path(thumbnail_path).is_file() and detail_path and Path(detail_path).is_file():
+                continue
+
+            if not thumbnail_path or not Path(thumbnail_path).is_file():
+                thumbnail_path = self.cover_downloader.download_and_save_cover(game.appid, 'thumbnail')
+            if not detail_path or not Path(detail_path).is_file():
+                detail_path = self.cover_downloader.download_and_save_cover(game.appid, 'detail')
+            self.db_manager.update_game_covers(game.appid, thumbnail_path, detail_path)
+            self.detail_prefetcher.invalidate(game.appid)
+            if thumbnail_path:
+                game.cover_thumbnail_path = thumbnail_path
+                self._add_to_cover_atlas(game)
+
+    def _pack_cover_atlas(self):
+        if not self.cover_atlas:
+            return
+        for page in self.db_manager.iter_game_summaries():
+            for game in page:
+                if game.appid not in self.cover_atlas:
+                    self._add_to_cover_atlas(game)
+
+    def _add_to_cover_atlas(self, game):
+        if not self.cover_atlas:
+            return
+        source = tile_path(self.covers_dir, game.appid, self.cover_atlas.tile_name)
+        if not source.is_file():
+            if not game.cover_thumbnail_path or not Path(game.cover_thumbnail_path).is_file():
+                return
+            source = game.cover_thumbnail_path
+        try:
+            self.cover_atlas.add(game.appid, source)
+        except Exception as e:
+            print(f"ERROR: Failed to pack cover for AppID {game.appid} into the atlas: {e}")
+
+    def _rebuild_similarity_index(self):
+        self.similarity_index.rebuild()
+
+    def _update_similarity(self, appid):
+        self.similarity_index.update_game(appid)
+        self.similarity_index.save()
+
+    def get_similar_games(self, appid, k=10):
+        if not self.similarity_index:
+            return []
+        similar = []
+        for similar_appid, score in self.similarity_index.most_similar(appid, k):
+            game = self.db_manager.get_game_by_appid(similar_appid)
+            if game:
+                similar.append((game, score))
+        return similar
+
+    def analyze_disk_usage(self, verify=False):
+        self.job_scheduler.schedule('analyze_disk_usage', {'verify': verify}, priority=PRIORITY_HIGH)
+
+    def _analyze_disk_usage(self, verify=False):
+        for library in analyze_disk_usage(self.db_manager, verify=verify):
+            print(f"Library {library['library_path']}: {library['game_count']} games, "
+                  f"{library['manifest_bytes'] / 1024 ** 3:.1f} GB by manifest")
+        self.detail_prefetcher.invalidate()
+
+    def get_library_usage(self):
+        return self.db_manager.get_library_usage()
+
+    def _check_for_stale_scan(self):
+        manifest_appids = set()
+        for _, acf_file in self._iter_manifest_files():
+            appid = acf_file.stem[len('appmanifest_'):]
+            if appid.isdigit():
+                manifest_appids.add(int(appid))
+
+        known_appids = {game.appid for page in self.db_manager.iter_game_summaries() for game in page}
+        if manifest_appids - known_appids:
+            print(f"Found {len(manifest_appids - known_appids)} installed games missing from the library.")
+            self.library_stale.emit()
+
     def get_all_games(self):
         return self.db_manager.get_all_games()
 
+    def load_library(self):
+        # One summary page per event loop turn, so the gallery fills in while the
+        # rest of the library is still being read.
+        self._library_pages = self.db_manager.iter_game_summaries()
+        self.library_load_started.emit()
+        QTimer.singleShot(0, lambda pages=self._library_pages: self._emit_library_page(pages))
+
+    def _emit_library_page(self, pages):
+        if pages is not self._library_pages:
+            return
+        page = next(pages, None)
+        if page is None:
+            self._library_pages = None
+            self.library_loaded.emit()
+            return
+        self.library_page_loaded.emit(page)
+        QTimer.singleShot(0, lambda: self._emit_library_page(pages))
+
     def get_game_by_appid(self, appid):
         return self.db_manager.get_game_by_appid(appid)
 
+    def prefetch_game_details(self, appid):
+        if self.detail_prefetcher:
+            self.detail_prefetcher.request(appid)
+
+    def take_prefetched_details(self, appid):
+        if not self.detail_prefetcher:
+            return None
+        return self.detail_prefetcher.take(appid)
+
     def launch_game(self, appid):
-        if appid:
-            QDesktopServices.openUrl(QUrl(f"steam://rungameid/{appid}"))
+        game = self.db_manager.get_game_by_appid(appid) if appid else None
+        scanner = self._scanners_by_store.get(game.store) if game else None
+        if scanner:
+            QDesktopServices.openUrl(QUrl(scanner.launch_url(game)))
+            self.job_scheduler.pause('game')
+            self.session_monitor.watch(game.appid, game.install_path)
             self.game_launched.emit(appid)
             print(f"Игра с AppID {appid} запущена.")
-        else:
+        elif not appid:
             print("Не удалось запустить игру: AppID не указан.")
+        else:
+            print(f"Не удалось запустить игру: AppID {appid} не найден в библиотеке.")
+
+    def on_launcher_activated(self):
+        if self.session_monitor and not self.session_monitor.is_watching():
+            self.resume_maintenance('game')
+
+    def _on_session_ended(self, appid, duration):
+        if duration and self.similarity_index.available:
+            self.job_scheduler.schedule('update_similarity', {'appid': int(appid)}, priority=PRIORITY_LOW)
+        if not self.session_monitor.is_watching():
+            self.job_scheduler.resume('game')
+        self.game_session_ended.emit(appid, duration)
+
+    def get_playtime(self, appid):
+        return self.db_manager.get_playtime(appid)
+
+    def get_library_playtime_stats(self):
+        return self.db_manager.get_library_playtime_stats()
 
     def display_cover_on_label(self, appid, target_label, cover_type='thumbnail', use_cached=False):
         if not appid:
@@ -84,14 +336,35 @@ class GameManager(QObject):
         
         pixmap_to_display = QPixmap()
 
-        if use_cached:
+        hidpi = target_label.devicePixelRatioF() > 1
+        wanted_tile = 'thumbnail@2x' if hidpi else 'thumbnail'
+        atlas = self.cover_atlas
+        if use_cached and cover_type == 'thumbnail' and atlas and atlas.tile_name == wanted_tile:
+            tile = atlas.tile(appid)
+            if tile is not None:
+                # The QImage reads the mapped pixels in place. fromImage then makes the one
+                # copy the label keeps, so the view can be released before the atlas remaps.
+                tile_image = QImage(tile, atlas.tile_width, atlas.tile_height, atlas.bytes_per_line,
+                                    QImage.Format.Format_RGB888)
+                pixmap_to_display = QPixmap.fromImage(tile_image)
+                del tile_image
+                tile.release()
+
+        if use_cached and cover_type == 'thumbnail' and hidpi and pixmap_to_display.isNull():
+            hidpi_path = tile_path(self.covers_dir, appid, 'thumbnail@2x')
+            if hidpi_path.is_file():
+                loaded_pixmap = QPixmap(str(hidpi_path))
+                if not loaded_pixmap.isNull():
+                    pixmap_to_display = loaded_pixmap
+
+        if use_cached and pixmap_to_display.isNull():
             game_from_db = self.db_manager.get_game_by_appid(appid)
             if game_from_db:
                 local_cover_path = None
                 if cover_type == 'thumbnail':
-                    local_cover_path = game_from_db.get('cover_thumbnail_path')
+                    local_cover_path = game_from_db.cover_thumbnail_path
                 elif cover_type == 'detail':
-                    local_cover_path = game_from_db.get('cover_detail_path')
+                    local_cover_path = game_from_db.cover_detail_path
 
                 if local_cover_path and Path(local_cover_path).is_file():
                     try:
@@ -112,24 +385,38 @@ class GameManager(QObject):
                     print(f"ERROR: Failed to load newly downloaded cover for AppID {appid} from {downloaded_path}: {e}")
 
         if not pixmap_to_display.isNull():
-            if hasattr(target_label, 'setOriginalPixmap') and callable(getattr(target_label, 'setOriginalPixmap')):
-                target_label.setOriginalPixmap(pixmap_to_display)
-            else:
-                scaled_pixmap = pixmap_to_display.scaled(target_label.size(),
-                                                         Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                                                         Qt.TransformationMode.SmoothTransformation)
-                target_label.setPixmap(scaled_pixmap)
+            self.set_label_pixmap(target_label, pixmap_to_display)
         else:
             target_label.clear()
             target_label.setText(f"No cover for {appid}")
             target_label.setStyleSheet("border: 1px solid red; border-radius: 5px; color: red;")
             print(f"Failed to load any cover for AppID {appid}.")
 
+    def set_label_pixmap(self, target_label, pixmap):
+        if hasattr(target_label, 'setOriginalPixmap') and callable(getattr(target_label, 'setOriginalPixmap')):
+            target_label.setOriginalPixmap(pixmap)
+        else:
+            scaled_pixmap = pixmap.scaled(target_label.size(),
+                                          Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                                          Qt.TransformationMode.SmoothTransformation)
+            target_label.setPixmap(scaled_pixmap)
+        self.pixmap_budget.track(target_label)
+
+    def get_pixmap_usage(self):
+        return self.pixmap_budget.usage()
+
     def close_db(self):
+        if self.maintenance_timer:
+            self.maintenance_timer.stop()
+        if self.job_scheduler:
+            self.job_scheduler.stop()
+        if self.session_monitor:
+            self.session_monitor.stop()
+        if self.detail_prefetcher:
+            self.detail_prefetcher.stop()
+        if self.similarity_index:
+            self.similarity_index.save()
+        if self.cover_atlas:
+            self.cover_atlas.close()
         if self.db_manager:
             self.db_manager.close()
-
-import sys
-import requests 
-from PIL import Image 
-from io import BytesIO
\ No newline at end of file
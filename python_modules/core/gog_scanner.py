@@ -0,0 +1,88 @@
+import json
+import os
+from pathlib import Path
+
+from core.store_scanner import StoreScanner
+from data.game_record import Game
+
+try:
+    import winreg
+except ImportError:
+    winreg = None
+
+def find_gog_install_dirs():
+    install_dirs = set()
+
+    if os.name == 'nt' and winreg:
+        try:
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\GOG.com\Games") as games_key:
+                index = 0
+                while True:
+                    try:
+                        game_key_name = winreg.EnumKey(games_key, index)
+                    except OSError:
+                        break
+                    index += 1
+                    try:
+                        with winreg.OpenKey(games_key, game_key_name) as game_key:
+                            install_dirs.add(Path(winreg.QueryValueEx(game_key, "path")[0]))
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+
+    library_dirs = []
+    if os.name == 'nt':
+        library_dirs.append(Path("C:/GOG Games"))
+        library_dirs.append(Path("C:/Program Files (x86)/GOG Galaxy/Games"))
+    elif os.name == 'posix':
+        library_dirs.append(Path.home() / "GOG Games")
+
+    for library_dir in library_dirs:
+        if library_dir.is_dir():
+            install_dirs.update(p for p in library_dir.iterdir() if p.is_dir())
+
+    return [d for d in install_dirs if d.is_dir()]
+
+def parse_info_file(file_path):
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error reading file {file_path}: {e}")
+        return None
+
+class GOGScanner(StoreScanner):
+    store = 'gog'
+
+    def __init__(self, install_dirs=None):
+        self.install_dirs = [Path(d) for d in install_dirs] if install_dirs is not None else None
+
+    def scan(self):
+        install_dirs = self.install_dirs if self.install_dirs is not None else find_gog_install_dirs()
+        for install_dir in install_dirs:
+            for info_file in install_dir.glob('goggame-*.info'):
+                info = parse_info_file(info_file)
+                if not info or not info.get('gameId') or not info.get('name'):
+                    continue
+                root_game_id = info.get('rootGameId')
+                if root_game_id and root_game_id != info['gameId']:
+                    continue
+
+                yield Game(
+                    name=info['name'],
+                    installdir=install_dir.name,
+                    install_path=str(install_dir),
+                    store=self.store,
+                    external_id=str(info['gameId']),
+                )
+
+    def launch_url(self, game):
+        install_dir = Path(game.install_path or '')
+        info = parse_info_file(install_dir / f"goggame-{game.external_id}.info") if install_dir.is_dir() else None
+        for task in (info or {}).get('playTasks', []):
+            if task.get('isPrimary') and task.get('type') == 'FileTask' and task.get('path'):
+                executable = install_dir / task['path'].replace('\\', os.sep)
+                if executable.is_file():
+                    return executable.as_uri()
+        return f"goggalaxy://openGameView/{game.external_id}"
@@ -0,0 +1,71 @@
+import os
+from pathlib import Path
+
+_JPEG_END = b'\xff\xd9'
+_PNG_END = b'IEND\xaeB`\x82'
+_TAIL_BYTES = 64
+
+def is_image_complete(path):
+    """Cheap truncation check that only reads the head and tail of the file."""
+    try:
+        size = os.path.getsize(path)
+        if size == 0:
+            return False
+        with open(path, 'rb') as f:
+            head = f.read(12)
+            f.seek(max(size - _TAIL_BYTES, 0))
+            tail = f.read()
+    except OSError:
+        return False
+
+    if head.startswith(b'\xff\xd8'):
+        return _JPEG_END in tail
+    if head.startswith(b'\x89PNG'):
+        return tail.endswith(_PNG_END)
+    if head.startswith(b'RIFF') and head[8:12] == b'WEBP':
+        return int.from_bytes(head[4:8], 'little') + 8 <= size
+    return True
+
+def _remove(path):
+    try:
+        os.unlink(path)
+        return True
+    except OSError as e:
+        print(f"Could not remove damaged file {path}: {e}")
+        return False
+
+def check_library_integrity(db_manager, covers_dir):
+    """Repairs what an unclean shutdown left behind and returns a summary dict."""
+    covers_dir = Path(covers_dir)
+    report = {'database_ok': db_manager.quick_check(), 'temp_files_removed': 0,
+              'originals_removed': 0, 'covers_invalidated': 0}
+    if not report['database_ok']:
+        print("WARNING: the games database failed its integrity check.")
+
+    if covers_dir.is_dir():
+        for path in covers_dir.rglob('.*.part'):
+            report['temp_files_removed'] += _remove(path)
+        for path in covers_dir.glob('*_original'):
+            if not is_image_complete(path):
+                report['originals_removed'] += _remove(path)
+        for path in covers_dir.glob('*@2x.jpg'):
+            if not is_image_complete(path):
+                report['covers_invalidated'] += _remove(path)
+
+    for game in db_manager.get_all_games():
+        damaged = []
+        for column in ('cover_thumbnail_path', 'cover_detail_path', 'cover_path'):
+            path = getattr(game, column)
+            if not path:
+                continue
+            if not os.path.isfile(path):
+                damaged.append(column)
+            elif not is_image_complete(path):
+                _remove(path)
+                damaged.append(column)
+        if damaged:
+            db_manager.clear_missing_cover_paths(game.appid, damaged)
+            report['covers_invalidated'] += len(damaged)
+
+    print(f"Library integrity check: {report}")
+    return report
@@ -0,0 +1,137 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+import heapq
+import itertools
+import json
+import threading
+import time
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+class JobScheduler(QObject):
+    job_finished = pyqtSignal(str, bool)
+
+    def __init__(self, db_manager, idle_delay=30, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.idle_delay = idle_delay
+
+        self._handlers = {}
+        self._queue = []
+        self._queued_keys = set()
+        self._running_key = None
+        self._rerun = {}
+        self._sequence = itertools.count()
+        self._pause_reasons = set()
+        self._last_activity = time.monotonic()
+        self._condition = threading.Condition()
+        self._running = False
+        self._worker = None
+
+    def register(self, kind, handler):
+        self._handlers[kind] = handler
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        for job in self.db_manager.get_pending_jobs():
+            self._push(job['job_key'], job['kind'], json.loads(job['payload'] or '{}'), job['priority'])
+        self._worker = threading.Thread(target=self._run, name="JobScheduler", daemon=True)
+        self._worker.start()
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._worker:
+            self._worker.join(timeout=1)
+            self._worker = None
+
+    def schedule(self, kind, payload=None, priority=PRIORITY_NORMAL, key=None):
+        payload = payload or {}
+        job_key = key or f"{kind}:{json.dumps(payload, sort_keys=True)}"
+        with self._condition:
+            if job_key == self._running_key:
+                # The running job may already be past the state this request is
+                # about, so it runs once more after it finishes.
+                queued = self._rerun.get(job_key)
+                if queued is None or priority < queued[2]:
+                    self._rerun[job_key] = (kind, payload, priority)
+                return True
+            if job_key in self._queued_keys:
+                return False
+        self.db_manager.save_job(job_key, kind, json.dumps(payload), priority)
+        self._push(job_key, kind, payload, priority)
+        return True
+
+    def pause(self, reason):
+        with self._condition:
+            self._pause_reasons.add(reason)
+
+    def resume(self, reason):
+        with self._condition:
+            self._pause_reasons.discard(reason)
+            self._condition.notify_all()
+
+    def notify_activity(self):
+        self._last_activity = time.monotonic()
+
+    def _push(self, job_key, kind, payload, priority):
+        with self._condition:
+            if job_key in self._queued_keys:
+                return
+            self._queued_keys.add(job_key)
+            heapq.heappush(self._queue, (priority, next(self._sequence), job_key, kind, payload))
+            self._condition.notify_all()
+
+    def _idle_remaining(self):
+        return self.idle_delay - (time.monotonic() - self._last_activity)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running:
+                    if not self._queue or self._pause_reasons:
+                        self._condition.wait()
+                        continue
+                    remaining = self._idle_remaining()
+                    if remaining > 0:
+                        self._condition.wait(remaining)
+                        continue
+                    break
+                if not self._running:
+                    return
+                _, _, job_key, kind, payload = heapq.heappop(self._queue)
+                self._running_key = job_key
+
+            success = self._execute(job_key, kind, payload)
+
+            with self._condition:
+                self._queued_keys.discard(job_key)
+                self._running_key = None
+                rerun = self._rerun.pop(job_key, None)
+            self.job_finished.emit(job_key, success)
+            if rerun is not None:
+                kind, payload, priority = rerun
+                self.db_manager.save_job(job_key, kind, json.dumps(payload), priority)
+                self._push(job_key, kind, payload, priority)
+
+    def _execute(self, job_key, kind, payload):
+        handler = self._handlers.get(kind)
+        if handler is None:
+            print(f"No handler registered for job '{job_key}', dropping it.")
+            self.db_manager.set_job_status(job_key, 'failed')
+            return False
+
+        self.db_manager.set_job_status(job_key, 'running')
+        try:
+            handler(**payload)
+        except Exception as e:
+            print(f"Job '{job_key}' failed: {e}")
+            self.db_manager.set_job_status(job_key, 'failed')
+            return False
+        self.db_manager.set_job_status(job_key, 'done')
+        return True
@@ -0,0 +1,183 @@
+from concurrent.futures import ThreadPoolExecutor
+import queue
+
+from core.epic_scanner import EpicScanner
+from core.gog_scanner import GOGScanner
+from core.steam_scanner import SteamScanner
+from core.store_scanner import scan_all_stores
+from core.thumbnailer import ThumbnailPipeline
+from data.game_record import STORE_STEAM
+from utils.constants import SCAN_CHECKPOINT_INTERVAL, COVER_DOWNLOAD_WORKERS
+
+SCAN_CHECKPOINT = 'scan'
+
+def default_store_scanners():
+    return [SteamScanner(), EpicScanner(), GOGScanner()]
+
+def _no_progress(event, **fields):
+    pass
+
+class ScanCheckpoint:
+    """Persists which games an in-progress scan has fully stored, so an interrupted
+    scan can skip them when it is run again."""
+
+    def __init__(self, db_manager, flush_every=SCAN_CHECKPOINT_INTERVAL):
+        self.db_manager = db_manager
+        self.flush_every = flush_every
+        state = db_manager.get_checkpoint(SCAN_CHECKPOINT) or {}
+        self.resumed = bool(state)
+        self.completed = set(state.get('completed', ()))
+        self._unsaved = 0
+
+    def __contains__(self, key):
+        return key in self.completed
+
+    def mark(self, key):
+        self.completed.add(key)
+        self._unsaved += 1
+        if self._unsaved >= self.flush_every:
+            self.save()
+
+    def save(self):
+        self.db_manager.save_checkpoint(SCAN_CHECKPOINT, {'completed': sorted(self.completed)})
+        self._unsaved = 0
+
+    def finish(self):
+        self.db_manager.clear_checkpoint(SCAN_CHECKPOINT)
+
+def has_interrupted_scan(db_manager):
+    return db_manager.get_checkpoint(SCAN_CHECKPOINT) is not None
+
+def _game_key(game):
+    return f"{game.store}:{game.external_id}"
+
+class _FetchedCovers:
+    __slots__ = ('thumbnail_path', 'original_path', 'detail_path', 'failures', 'fetched')
+
+    def __init__(self):
+        self.thumbnail_path = None
+        self.original_path = None
+        self.detail_path = None
+        self.failures = {}
+        self.fetched = set()
+
+def _fetch_game_covers(cover_downloader, appid, thumbnail_due, detail_due):
+    # Runs on a download thread: network and covers directory only, no database.
+    covers = _FetchedCovers()
+    covers.thumbnail_path = cover_downloader.get_cached_cover(appid, 'thumbnail')
+    if not covers.thumbnail_path:
+        # An original left behind by an interrupted scan is reused instead of downloaded again.
+        covers.original_path = cover_downloader.get_cached_original(appid, 'thumbnail')
+        if not covers.original_path and thumbnail_due:
+            covers.original_path, failure = cover_downloader.fetch_original(appid, 'thumbnail')
+            if failure:
+                covers.failures['thumbnail'] = failure
+
+    covers.detail_path = cover_downloader.get_cached_cover(appid, 'detail')
+    if not covers.detail_path and detail_due:
+        covers.detail_path, failure = cover_downloader.fetch_cover(appid, 'detail')
+        if covers.detail_path:
+            covers.fetched.add('detail')
+        elif failure:
+            covers.failures['detail'] = failure
+    return covers
+
+def scan_library(db_manager, cover_downloader, store_scanners=None, download_covers=True,
+                 dry_run=False, max_workers=None, progress=None):
+    store_scanners = store_scanners if store_scanners is not None else default_store_scanners()
+    progress = progress or _no_progress
+
+    checkpoint = None
+    if not dry_run:
+        checkpoint = ScanCheckpoint(db_manager)
+        # Written up front so a scan killed before its first flush is still resumed.
+        checkpoint.save()
+        if checkpoint.resumed:
+            progress('scan_resumed', completed=len(checkpoint.completed))
+
+    found_games = []
+    thumbnail_pipeline = None
+    cover_executor = None
+    # Downloads finish on worker threads; everything that touches the database
+    # happens here, on the scanning thread, as their futures come back.
+    fetched_covers = queue.Queue()
+    fetches_pending = 0
+
+    def store_game(game, future=None):
+        nonlocal thumbnail_pipeline
+        thumbnail_pending = False
+        if future is not None:
+            try:
+                covers = future.result()
+            except Exception as e:
+                print(f"ERROR: Cover download for AppID {game.appid} failed: {e}")
+                covers = _FetchedCovers()
+            for cover_type in covers.fetched:
+                cover_downloader.record_cover_result(game.appid, cover_type, True)
+            for cover_type, failure_reason in covers.failures.items():
+                cover_downloader.record_cover_result(game.appid, cover_type, False, failure_reason)
+            if covers.original_path:
+                if thumbnail_pipeline is None:
+                    thumbnail_pipeline = ThumbnailPipeline(cover_downloader.covers_dir, max_workers)
+                thumbnail_pipeline.submit(game.appid, covers.original_path, game)
+                thumbnail_pending = True
+
+            game.cover_thumbnail_path = covers.thumbnail_path
+            game.cover_detail_path = covers.detail_path
+
+        db_manager.add_or_update_game(game)
+        if not thumbnail_pending:
+            checkpoint.mark(_game_key(game))
+
+    def store_fetched(block):
+        nonlocal fetches_pending
+        while fetches_pending:
+            try:
+                game, future = fetched_covers.get(block=block)
+            except queue.Empty:
+                return
+            fetches_pending -= 1
+            store_game(game, future)
+
+    try:
+        for game in scan_all_stores(store_scanners):
+            found_games.append(game)
+            progress('game_found', store=game.store, external_id=game.external_id, name=game.name)
+            if dry_run:
+                continue
+            if _game_key(game) in checkpoint:
+                continue
+
+            if game.store == STORE_STEAM and download_covers:
+                if cover_executor is None:
+                    cover_executor = ThreadPoolExecutor(max_workers=max_workers or COVER_DOWNLOAD_WORKERS,
+                                                        thread_name_prefix="CoverDownload")
+                future = cover_executor.submit(_fetch_game_covers, cover_downloader, game.appid,
+                                               cover_downloader.is_cover_due(game.appid, 'thumbnail'),
+                                               cover_downloader.is_cover_due(game.appid, 'detail'))
+                future.add_done_callback(lambda future, game=game: fetched_covers.put((game, future)))
+                fetches_pending += 1
+            else:
+                store_game(game)
+            store_fetched(block=False)
+
+        store_fetched(block=True)
+
+        if thumbnail_pipeline is not None:
+            for appid, tiles, game in thumbnail_pipeline.iter_completed():
+                cover_downloader.record_cover_result(appid, 'thumbnail', tiles is not None)
+                if tiles:
+                    game.cover_thumbnail_path = tiles['thumbnail']
+                    db_manager.update_game_covers(appid, game.cover_thumbnail_path, game.cover_detail_path)
+                checkpoint.mark(_game_key(game))
+                progress('thumbnail_done', appid=appid, ok=tiles is not None)
+    finally:
+        if cover_executor is not None:
+            cover_executor.shutdown(cancel_futures=True)
+        if thumbnail_pipeline is not None:
+            thumbnail_pipeline.close()
+
+    if checkpoint is not None:
+        checkpoint.finish()
+    progress('scan_finished', games=len(found_games), dry_run=dry_run)
+    return found_games
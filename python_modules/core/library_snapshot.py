@@ -0,0 +1,236 @@
+import base64
+import gzip
+import hashlib
+import io
+import json
+import shutil
+import tarfile
+import tempfile
+import time
+from pathlib import Path, PurePosixPath
+
+from core.thumbnailer import write_atomically
+from data.game_record import is_steam_appid
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_IMPORT_BATCH = 500
+SNAPSHOT_COMPRESSLEVEL = 1
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+MANIFEST_MEMBER = "manifest.json"
+GAMES_MEMBER = "games.ndjson"
+LOOKUP_FAILURES_MEMBER = "lookup_failures.ndjson"
+IGDB_CACHE_MEMBER = "igdb_cache.ndjson"
+COVERS_PREFIX = "covers/"
+SHA256_HEADER = "EchoGL.sha256"
+
+COVER_COLUMNS = ('cover_path', 'cover_thumbnail_path', 'cover_detail_path')
+PORTABLE_COLUMNS = (
+    'store', 'external_id', 'name', 'igdb_id', 'summary', 'genres', 'platforms',
+) + COVER_COLUMNS
+EXPORT_COLUMNS = ('appid',) + PORTABLE_COLUMNS + ('install_path', 'size_on_disk')
+
+def _no_progress(event, **fields):
+    pass
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def content_hash(record):
+    portable = {column: record.get(column) for column in PORTABLE_COLUMNS}
+    return hashlib.sha256(json.dumps(portable, sort_keys=True).encode('utf-8')).hexdigest()
+
+def _relative_cover(path, covers_dir):
+    if not path:
+        return None
+    try:
+        return Path(path).resolve().relative_to(covers_dir).as_posix()
+    except (OSError, ValueError):
+        # Covers outside the covers directory cannot be carried over.
+        return None
+
+def _safe_cover_name(member_name):
+    relative = PurePosixPath(member_name[len(COVERS_PREFIX):])
+    if relative.is_absolute() or not relative.parts or '..' in relative.parts:
+        return None
+    return relative
+
+def _add_stream(tar, name, stream, size):
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = int(time.time())
+    tar.addfile(info, stream)
+
+def _add_bytes(tar, name, data):
+    _add_stream(tar, name, io.BytesIO(data), len(data))
+
+def export_snapshot(db_manager, covers_dir, target_path, progress=None):
+    progress = progress or _no_progress
+    covers_dir = Path(covers_dir).resolve()
+    referenced_covers = set()
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as games_spool:
+        game_count = 0
+        for row in db_manager.iter_game_rows(EXPORT_COLUMNS):
+            for column in COVER_COLUMNS:
+                row[column] = _relative_cover(row[column], covers_dir)
+                if row[column]:
+                    referenced_covers.add(row[column])
+            if not is_steam_appid(row['appid']):
+                # Local appids of non-Steam games are reassigned on import.
+                row['appid'] = None
+            row['content_hash'] = content_hash(row)
+            games_spool.write((json.dumps(row) + "\n").encode('utf-8'))
+            game_count += 1
+
+        # Keep the 2x gallery tiles next to the thumbnails they were cut from.
+        for relative in list(referenced_covers):
+            if relative.endswith('_thumbnail.jpg'):
+                referenced_covers.add(relative[:-len('.jpg')] + '@2x.jpg')
+
+        cover_paths = sorted(relative for relative in referenced_covers if (covers_dir / relative).is_file())
+        manifest = {
+            'format': SNAPSHOT_FORMAT,
+            'created_at': time.time(),
+            'games': game_count,
+            'covers': len(cover_paths),
+        }
+
+        # Covers are already JPEG-compressed, so a fast gzip level keeps the export
+        # I/O bound without making the archive noticeably larger.
+        with gzip.open(target_path, 'wb', compresslevel=SNAPSHOT_COMPRESSLEVEL) as gz, \
+                tarfile.open(fileobj=gz, mode='w|', format=tarfile.PAX_FORMAT) as tar:
+            _add_bytes(tar, MANIFEST_MEMBER, json.dumps(manifest).encode('utf-8'))
+            games_size = games_spool.tell()
+            games_spool.seek(0)
+            _add_stream(tar, GAMES_MEMBER, games_spool, games_size)
+            progress('snapshot_games_written', games=game_count)
+
+            failures = db_manager.get_lookup_failure_rows()
+            _add_bytes(tar, LOOKUP_FAILURES_MEMBER,
+                       "".join(json.dumps(row) + "\n" for row in failures).encode('utf-8'))
+
+            # The cached IGDB records and their fetch times come along, so a restored
+            # library neither looks stale nor needs the network to recompute metadata.
+            with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as cache_spool:
+                cached = 0
+                for igdb_id, payload, fetched_at in db_manager.iter_igdb_cache_rows():
+                    record = {'igdb_id': igdb_id, 'fetched_at': fetched_at,
+                              'payload': base64.b64encode(payload).decode('ascii')}
+                    cache_spool.write((json.dumps(record) + "\n").encode('utf-8'))
+                    cached += 1
+                cache_size = cache_spool.tell()
+                cache_spool.seek(0)
+                _add_stream(tar, IGDB_CACHE_MEMBER, cache_spool, cache_size)
+            progress('snapshot_igdb_cache_written', records=cached)
+
+            for relative in cover_paths:
+                source = covers_dir / relative
+                info = tar.gettarinfo(str(source), arcname=COVERS_PREFIX + relative)
+                info.pax_headers = {SHA256_HEADER: _file_sha256(source)}
+                with open(source, 'rb') as f:
+                    tar.addfile(info, f)
+            progress('snapshot_covers_written', covers=len(cover_paths))
+
+    progress('snapshot_exported', path=str(target_path), **manifest)
+    return manifest
+
+def _existing_hashes(db_manager, covers_dir):
+    hashes = {}
+    for row in db_manager.iter_game_rows(EXPORT_COLUMNS):
+        for column in COVER_COLUMNS:
+            row[column] = _relative_cover(row[column], covers_dir)
+        hashes[(row['store'], row['external_id'])] = content_hash(row)
+    return hashes
+
+def _import_games(db_manager, stream, covers_dir, progress):
+    existing = _existing_hashes(db_manager, covers_dir)
+    batch = []
+    stats = {'games_written': 0, 'games_skipped': 0}
+
+    def flush():
+        stats['games_written'] += db_manager.import_game_rows(batch)
+        batch.clear()
+        progress('snapshot_games_imported', **stats)
+
+    for line in stream:
+        row = json.loads(line)
+        expected = row.pop('content_hash', None) or content_hash(row)
+        if existing.get((row['store'], row['external_id'])) == expected:
+            stats['games_skipped'] += 1
+            continue
+        for column in COVER_COLUMNS:
+            if row[column]:
+                row[column] = str(covers_dir / row[column])
+        batch.append(row)
+        if len(batch) >= SNAPSHOT_IMPORT_BATCH:
+            flush()
+    if batch:
+        flush()
+    return stats
+
+def _import_igdb_cache(db_manager, stream):
+    batch = []
+    imported = 0
+    for line in stream:
+        record = json.loads(line)
+        batch.append((record['igdb_id'], base64.b64decode(record['payload']), record['fetched_at']))
+        if len(batch) >= SNAPSHOT_IMPORT_BATCH:
+            db_manager.import_igdb_cache_rows(batch)
+            imported += len(batch)
+            batch.clear()
+    if batch:
+        db_manager.import_igdb_cache_rows(batch)
+        imported += len(batch)
+    return imported
+
+def _import_cover(member, stream, covers_dir):
+    relative = _safe_cover_name(member.name)
+    if relative is None or not member.isfile():
+        print(f"Ignoring unexpected snapshot entry: {member.name}")
+        return False
+    target = covers_dir.joinpath(*relative.parts)
+    expected = member.pax_headers.get(SHA256_HEADER)
+    if target.is_file() and target.stat().st_size == member.size and (
+            expected is None or _file_sha256(target) == expected):
+        return False
+    target.parent.mkdir(parents=True, exist_ok=True)
+    write_atomically(target, lambda f: shutil.copyfileobj(stream, f, 1024 * 1024))
+    return True
+
+def import_snapshot(db_manager, covers_dir, source_path, progress=None):
+    # Unchanged games and covers are skipped, so restoring a snapshot twice writes nothing.
+    progress = progress or _no_progress
+    covers_dir = Path(covers_dir).resolve()
+    covers_dir.mkdir(parents=True, exist_ok=True)
+    stats = {'games_written': 0, 'games_skipped': 0, 'covers_written': 0, 'covers_skipped': 0,
+             'igdb_cache_records': 0}
+
+    with tarfile.open(source_path, 'r|gz') as tar:
+        for member in tar:
+            stream = tar.extractfile(member) if member.isfile() else None
+            if member.name == MANIFEST_MEMBER:
+                manifest = json.load(stream)
+                if manifest.get('format') != SNAPSHOT_FORMAT:
+                    raise ValueError(f"Unsupported snapshot format: {manifest.get('format')}")
+                progress('snapshot_import_started', games=manifest['games'], covers=manifest['covers'])
+            elif member.name == GAMES_MEMBER:
+                stats.update(_import_games(db_manager, stream,
+                                           covers_dir, progress))
+            elif member.name == LOOKUP_FAILURES_MEMBER:
+                rows = [json.loads(line) for line in stream]
+                db_manager.import_lookup_failure_rows(rows)
+            elif member.name == IGDB_CACHE_MEMBER:
+                stats['igdb_cache_records'] = _import_igdb_cache(db_manager, stream)
+            elif member.name.startswith(COVERS_PREFIX):
+                key = 'covers_written' if _import_cover(member, stream, covers_dir) else 'covers_skipped'
+                stats[key] += 1
+            else:
+                print(f"Ignoring unexpected snapshot entry: {member.name}")
+
+    progress('snapshot_imported', **stats)
+    return stats
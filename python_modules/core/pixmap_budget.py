@@ -0,0 +1,155 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from collections import OrderedDict
+
+def pixmap_bytes(pixmap):
+    if pixmap is None or pixmap.isNull():
+        return 0
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+def _is_on_screen(owner):
+    return owner.isVisible() and not owner.visibleRegion().isEmpty()
+
+def _owner_bytes(owner):
+    if hasattr(owner, 'pixmap_bytes'):
+        return owner.pixmap_bytes()
+    return pixmap_bytes(owner.pixmap())
+
+def _owner_state(owner):
+    if hasattr(owner, 'pixmap_state'):
+        return owner.pixmap_state()
+    if owner.pixmap().isNull():
+        return 'evicted' if owner.property("pixmap_evicted") else 'empty'
+    return 'full'
+
+def _downgrade(owner, placeholder):
+    if hasattr(owner, 'downgrade_pixmap'):
+        owner.downgrade_pixmap(placeholder)
+    else:
+        # Plain labels have no low-res form; they go straight to a placeholder.
+        owner.clear()
+        owner.setProperty("pixmap_evicted", True)
+
+class PixmapBudget(QObject):
+    """Keeps the pixmaps held by cover labels under a byte cap.
+
+    Owners are labels; ones that implement ``pixmap_bytes()``, ``pixmap_state()`` and
+    ``downgrade_pixmap(placeholder)`` can also drop to a low-res copy. Off-screen
+    owners are downgraded least recently shown first: to low-res, then to a placeholder.
+    """
+    usage_changed = pyqtSignal(int, int)
+
+    def __init__(self, cap_bytes, parent=None):
+        super().__init__(parent)
+        self.cap_bytes = cap_bytes
+        # Least recently shown first. Only full-res owners sit in _entries and only
+        # low-res ones in _low, so enforcing the cap never rescans owners it has
+        # already downgraded; placeholders and empty labels wait in _spent.
+        self._entries = OrderedDict()
+        self._low = OrderedDict()
+        self._spent = {}
+        self._total_bytes = 0
+        self._peak_bytes = 0
+        self._downgrades = 0
+        self._placeholders = 0
+
+    def set_cap(self, cap_bytes):
+        self.cap_bytes = cap_bytes
+        self._enforce()
+
+    def track(self, owner):
+        key = id(owner)
+        entry = self._pop(key)
+        if entry is None:
+            owner.destroyed.connect(lambda *args, key=key: self._forget(key))
+            entry = [owner, 0]
+        self._file(key, entry)
+        self._set_bytes(entry, _owner_bytes(owner))
+        self._enforce()
+
+    def touch(self, owner):
+        key = id(owner)
+        for entries in (self._entries, self._low):
+            if key in entries:
+                entries.move_to_end(key)
+                return
+
+    def untrack(self, owner):
+        self._forget(id(owner))
+
+    def usage(self):
+        owners = [entry[0] for entries in (self._entries, self._low, self._spent) for entry in entries.values()]
+        states = [_owner_state(owner) for owner in owners]
+        full = states.count('full')
+        low = states.count('low')
+        evicted = states.count('evicted')
+        return {
+            'bytes': self._total_bytes,
+            'peak_bytes': self._peak_bytes,
+            'cap_bytes': self.cap_bytes,
+            'tracked': len(owners),
+            'full_res': full,
+            'low_res': low,
+            'evicted': evicted,
+            'empty': len(owners) - full - low - evicted,
+            'downgrades': self._downgrades,
+            'placeholder_evictions': self._placeholders,
+        }
+
+    def _pop(self, key):
+        for entries in (self._entries, self._low, self._spent):
+            entry = entries.pop(key, None)
+            if entry is not None:
+                return entry
+        return None
+
+    def _file(self, key, entry):
+        state = _owner_state(entry[0])
+        if state == 'full':
+            self._entries[key] = entry
+        elif state == 'low':
+            self._low[key] = entry
+        else:
+            self._spent[key] = entry
+
+    def _forget(self, key):
+        entry = self._pop(key)
+        if entry is not None:
+            self._total_bytes -= entry[1]
+            self.usage_changed.emit(self._total_bytes, self.cap_bytes)
+
+    def _set_bytes(self, entry, nbytes):
+        self._total_bytes += nbytes - entry[1]
+        entry[1] = nbytes
+        self._peak_bytes = max(self._peak_bytes, self._total_bytes)
+
+    def _shed(self, entries, placeholder, state):
+        # Visited at most once each: an on-screen owner is in use, so it moves to
+        # the back as if touched, and anything that changed state behind our back
+        # is refiled.
+        for _ in range(len(entries)):
+            if self._total_bytes <= self.cap_bytes:
+                return
+            key, entry = next(iter(entries.items()))
+            owner = entry[0]
+            if _owner_state(owner) != state:
+                del entries[key]
+                self._file(key, entry)
+                continue
+            if _is_on_screen(owner):
+                entries.move_to_end(key)
+                continue
+            del entries[key]
+            _downgrade(owner, placeholder)
+            self._set_bytes(entry, _owner_bytes(owner))
+            self._file(key, entry)
+            if placeholder:
+                self._placeholders += 1
+            else:
+                self._downgrades += 1
+
+    def _enforce(self):
+        if self._total_bytes > self.cap_bytes:
+            self._shed(self._entries, False, 'full')
+            self._shed(self._low, True, 'low')
+        self.usage_changed.emit(self._total_bytes, self.cap_bytes)
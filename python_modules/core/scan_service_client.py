@@ -0,0 +1,47 @@
+import json
+
+from data.game_record import Game
+from utils.constants import (
+    SCAN_SERVICE_URL, SCAN_SERVICE_CONNECT_TIMEOUT_SECONDS, SCAN_SERVICE_READ_TIMEOUT_SECONDS
+)
+
+class ScanServiceUnavailable(Exception):
+    pass
+
+def iter_service_scanned_games(service_url=SCAN_SERVICE_URL, steamapps_folders=None):
+    import requests
+
+    params = {}
+    if steamapps_folders:
+        params['steamapps'] = [str(folder) for folder in steamapps_folders]
+
+    try:
+        response = requests.get(
+            service_url, params=params, stream=True,
+            timeout=(SCAN_SERVICE_CONNECT_TIMEOUT_SECONDS, SCAN_SERVICE_READ_TIMEOUT_SECONDS)
+        )
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        raise ScanServiceUnavailable(f"Scan service at {service_url} is unavailable: {e}") from e
+
+    with response:
+        try:
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                record = json.loads(line)
+                if record.get('type') == 'done':
+                    return
+                if record.get('type') != 'game':
+                    continue
+                yield Game(
+                    appid=record['appid'],
+                    name=record['name'],
+                    installdir=record.get('installdir'),
+                    install_path=record.get('install_path') or 'N/A - Not Found',
+                    size_on_disk=record.get('size_on_disk'),
+                )
+        except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+            raise ScanServiceUnavailable(f"Scan service stream from {service_url} broke: {e}") from e
+
+    raise ScanServiceUnavailable(f"Scan service stream from {service_url} ended before completion")
@@ -0,0 +1,216 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+import os
+import threading
+import time
+from pathlib import Path
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from data.db_manager import DBManager
+from utils.constants import (
+    SESSION_START_TIMEOUT_SECONDS, SESSION_START_POLL_SECONDS, SESSION_MIN_POLL_SECONDS,
+    SESSION_MAX_POLL_SECONDS, SESSION_FLUSH_INTERVAL_SECONDS, SESSION_FLUSH_BATCH_SIZE
+)
+
+def _read_proc_paths(pid):
+    paths = [os.readlink(f"/proc/{pid}/exe")]
+    # Proton/Wine games run under the wine binary, so the game shows up in the
+    # working directory and command line instead of the executable.
+    try:
+        paths.append(os.readlink(f"/proc/{pid}/cwd"))
+    except OSError:
+        pass
+    try:
+        with open(f"/proc/{pid}/cmdline", 'rb') as f:
+            paths.extend(arg.decode('utf-8', 'replace') for arg in f.read().split(b'\0') if arg)
+    except OSError:
+        pass
+    return paths
+
+def _iter_process_paths():
+    if os.path.isdir('/proc'):
+        with os.scandir('/proc') as entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                try:
+                    yield int(entry.name), _read_proc_paths(entry.name)
+                except OSError:
+                    continue
+    elif psutil:
+        for process in psutil.process_iter(['pid', 'exe', 'cwd', 'cmdline']):
+            paths = [process.info['exe'], process.info['cwd'], *(process.info['cmdline'] or [])]
+            yield process.info['pid'], [path for path in paths if path]
+
+def _unix_path(path):
+    # Wine maps the Unix root to drive Z: and hands Windows-style paths to the game.
+    if path[:3].lower() == 'z:\\':
+        return path[2:].replace('\\', '/')
+    return path
+
+def _is_alive(pid):
+    if os.path.isdir('/proc'):
+        # Zombies keep their /proc entry but lose the exe link.
+        try:
+            os.readlink(f"/proc/{pid}/exe")
+            return True
+        except OSError:
+            return False
+    if psutil:
+        return psutil.pid_exists(pid)
+    return False
+
+def find_game_processes(install_path):
+    root = os.path.normcase(str(Path(install_path)))
+    prefix = root + os.sep
+
+    def inside(path):
+        path = os.path.normcase(_unix_path(path) if os.sep == '/' else path)
+        return path == root or path.startswith(prefix)
+
+    return {pid for pid, paths in _iter_process_paths() if any(map(inside, paths))}
+
+class _WatchedGame:
+    __slots__ = ('appid', 'install_path', 'requested_at', 'started_at', 'pids', 'poll_interval', 'next_poll')
+
+    def __init__(self, appid, install_path):
+        self.appid = appid
+        self.install_path = install_path
+        self.requested_at = time.time()
+        self.started_at = None
+        self.pids = set()
+        self.poll_interval = SESSION_START_POLL_SECONDS
+        self.next_poll = time.monotonic()
+
+class SessionMonitor(QObject):
+    session_started = pyqtSignal(str)
+    session_ended = pyqtSignal(str, float)
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.supported = os.path.isdir('/proc') or psutil is not None
+
+        self._watched = {}
+        self._pending_sessions = []
+        self._last_flush = time.monotonic()
+        self._condition = threading.Condition()
+        self._running = True
+        self._worker = threading.Thread(target=self._run, name="SessionMonitor", daemon=True)
+        self._worker.start()
+
+    def watch(self, appid, install_path):
+        if not self.supported:
+            print("Play-session tracking is not supported on this platform without psutil.")
+            return
+        if not install_path or not Path(install_path).is_dir():
+            print(f"Cannot track play session for AppID {appid}: install path is unknown.")
+            return
+        with self._condition:
+            if appid not in self._watched:
+                self._watched[appid] = _WatchedGame(appid, install_path)
+            self._condition.notify_all()
+
+    def is_watching(self):
+        with self._condition:
+            return bool(self._watched)
+
+    def is_running(self, appid):
+        with self._condition:
+            watched = self._watched.get(appid)
+            return bool(watched and watched.started_at)
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        self._worker.join(timeout=1)
+        now = time.time()
+        for watched in list(self._watched.values()):
+            if watched.started_at:
+                self._pending_sessions.append((watched.appid, watched.started_at, now))
+        self._watched.clear()
+        self._flush(self.db_manager, force=True)
+
+    def _run(self):
+        # The worker writes sessions through its own connection, as the detail prefetcher does.
+        db_manager = DBManager(self.db_manager.db_path, create_tables=False)
+        try:
+            self._watch_loop(db_manager)
+        finally:
+            db_manager.close()
+
+    def _watch_loop(self, db_manager):
+        while True:
+            with self._condition:
+                if not self._running:
+                    return
+                if self._watched:
+                    next_poll = min(w.next_poll for w in self._watched.values())
+                    timeout = max(0.0, next_poll - time.monotonic())
+                else:
+                    timeout = SESSION_FLUSH_INTERVAL_SECONDS if self._pending_sessions else None
+                self._condition.wait(timeout)
+                if not self._running:
+                    return
+                due = [w for w in self._watched.values() if w.next_poll <= time.monotonic()]
+
+            for watched in due:
+                self._poll(watched)
+            self._flush(db_manager)
+
+    def _poll(self, watched):
+        now = time.time()
+
+        if watched.pids:
+            watched.pids = {pid for pid in watched.pids if _is_alive(pid)}
+            if not watched.pids:
+                # The launcher process may have handed off to a child; look once
+                # more before declaring the session over.
+                watched.pids = find_game_processes(watched.install_path)
+        else:
+            watched.pids = find_game_processes(watched.install_path)
+
+        if watched.pids and watched.started_at is None:
+            watched.started_at = now
+            print(f"Play session started for AppID {watched.appid}.")
+            self.session_started.emit(str(watched.appid))
+
+        if watched.started_at is None:
+            if now - watched.requested_at > SESSION_START_TIMEOUT_SECONDS:
+                print(f"No running process found for AppID {watched.appid}, giving up on session tracking.")
+                with self._condition:
+                    self._watched.pop(watched.appid, None)
+                self.session_ended.emit(str(watched.appid), 0.0)
+                return
+        elif not watched.pids:
+            duration = now - watched.started_at
+            print(f"Play session ended for AppID {watched.appid} after {int(duration)} seconds.")
+            with self._condition:
+                self._watched.pop(watched.appid, None)
+                self._pending_sessions.append((watched.appid, watched.started_at, now))
+            self.session_ended.emit(str(watched.appid), duration)
+            return
+        else:
+            # A steady session needs less attention the longer it runs.
+            watched.poll_interval = min(max(watched.poll_interval * 2, SESSION_MIN_POLL_SECONDS),
+                                        SESSION_MAX_POLL_SECONDS)
+
+        watched.next_poll = time.monotonic() + watched.poll_interval
+
+    def _flush(self, db_manager, force=False):
+        with self._condition:
+            if not self._pending_sessions:
+                return
+            overdue = time.monotonic() - self._last_flush >= SESSION_FLUSH_INTERVAL_SECONDS
+            if not (force or overdue or len(self._pending_sessions) >= SESSION_FLUSH_BATCH_SIZE
+                    or not self._watched):
+                return
+            sessions = self._pending_sessions
+            self._pending_sessions = []
+            self._last_flush = time.monotonic()
+        db_manager.add_play_sessions(sessions)
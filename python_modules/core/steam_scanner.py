@@ -3,6 +3,10 @@ import os
 import re
 from pathlib import Path
 
+from core.scan_service_client import iter_service_scanned_games, ScanServiceUnavailable
+from core.store_scanner import StoreScanner
+from data.game_record import Game, STORE_STEAM
+
 try:
     import winreg
 except ImportError:
@@ -114,6 +118,7 @@ def parse_acf_file(file_path):
             appid_match = re.search(r'"appid"\s+"(\d+)"', content)
             name_match = re.search(r'"name"\s+"([^"]+)"', content)
             installdir_match = re.search(r'"installdir"\s+"([^"]+)"', content)
+            size_match = re.search(r'"SizeOnDisk"\s+"(\d+)"', content)
 
             if appid_match:
                 game_info['appid'] = appid_match.group(1)
@@ -121,7 +126,44 @@ def parse_acf_file(file_path):
                 game_info['name'] = name_match.group(1)
             if installdir_match:
                 game_info['installdir'] = installdir_match.group(1)
+            if size_match:
+                game_info['size_on_disk'] = int(size_match.group(1))
 
     except Exception as e:
         print(f"Error reading file {file_path}: {e}")
-    return game_info
\ No newline at end of file
+    return game_info
+
+def scan_steam_games(steamapps_folders=None):
+    if steamapps_folders is None:
+        steamapps_folders = find_all_potential_steamapps_folders()
+    for steamapps_folder in map(Path, steamapps_folders):
+        for acf_file in steamapps_folder.glob('appmanifest_*.acf'):
+            acf_info = parse_acf_file(acf_file)
+            if acf_info and 'appid' in acf_info and 'name' in acf_info:
+                game = Game.from_acf(acf_info)
+                game_install_path = steamapps_folder / "common" / (game.installdir or '')
+                if game_install_path.is_dir():
+                    game.install_path = str(game_install_path)
+                else:
+                    game.install_path = 'N/A - Not Found'
+                yield game
+
+class SteamScanner(StoreScanner):
+    store = STORE_STEAM
+
+    def scan(self):
+        seen_appids = set()
+        try:
+            for game in iter_service_scanned_games():
+                seen_appids.add(game.appid)
+                yield game
+            return
+        except ScanServiceUnavailable as e:
+            print(f"{e}. Falling back to the built-in scanner.")
+
+        for game in scan_steam_games():
+            if game.appid not in seen_appids:
+                yield game
+
+    def launch_url(self, game):
+        return f"steam://rungameid/{game.appid}"
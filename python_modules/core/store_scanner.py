@@ -0,0 +1,60 @@
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
+
+class StoreScanner(ABC):
+    store = None
+
+    @abstractmethod
+    def scan(self):
+        ...
+
+    @abstractmethod
+    def launch_url(self, game):
+        ...
+
+_SCANNER_DONE = object()
+
+def scan_all_stores(scanners):
+    if not scanners:
+        return
+
+    results = queue.Queue(maxsize=256)
+    cancelled = threading.Event()
+
+    def publish(item):
+        # Once the consumer stops reading, a producer blocked on a full queue
+        # would keep the executor below from ever shutting down.
+        while not cancelled.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run_scanner(scanner):
+        try:
+            for game in scanner.scan():
+                if not publish(game):
+                    return
+        except Exception as e:
+            print(f"Error scanning {scanner.store} library: {e}")
+        finally:
+            publish(_SCANNER_DONE)
+
+    with ThreadPoolExecutor(max_workers=len(scanners), thread_name_prefix="StoreScanner") as executor:
+        for scanner in scanners:
+            executor.submit(run_scanner, scanner)
+
+        try:
+            remaining = len(scanners)
+            while remaining:
+                item = results.get()
+                if item is _SCANNER_DONE:
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            cancelled.set()
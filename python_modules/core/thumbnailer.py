@@ -0,0 +1,89 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+from pathlib import Path
+import multiprocessing
+import os
+import tempfile
+
+from utils.constants import THUMBNAIL_TILE_SIZES
+
+def tile_path(covers_dir, appid, tile_name):
+    return Path(covers_dir) / f"{appid}_{tile_name}.jpg"
+
+def write_atomically(target_path, write):
+    target_path = Path(target_path)
+    fd, temp_path = tempfile.mkstemp(dir=target_path.parent, prefix=f".{target_path.name}.", suffix=".part")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(temp_path, target_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+def verify_image(source):
+    from PIL import Image
+
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+    # load() decodes the whole image, so truncated data fails here rather than in the UI.
+    with Image.open(source) as img:
+        img.load()
+
+def generate_tiles(appid, source, covers_dir):
+    from PIL import Image
+
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+
+    tiles = {}
+    with Image.open(source) as img:
+        img = img.convert('RGB')
+        for tile_name, size in THUMBNAIL_TILE_SIZES.items():
+            tile = img.resize(size, Image.LANCZOS)
+            target = tile_path(covers_dir, appid, tile_name)
+            write_atomically(target, lambda f: tile.save(f, format='JPEG', quality=90))
+            tiles[tile_name] = str(target)
+    return tiles
+
+class ThumbnailPipeline:
+    def __init__(self, covers_dir, max_workers=None):
+        self.covers_dir = str(covers_dir)
+        # Forking a process that already runs Qt and worker threads can leave a child
+        # stuck on a lock one of those threads held, so workers start fresh.
+        self.executor = ProcessPoolExecutor(max_workers=max_workers,
+                                            mp_context=multiprocessing.get_context('spawn'))
+        self._pending = {}
+
+    def submit(self, appid, original_path, context=None):
+        future = self.executor.submit(generate_tiles, appid, str(original_path), self.covers_dir)
+        self._pending[future] = (appid, original_path, context)
+        return future
+
+    def iter_completed(self):
+        for future in as_completed(list(self._pending)):
+            appid, original_path, context = self._pending.pop(future)
+            try:
+                tiles = future.result()
+            except Exception as e:
+                print(f"ERROR: Failed to generate thumbnails for AppID {appid} from {original_path}: {e}")
+                tiles = None
+            # An original that failed to decode would fail again on every scan that
+            # reused it, so it is dropped either way and downloaded afresh when due.
+            try:
+                os.unlink(original_path)
+            except OSError:
+                pass
+            yield appid, tiles, context
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,92 @@
+import mmap
+import os
+import threading
+from pathlib import Path
+
+from utils.constants import THUMBNAIL_TILE_SIZES
+
+class CoverAtlas:
+    def __init__(self, atlas_path, db_manager, tile_name='thumbnail'):
+        self.atlas_path = Path(atlas_path)
+        self.atlas_path.parent.mkdir(parents=True, exist_ok=True)
+        self.atlas_path.touch(exist_ok=True)
+        self.db_manager = db_manager
+        self.tile_name = tile_name
+        self.tile_width, self.tile_height = THUMBNAIL_TILE_SIZES[tile_name]
+        self.bytes_per_line = self.tile_width * 3
+        self.tile_bytes = self.bytes_per_line * self.tile_height
+
+        self._lock = threading.Lock()
+        self._slots = db_manager.get_cover_atlas_slots(tile_name)
+        self._file = open(self.atlas_path, 'r+b')
+        slot_count = os.fstat(self._file.fileno()).st_size // self.tile_bytes
+        # Slots of discarded tiles are handed out again before the file grows.
+        self._free_slots = sorted(set(range(slot_count)) - set(self._slots.values()), reverse=True)
+        self._map = None
+        self._mapped_size = 0
+
+    def __contains__(self, appid):
+        return int(appid) in self._slots
+
+    def tile(self, appid):
+        with self._lock:
+            slot = self._slots.get(int(appid))
+            if slot is None:
+                return None
+            end = (slot + 1) * self.tile_bytes
+            if end > self._mapped_size and not self._remap(end):
+                return None
+            return memoryview(self._map)[slot * self.tile_bytes:end]
+
+    def add(self, appid, image_path):
+        from PIL import Image
+
+        with Image.open(image_path) as img:
+            pixels = img.convert('RGB').resize((self.tile_width, self.tile_height), Image.LANCZOS).tobytes()
+
+        with self._lock:
+            slot = self._slots.get(int(appid))
+            if slot is None:
+                if self._free_slots:
+                    slot = self._free_slots.pop()
+                else:
+                    slot = os.fstat(self._file.fileno()).st_size // self.tile_bytes
+            self._file.seek(slot * self.tile_bytes)
+            self._file.write(pixels)
+            self._file.flush()
+            self._slots[int(appid)] = slot
+        self.db_manager.set_cover_atlas_slot(self.tile_name, appid, slot)
+
+    def discard(self, appid):
+        # The DB row is already gone (DBManager drops it with the cover change);
+        # this only forgets the in-memory slot so the stale pixels are not served.
+        with self._lock:
+            slot = self._slots.pop(int(appid), None)
+            if slot is not None:
+                self._free_slots.append(slot)
+                self._free_slots.sort(reverse=True)
+
+    def _remap(self, min_size):
+        file_size = os.fstat(self._file.fileno()).st_size
+        if file_size < min_size:
+            return False
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # A tile view handed out earlier is still alive; keep the old
+                # mapping around until it is collected.
+                pass
+        self._map = mmap.mmap(self._file.fileno(), file_size, access=mmap.ACCESS_READ)
+        self._mapped_size = file_size
+        return True
+
+    def close(self):
+        with self._lock:
+            if self._map is not None:
+                try:
+                    self._map.close()
+                except BufferError:
+                    pass
+                self._map = None
+            self._file.close()
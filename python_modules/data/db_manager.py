@@ -1,22 +1,67 @@
+import json
 import sqlite3
+import threading
+import time
 from pathlib import Path
 
+from data.game_record import Game
+from utils.constants import LOOKUP_RETRY_BASE_SECONDS, LOOKUP_RETRY_MAX_SECONDS
+
+GAME_SUMMARY_COLUMNS = ('appid', 'name', 'cover_thumbnail_path')
+
 class DBManager:
-    def __init__(self, db_path='games.db'):
+    def __init__(self, db_path='games.db', create_tables=True, read_only=False):
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = None
-        self._connect()
-        self._create_table()
+        self.read_only = read_only
+        if not read_only:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.metadata_listeners = []
+        self.cover_listeners = []
+        # Every thread gets its own connection, so a `with self.conn:` block on one
+        # thread never commits or rolls back another thread's transaction. An
+        # in-memory database only exists on the connection that made it, so that
+        # one is shared.
+        self._shared = str(db_path) == ':memory:'
+        self._local = threading.local()
+        self._connections = {}
+        self._connections_lock = threading.Lock()
+        self._closed = False
+        if self.conn and create_tables:
+            self._create_table()
+
+    @property
+    def conn(self):
+        if self._closed:
+            return None
+        if self._shared:
+            with self._connections_lock:
+                if None not in self._connections:
+                    self._connections[None] = self._connect()
+                return self._connections[None]
+        if not hasattr(self._local, 'conn'):
+            self._local.conn = self._connect()
+            if self._local.conn is not None:
+                with self._connections_lock:
+                    # Connections of finished worker threads are closed as new ones open.
+                    for thread in [thread for thread in self._connections
+                                   if thread is not None and not thread.is_alive()]:
+                        self._connections.pop(thread).close()
+                    self._connections[threading.current_thread()] = self._local.conn
+        return self._local.conn
 
     def _connect(self):
         try:
-            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            self.conn.row_factory = sqlite3.Row
+            if self.read_only:
+                conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True,
+                                       check_same_thread=False)
+            else:
+                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
             print(f"Connected to database: {self.db_path}")
+            return conn
         except sqlite3.Error as e:
             print(f"Database connection error: {e}")
-            self.conn = None
+            return None
 
     def _create_table(self):
         if not self.conn:
@@ -37,38 +82,188 @@ class DBManager:
                         install_path TEXT,
                         cover_thumbnail_path TEXT,
                         cover_detail_path TEXT,
-                        last_scanned TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                        last_scanned TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        store TEXT NOT NULL DEFAULT 'steam',
+                        external_id TEXT,
+                        size_on_disk INTEGER,
+                        verified_size INTEGER
+                    )
+                ''')
+                self._migrate_games_table(cursor)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS jobs (
+                        job_key TEXT PRIMARY KEY,
+                        kind TEXT NOT NULL,
+                        payload TEXT,
+                        priority INTEGER NOT NULL,
+                        status TEXT NOT NULL DEFAULT 'pending',
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS play_sessions (
+                        id INTEGER PRIMARY KEY,
+                        appid INTEGER NOT NULL,
+                        started_at REAL NOT NULL,
+                        ended_at REAL NOT NULL
+                    )
+                ''')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_play_sessions_appid ON play_sessions (appid, started_at)')
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS game_playtime (
+                        appid INTEGER PRIMARY KEY,
+                        total_seconds REAL NOT NULL DEFAULT 0,
+                        session_count INTEGER NOT NULL DEFAULT 0,
+                        last_played REAL
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS disk_usage_cache (
+                        install_path TEXT PRIMARY KEY,
+                        dir_mtime_ns INTEGER NOT NULL,
+                        manifest_mtime_ns INTEGER NOT NULL,
+                        verified_size INTEGER NOT NULL
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS library_usage (
+                        library_path TEXT PRIMARY KEY,
+                        game_count INTEGER NOT NULL,
+                        manifest_bytes INTEGER NOT NULL,
+                        verified_bytes INTEGER,
+                        analyzed_at REAL NOT NULL
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS cover_atlas_slots (
+                        atlas TEXT NOT NULL,
+                        appid INTEGER NOT NULL,
+                        slot INTEGER NOT NULL,
+                        PRIMARY KEY (atlas, appid),
+                        UNIQUE (atlas, slot)
+                    )
+                ''')
+                self._migrate_cover_atlas_table(cursor)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS lookup_failures (
+                        appid INTEGER NOT NULL,
+                        lookup TEXT NOT NULL,
+                        reason TEXT,
+                        attempts INTEGER NOT NULL DEFAULT 1,
+                        next_retry_at REAL NOT NULL,
+                        PRIMARY KEY (appid, lookup)
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS checkpoints (
+                        name TEXT PRIMARY KEY,
+                        state TEXT NOT NULL,
+                        updated_at REAL NOT NULL
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS igdb_cache (
+                        igdb_id INTEGER PRIMARY KEY,
+                        payload BLOB NOT NULL,
+                        fetched_at REAL NOT NULL
                     )
                 ''')
-            print("Table 'games' checked/created successfully.")
+            print("Database tables checked/created successfully.")
         except sqlite3.Error as e:
             print(f"Error creating table: {e}")
 
+    def _migrate_games_table(self, cursor):
+        cursor.execute('PRAGMA table_info(games)')
+        columns = {row['name'] for row in cursor.fetchall()}
+        if 'store' not in columns:
+            cursor.execute("ALTER TABLE games ADD COLUMN store TEXT NOT NULL DEFAULT 'steam'")
+        if 'external_id' not in columns:
+            cursor.execute('ALTER TABLE games ADD COLUMN external_id TEXT')
+        if 'size_on_disk' not in columns:
+            cursor.execute('ALTER TABLE games ADD COLUMN size_on_disk INTEGER')
+        if 'verified_size' not in columns:
+            cursor.execute('ALTER TABLE games ADD COLUMN verified_size INTEGER')
+        cursor.execute("UPDATE games SET external_id = CAST(appid AS TEXT) WHERE external_id IS NULL AND store = 'steam'")
+        cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_games_store_external_id ON games (store, external_id)')
+
+    def _migrate_cover_atlas_table(self, cursor):
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'cover_atlas'")
+        if cursor.fetchone():
+            cursor.execute("INSERT OR IGNORE INTO cover_atlas_slots (atlas, appid, slot) "
+                           "SELECT 'thumbnail', appid, slot FROM cover_atlas")
+            cursor.execute('DROP TABLE cover_atlas')
+
+    def _notify_cover_listeners(self, appid):
+        for listener in self.cover_listeners:
+            try:
+                listener(appid)
+            except Exception as e:
+                print(f"Error notifying cover listener for appid {appid}: {e}")
+
+    def _resolve_local_appid(self, cursor, store, external_id):
+        cursor.execute('SELECT appid FROM games WHERE store = ? AND external_id = ?', (store, external_id))
+        row = cursor.fetchone()
+        if row:
+            return row['appid']
+        cursor.execute('SELECT MIN(MIN(appid), 0) - 1 AS appid FROM games')
+        row = cursor.fetchone()
+        return row['appid'] if row and row['appid'] is not None else -1
+
     def close(self):
-        if self.conn:
-            self.conn.close()
+        with self._connections_lock:
+            self._closed = True
+            connections, self._connections = list(self._connections.values()), {}
+        for conn in connections:
+            conn.close()
+        if connections:
             print("database connection closed.")
-            self.conn = None
 
-    def add_or_update_game(self, game_info):
+    def release_thread_connection(self):
+        # Short-lived worker threads hand their connection back when they finish.
+        conn = self._local.__dict__.pop('conn', None)
+        if conn is None or self._shared:
+            return
+        with self._connections_lock:
+            if self._connections.get(threading.current_thread()) is conn:
+                del self._connections[threading.current_thread()]
+                conn.close()
+
+    def add_or_update_game(self, game):
         if not self.conn:
             print("Cannot add/update game: no database connection.")
             return
         try:
             with self.conn:
                 cursor = self.conn.cursor()
+                if game.appid is None:
+                    game.appid = self._resolve_local_appid(cursor, game.store, game.external_id)
+                # A rescan refreshes what the store manifest owns; cover paths are only
+                # replaced by covers this scan actually downloaded.
                 cursor.execute('''
-                    INSERT OR IGNORE INTO games (appid, name, install_path, cover_thumbnail_path, cover_detail_path)
-                    VALUES (?, ?, ?, ?, ?)
+                    INSERT INTO games (appid, store, external_id, name, install_path,
+                                       cover_thumbnail_path, cover_detail_path, size_on_disk)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(appid) DO UPDATE SET
+                        store = excluded.store,
+                        external_id = excluded.external_id,
+                        name = excluded.name,
+                        install_path = excluded.install_path,
+                        size_on_disk = excluded.size_on_disk,
+                        cover_thumbnail_path = COALESCE(excluded.cover_thumbnail_path, cover_thumbnail_path),
+                        cover_detail_path = COALESCE(excluded.cover_detail_path, cover_detail_path),
+                        last_scanned = CURRENT_TIMESTAMP
                 ''', (
-                    game_info.get('appid'),
-                    game_info.get('name'),
-                    game_info.get('full_install_path'),
-                    game_info.get('cover_thumbnail_path'),
-                    game_info.get('cover_detail_path')
+                    game.appid,
+                    game.store,
+                    game.external_id,
+                    game.name,
+                    game.install_path,
+                    game.cover_thumbnail_path,
+                    game.cover_detail_path,
+                    game.size_on_disk
                 ))
         except sqlite3.Error as e:
-            print(f"Error adding/updating game '{game_info.get('name')}': {e}")
+            print(f"Error adding/updating game '{game.name}': {e}")
             
     def get_all_games(self):
         if not self.conn:
@@ -76,12 +271,42 @@ class DBManager:
             return []
         try:
             cursor = self.conn.cursor()
+            cursor.row_factory = Game.row_factory
             cursor.execute('SELECT * FROM games')
-            return [dict(row) for row in cursor.fetchall()]
+            return cursor.fetchall()
         except sqlite3.Error as e:
             print(f"Error fetching all games: {e}")
             return []
 
+    def get_game_summaries_page(self, after_appid=None, limit=200):
+        if not self.conn:
+            print("Cannot get games page: no database connection.")
+            return []
+        try:
+            cursor = self.conn.cursor()
+            cursor.row_factory = Game.row_factory
+            columns = ", ".join(GAME_SUMMARY_COLUMNS)
+            if after_appid is None:
+                cursor.execute(f'SELECT {columns} FROM games ORDER BY appid LIMIT ?', (limit,))
+            else:
+                cursor.execute(f'SELECT {columns} FROM games WHERE appid > ? ORDER BY appid LIMIT ?',
+                               (after_appid, limit))
+            return cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Error fetching games page after appid {after_appid}: {e}")
+            return []
+
+    def iter_game_summaries(self, chunk_size=200):
+        after_appid = None
+        while True:
+            page = self.get_game_summaries_page(after_appid, chunk_size)
+            if not page:
+                return
+            yield page
+            if len(page) < chunk_size:
+                return
+            after_appid = page[-1].appid
+
     def get_game_by_appid(self, appid):
         if not self.conn:
             print("Cannot get game: no database connection.")
@@ -89,9 +314,9 @@ class DBManager:
         
         try:
             cursor = self.conn.cursor()
+            cursor.row_factory = Game.row_factory
             cursor.execute('SELECT * FROM games WHERE appid = ?', (appid,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
+            return cursor.fetchone()
         except sqlite3.Error as e:
             print(f"Error fetching game by appid {appid}: {e}")
             return None
@@ -112,6 +337,13 @@ class DBManager:
             print(f"Metadata for appid {appid} updated successfully")
         except sqlite3.Error as e:
             print(f"Error updating metadata for appid {appid}: {e}")
+            return
+
+        for listener in self.metadata_listeners:
+            try:
+                listener(appid)
+            except Exception as e:
+                print(f"Error notifying metadata listener for appid {appid}: {e}")
             
     def update_game_covers(self, appid, thumbnail_path, detail_path):
         if not self.conn:
@@ -126,8 +358,444 @@ class DBManager:
                     SET cover_thumbnail_path = ?, cover_detail_path = ?
                     WHERE appid = ?
                 ''', (thumbnail_path, detail_path, appid))
+                # Tiles can be regenerated under the same path, so any cover
+                # update makes the packed atlas copies stale.
+                cursor.execute('DELETE FROM cover_atlas_slots WHERE appid = ?', (appid,))
         except sqlite3.Error as e:
             print(f"Error updating covers for appid {appid}: {e}")
+            return
+        self._notify_cover_listeners(appid)
+
+    def save_job(self, job_key, kind, payload, priority):
+        if not self.conn:
+            print("Cannot save job: no database connection.")
+            return
+        try:
+            with self.conn:
+                cursor = self.conn.cursor()
+                cursor.execute('''
+                    INSERT INTO jobs (job_key, kind, payload, priority, status, updated_at)
+                    VALUES (?, ?, ?, ?, 'pending', CURRENT_TIMESTAMP)
+                    ON CONFLICT(job_key) DO UPDATE SET
+                        priority = MIN(priority, excluded.priority),
+                        status = 'pending',
+                        updated_at = CURRENT_TIMESTAMP
+                ''', (job_key, kind, payload, priority))
+        except sqlite3.Error as e:
+            print(f"Error saving job '{job_key}': {e}")
+
+    def set_job_status(self, job_key, status):
+        if not self.conn:
+            print("Cannot update job: no database connection.")
+            return
+        try:
+            with self.conn:
+                cursor = self.conn.cursor()
+                cursor.execute('''
+                    UPDATE jobs SET status = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE job_key = ?
+                ''', (status, job_key))
+        except sqlite3.Error as e:
+            print(f"Error updating job '{job_key}': {e}")
+
+    def get_pending_jobs(self):
+        if not self.conn:
+            print("Cannot get jobs: no database connection.")
+            return []
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+                SELECT job_key, kind, payload, priority FROM jobs
+                WHERE status IN ('pending', 'running')
+                ORDER BY priority, updated_at
+            ''')
+            return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Error fetching pending jobs: {e}")
+            return []
+
+    def is_lookup_due(self, appid, lookup):
+        if not self.conn:
+            return True
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT next_retry_at FROM lookup_failures WHERE appid = ? AND lookup = ?',
+                           (appid, lookup))
+            row = cursor.fetchone()
+            return row is None or row['next_retry_at'] <= time.time()
+        except sqlite3.Error as e:
+            print(f"Error checking lookup '{lookup}' for appid {appid}: {e}")
+            return True
+
+    def record_lookup_failure(self, appid, lookup, reason):
+        if not self.conn:
+            print("Cannot record lookup failure: no database connection.")
+            return
+        try:
+            with self.conn:
+                cursor = self.conn.cursor()
+                cursor.execute('SELECT attempts FROM lookup_failures WHERE appid = ? AND lookup = ?',
+                               (appid, lookup))
+                row = cursor.fetchone()
+                attempts = row['attempts'] + 1 if row else 1
+                delay = min(LOOKUP_RETRY_BASE_SECONDS * 2 ** (attempts - 1), LOOKUP_RETRY_MAX_SECONDS)
+                cursor.execute('''
+                    INSERT OR REPLACE INTO lookup_failures (appid, lookup, reason, attempts, next_retry_at)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (appid, lookup, reason, attempts, time.time() + delay))
+        except sqlite3.Error as e:
+            print(f"Error recording lookup failure '{lookup}' for appid {appid}: {e}")
+
+    def clear_lookup_failure(self, appid, lookup):
+        if not self.conn:
+            return
+        try:
+            with self.conn:
+                cursor = self.conn.cursor()
+                cursor.execute('DELETE FROM lookup_failures WHERE appid = ? AND lookup = ?', (appid, lookup))
+        except sqlite3.Error as e:
+            print(f"Error clearing lookup failure '{lookup}' for appid {appid}: {e}")
+
+    def save_igdb_responses(self, responses):
+        if not self.conn:
+            print("Cannot cache IGDB responses: no database connection.")
+            return
+        now = time.time()
+        try:
+            with self.conn:
+                cursor = self.conn.cursor()
+                cursor.executemany('INSERT OR REPLACE INTO igdb_cache (igdb_id, payload, fetched_at) VALUES (?, ?, ?)',
+                                   [(igdb_id, payload, now) for igdb_id, payload in responses])
+        except sqlite3.Error as e:
+            print(f"Error caching IGDB responses: {e}")
+
+    def get_igdb_response(self, igdb_id):
+        if not self.conn:
+            return None
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT payload, fetched_at FROM igdb_cache WHERE igdb_id = ?', (igdb_id,))
+            row = cursor.fetchone()
+            return (row['payload'], row['fetched_at']) if row else None
+        except sqlite3.Error as e:
+            print(f"Error reading cached IGDB response {igdb_id}: {e}")
+            return None
+
+    def iter_igdb_responses(self):
+        if not self.conn:
+            return
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT igdb_id, payload FROM igdb_cache')
+            for row in cursor:
+                yield row['igdb_id'], row['payload']
+        except sqlite3.Error as e:
+            print(f"Error reading IGDB cache: {e}")
+
+    def get_igdb_fetch_times(self):
+        if not self.conn:
+            return {}
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT igdb_id, fetched_at FROM igdb_cache')
+            return {row['igdb_id']: row['fetched_at'] for row in cursor.fetchall()}
+        except sqlite3.Error as e:
+            print(f"Error reading IGDB cache index: {e}")
+            return {}
+
+    def save_checkpoint(self, name, state):
+        if not self.conn:
+            return
+        try:
+            with self.conn:
+                cursor = self.conn.cursor()
+                cursor.execute('INSERT OR REPLACE INTO checkpoints (name, state, updated_at) VALUES (?, ?, ?)',
+                               (name, json.dumps(state), time.time()))
+        except sqlite3.Error as e:
+            print(f"Error saving checkpoint '{name}': {e}")
+
+    def get_checkpoint(self, name):
+        if not self.conn:
+            return None
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT state FROM checkpoints WHERE name = ?', (name,))
+            row = cursor.fetchone()
+            return json.loads(row['state']) if row else None
+        except sqlite3.Error as e:
+            print(f"Error reading checkpoint '{name}': {e}")
+            return None
+
+    def clear_checkpoint(self, name):
+        if not self.conn:
+            return
+        try:
+            with self.conn:
+                cursor = self.conn.cursor()
+                cursor.execute('DELETE FROM checkpoints WHERE name = ?', (name,))
+        except sqlite3.Error as e:
+            print(f"Error clearing checkpoint '{name}': {e}")
+
+    def clear_missing_cover_paths(self, appid, columns):
+        """Forgets cover paths whose files failed an integrity check."""
+        if not self.conn or not columns:
+            return
+        try:
+            with self.conn:
+                cursor = self.conn.cursor()
+                assignments = ", ".join(f"{column} = NULL" for column in columns)
+                cursor.execute(f'UPDATE games SET {assignments} WHERE appid = ?', (appid,))
+                if 'cover_thumbnail_path' in columns:
+                    cursor.execute('DELETE FROM cover_atlas_slots WHERE appid = ?', (appid,))
+        except sqlite3.Error as e:
+            print(f"Error clearing cover paths for appid {appid}: {e}")
+            return
+        if 'cover_thumbnail_path' in columns:
+            self._notify_cover_listeners(appid)
+
+    def quick_check(self):
+        if not self.conn:
+            return False
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('PRAGMA quick_check')
+            return cursor.fetchone()[0] == 'ok'
+        except sqlite3.Error as e:
+            print(f"Database integrity check failed: {e}")
+            return False
+
+    def get_cover_atlas_slots(self, atlas):
+        if not self.conn:
+            print("Cannot get cover atlas index: no database connection.")
+            return {}
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT appid, slot FROM cover_atlas_slots WHERE atlas = ?', (atlas,))
+            return {row['appid']: row['slot'] for row in cursor.fetchall()}
+        except sqlite3.Error as e:
+            print(f"Error fetching cover atlas index: {e}")
+            return {}
+
+    def set_cover_atlas_slot(self, atlas, appid, slot):
+        if not self.conn:
+            print("Cannot update cover atlas index: no database connection.")
+            return
+        try:
+            with self.conn:
+                cursor = self.conn.cursor()
+                cursor.execute('INSERT OR REPLACE INTO cover_atlas_slots (atlas, appid, slot) VALUES (?, ?, ?)',
+                               (atlas, appid, slot))
+        except sqlite3.Error as e:
+            print(f"Error updating cover atlas slot for appid {appid}: {e}")
+
+    def add_play_sessions(self, sessions):
+        if not self.conn:
+            print("Cannot record play sessions: no database connection.")
+            return
+        try:
+            with self.conn:
+                cursor = self.conn.cursor()
+                cursor.executemany('INSERT INTO play_sessions (appid, started_at, ended_at) VALUES (?, ?, ?)',
+                                   sessions)
+                cursor.executemany('''
+                    INSERT INTO game_playtime (appid, total_seconds, session_count, last_played)
+                    VALUES (?, ?, 1, ?)
+                    ON CONFLICT(appid) DO UPDATE SET
+                        total_seconds = total_seconds + excluded.total_seconds,
+                        session_count = session_count + 1,
+                        last_played = MAX(COALESCE(last_played, 0), excluded.last_played)
+                ''', [(appid, ended_at - started_at, ended_at) for appid, started_at, ended_at in sessions])
+        except sqlite3.Error as e:
+            print(f"Error recording {len(sessions)} play sessions: {e}")
+
+    def get_playtime(self, appid):
+        if not self.conn:
+            return None
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT total_seconds, session_count, last_played FROM game_playtime WHERE appid = ?',
+                           (appid,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+        except sqlite3.Error as e:
+            print(f"Error fetching playtime for appid {appid}: {e}")
+            return None
+
+    def get_all_playtimes(self):
+        if not self.conn:
+            return {}
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT appid, total_seconds FROM game_playtime')
+            return {row['appid']: row['total_seconds'] for row in cursor.fetchall()}
+        except sqlite3.Error as e:
+            print(f"Error fetching playtimes: {e}")
+            return {}
+
+    def get_library_playtime_stats(self):
+        if not self.conn:
+            return None
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+                SELECT COUNT(*) AS games_played,
+                       COALESCE(SUM(total_seconds), 0) AS total_seconds,
+                       COALESCE(SUM(session_count), 0) AS session_count,
+                       MAX(last_played) AS last_played
+                FROM game_playtime
+            ''')
+            return dict(cursor.fetchone())
+        except sqlite3.Error as e:
+            print(f"Error fetching library playtime stats: {e}")
+            return None
+
+    def get_disk_usage_cache(self):
+        if not self.conn:
+            return {}
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT install_path, dir_mtime_ns, manifest_mtime_ns, verified_size FROM disk_usage_cache')
+            return {row['install_path']: (row['dir_mtime_ns'], row['manifest_mtime_ns'], row['verified_size'])
+                    for row in cursor.fetchall()}
+        except sqlite3.Error as e:
+            print(f"Error fetching disk usage cache: {e}")
+            return {}
+
+    def save_disk_usage(self, game_sizes, cache_updates, library_totals):
+        if not self.conn:
+            print("Cannot save disk usage: no database connection.")
+            return
+        try:
+            with self.conn:
+                cursor = self.conn.cursor()
+                cursor.executemany('UPDATE games SET size_on_disk = ?, verified_size = COALESCE(?, verified_size) WHERE appid = ?',
+                                   [(size, verified, appid) for appid, size, verified in game_sizes])
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO disk_usage_cache (install_path, dir_mtime_ns, manifest_mtime_ns, verified_size)
+                    VALUES (?, ?, ?, ?)
+                ''', cache_updates)
+                cursor.execute('DELETE FROM library_usage')
+                cursor.executemany('''
+                    INSERT INTO library_usage (library_path, game_count, manifest_bytes, verified_bytes, analyzed_at)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', library_totals)
+        except sqlite3.Error as e:
+            print(f"Error saving disk usage: {e}")
+
+    def get_library_usage(self):
+        if not self.conn:
+            return []
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT * FROM library_usage ORDER BY manifest_bytes DESC')
+            return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Error fetching library usage: {e}")
+            return []
+
+    def iter_game_rows(self, columns):
+        if not self.conn:
+            print("Cannot read games: no database connection.")
+            return
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(f'SELECT {", ".join(columns)} FROM games ORDER BY appid')
+            for row in cursor:
+                yield dict(row)
+        except sqlite3.Error as e:
+            print(f"Error reading games: {e}")
+
+    def get_lookup_failure_rows(self):
+        if not self.conn:
+            return []
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+                SELECT games.store, games.external_id, lookup_failures.lookup, lookup_failures.reason,
+                       lookup_failures.attempts, lookup_failures.next_retry_at
+                FROM lookup_failures JOIN games ON games.appid = lookup_failures.appid
+            ''')
+            return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Error fetching lookup failures: {e}")
+            return []
+
+    def import_game_rows(self, rows):
+        # Rows are matched on (store, external_id); the install path only comes
+        # from the snapshot for games that are new here.
+        if not self.conn:
+            print("Cannot import games: no database connection.")
+            return 0
+        written = 0
+        try:
+            with self.conn:
+                cursor = self.conn.cursor()
+                for row in rows:
+                    if row.get('appid') is None:
+                        row['appid'] = self._resolve_local_appid(cursor, row['store'], row['external_id'])
+                    try:
+                        cursor.execute('''
+                            INSERT INTO games (appid, store, external_id, name, igdb_id, summary, genres, platforms,
+                                               cover_path, cover_thumbnail_path, cover_detail_path,
+                                               install_path, size_on_disk)
+                            VALUES (:appid, :store, :external_id, :name, :igdb_id, :summary, :genres, :platforms,
+                                    :cover_path, :cover_thumbnail_path, :cover_detail_path,
+                                    :install_path, :size_on_disk)
+                            ON CONFLICT(appid) DO UPDATE SET
+                                name = excluded.name, igdb_id = excluded.igdb_id, summary = excluded.summary,
+                                genres = excluded.genres, platforms = excluded.platforms,
+                                cover_path = excluded.cover_path,
+                                cover_thumbnail_path = excluded.cover_thumbnail_path,
+                                cover_detail_path = excluded.cover_detail_path
+                        ''', row)
+                    except sqlite3.IntegrityError as e:
+                        print(f"Skipping imported game '{row['name']}': {e}")
+                        continue
+                    written += 1
+        except sqlite3.Error as e:
+            print(f"Error importing games: {e}")
+            return 0
+        return written
+
+    def import_lookup_failure_rows(self, rows):
+        if not self.conn:
+            return
+        try:
+            with self.conn:
+                cursor = self.conn.cursor()
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO lookup_failures (appid, lookup, reason, attempts, next_retry_at)
+                    SELECT appid, :lookup, :reason, :attempts, :next_retry_at
+                    FROM games WHERE store = :store AND external_id = :external_id
+                ''', rows)
+        except sqlite3.Error as e:
+            print(f"Error importing lookup failures: {e}")
+
+    def iter_igdb_cache_rows(self):
+        if not self.conn:
+            return
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT igdb_id, payload, fetched_at FROM igdb_cache ORDER BY igdb_id')
+            for row in cursor:
+                yield row['igdb_id'], row['payload'], row['fetched_at']
+        except sqlite3.Error as e:
+            print(f"Error reading IGDB cache: {e}")
+
+    def import_igdb_cache_rows(self, rows):
+        if not self.conn:
+            return
+        try:
+            with self.conn:
+                cursor = self.conn.cursor()
+                # A record fetched here more recently than the snapshot's copy is kept.
+                cursor.executemany('''
+                    INSERT INTO igdb_cache (igdb_id, payload, fetched_at) VALUES (?, ?, ?)
+                    ON CONFLICT(igdb_id) DO UPDATE SET payload = excluded.payload, fetched_at = excluded.fetched_at
+                    WHERE excluded.fetched_at > igdb_cache.fetched_at
+                ''', rows)
+        except sqlite3.Error as e:
+            print(f"Error importing IGDB cache: {e}")
 
 def get_db_manager(db_name="games.db"):
     data_dir = Path.home() / ".EchoGL"
@@ -0,0 +1,93 @@
+import sys
+
+_vocabulary_cache = {}
+
+def split_vocabulary(joined):
+    if not joined:
+        return ()
+    terms = _vocabulary_cache.get(joined)
+    if terms is None:
+        terms = tuple(sys.intern(term.strip()) for term in joined.split(",") if term.strip())
+        _vocabulary_cache[sys.intern(joined)] = terms
+    return terms
+
+def join_vocabulary(terms):
+    return ", ".join(terms) if terms else None
+
+STORE_STEAM = 'steam'
+
+_row_plan = (None, (), ())
+
+def is_steam_appid(appid):
+    # Games from other stores get negative local appids so they can share the
+    # games table with Steam titles without colliding with real Steam appids.
+    try:
+        return int(appid) > 0
+    except (TypeError, ValueError):
+        return False
+
+
+class Game:
+    __slots__ = (
+        'appid', 'igdb_id', 'name', 'summary', 'genres', 'platforms',
+        'cover_path', 'install_path', 'cover_thumbnail_path', 'cover_detail_path',
+        'last_scanned', 'installdir', 'store', 'external_id', 'size_on_disk', 'verified_size',
+    )
+
+    def __init__(self, appid=None, name=None, igdb_id=None, summary=None, genres=(), platforms=(),
+                 cover_path=None, install_path=None, cover_thumbnail_path=None, cover_detail_path=None,
+                 last_scanned=None, installdir=None, store=STORE_STEAM, external_id=None,
+                 size_on_disk=None, verified_size=None):
+        self.appid = appid
+        self.igdb_id = igdb_id
+        self.name = name
+        self.summary = summary
+        self.genres = genres
+        self.platforms = platforms
+        self.cover_path = cover_path
+        self.install_path = install_path
+        self.cover_thumbnail_path = cover_thumbnail_path
+        self.cover_detail_path = cover_detail_path
+        self.last_scanned = last_scanned
+        self.installdir = installdir
+        self.store = store
+        self.size_on_disk = size_on_disk
+        self.verified_size = verified_size
+        self.external_id = external_id if external_id is not None else (
+            str(appid) if appid is not None and store == STORE_STEAM else None
+        )
+
+    @staticmethod
+    def row_factory(cursor, row):
+        global _row_plan
+        # A cursor keeps one description object per query, so the column layout
+        # is worked out once per query rather than once per row.
+        description, columns, missing = _row_plan
+        if cursor.description is not description:
+            description = cursor.description
+            columns = tuple(column for column, *_ in description)
+            missing = tuple(slot for slot in Game.__slots__ if slot not in columns)
+            _row_plan = (description, columns, missing)
+
+        game = Game.__new__(Game)
+        for slot in missing:
+            setattr(game, slot, None)
+        for column, value in zip(columns, row):
+            setattr(game, column, value)
+        game.genres = split_vocabulary(game.genres)
+        game.platforms = split_vocabulary(game.platforms)
+        return game
+
+    @classmethod
+    def from_acf(cls, acf_info):
+        return cls(
+            appid=acf_info.get('appid'),
+            name=acf_info.get('name'),
+            installdir=acf_info.get('installdir'),
+            size_on_disk=acf_info.get('size_on_disk'),
+            store=STORE_STEAM,
+            external_id=acf_info.get('appid'),
+        )
+
+    def __repr__(self):
+        return f"Game(appid={self.appid!r}, name={self.name!r})"
@@ -0,0 +1,246 @@
+import math
+import os
+import re
+import threading
+import zlib
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+GENRE_DIMS = 64
+PLATFORM_DIMS = 32
+SUMMARY_DIMS = 256
+PLAYTIME_DIMS = 1
+FEATURE_DIMS = GENRE_DIMS + PLATFORM_DIMS + SUMMARY_DIMS + PLAYTIME_DIMS
+
+GENRE_WEIGHT = 1.0
+PLATFORM_WEIGHT = 0.5
+SUMMARY_WEIGHT = 1.0
+PLAYTIME_WEIGHT = 0.25
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]{3,}")
+_STOPWORDS = frozenset(
+    "the and for with you your are this that from into their they them its has have will can all "
+    "but not one out who was his her our more new game games player players".split()
+)
+
+def _bucket(term, dims):
+    return zlib.crc32(term.encode('utf-8')) % dims
+
+def _save_array(path, array):
+    temp_path = path.with_name(path.name + '.tmp')
+    with open(temp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(temp_path, path)
+
+def tokenize_summary(summary):
+    if not summary:
+        return []
+    return [t for t in _TOKEN_PATTERN.findall(summary.lower()) if t not in _STOPWORDS]
+
+class SimilarityIndex:
+    def __init__(self, index_dir, db_manager):
+        self.available = np is not None
+        self.index_dir = Path(index_dir)
+        self.db_manager = db_manager
+        self._lock = threading.Lock()
+        self._matrix = None
+        self._row_appids = None
+        self._rows = {}
+        self._doc_freq = None
+        self._doc_count = 0
+        self._dirty = False
+
+        if not self.available:
+            print("NumPy is not installed; similar-game recommendations are disabled.")
+            return
+
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self._matrix_path = self.index_dir / "similarity_matrix.f32"
+        self._appids_path = self.index_dir / "similarity_appids.npy"
+        self._doc_freq_path = self.index_dir / "similarity_doc_freq.npy"
+        self._load()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _load(self):
+        if not (self._matrix_path.is_file() and self._appids_path.is_file() and self._doc_freq_path.is_file()):
+            self._doc_freq = np.zeros(SUMMARY_DIMS + 1, dtype=np.int64)
+            return
+        self._row_appids = np.load(self._appids_path)
+        doc_freq = np.load(self._doc_freq_path)
+        self._doc_count = int(doc_freq[-1])
+        self._doc_freq = doc_freq
+        capacity = self._matrix_path.stat().st_size // (FEATURE_DIMS * 4)
+        if capacity < len(self._row_appids):
+            print("Similarity index is inconsistent; it will be rebuilt.")
+            self._row_appids = None
+            self._doc_freq = np.zeros(SUMMARY_DIMS + 1, dtype=np.int64)
+            self._doc_count = 0
+            return
+        self._matrix = np.memmap(self._matrix_path, dtype=np.float32, mode='r+', shape=(capacity, FEATURE_DIMS))
+        self._rows = {int(appid): row for row, appid in enumerate(self._row_appids)}
+
+    def _ensure_capacity(self, rows_needed):
+        capacity = self._matrix.shape[0] if self._matrix is not None else 0
+        if rows_needed <= capacity:
+            return
+        new_capacity = max(rows_needed, capacity * 2, 256)
+        if self._matrix is not None:
+            self._matrix.flush()
+            del self._matrix
+        with open(self._matrix_path, 'ab') as f:
+            f.truncate(new_capacity * FEATURE_DIMS * 4)
+        self._matrix = np.memmap(self._matrix_path, dtype=np.float32, mode='r+', shape=(new_capacity, FEATURE_DIMS))
+
+    def _summary_term_counts(self, summary):
+        counts = {}
+        for token in tokenize_summary(summary):
+            bucket = _bucket(token, SUMMARY_DIMS)
+            counts[bucket] = counts.get(bucket, 0) + 1
+        return counts
+
+    def _vectorize(self, game, playtime_seconds, term_counts, doc_freq, doc_count):
+        vector = np.zeros(FEATURE_DIMS, dtype=np.float32)
+
+        offset = 0
+        block = vector[offset:offset + GENRE_DIMS]
+        for genre in game.genres:
+            block[_bucket(genre.lower(), GENRE_DIMS)] = 1.0
+        offset += GENRE_DIMS
+
+        block = vector[offset:offset + PLATFORM_DIMS]
+        for platform in game.platforms:
+            block[_bucket(platform.lower(), PLATFORM_DIMS)] = 1.0
+        offset += PLATFORM_DIMS
+
+        block = vector[offset:offset + SUMMARY_DIMS]
+        total_terms = sum(term_counts.values())
+        for bucket, count in term_counts.items():
+            idf = math.log((1 + doc_count) / (1 + doc_freq[bucket])) + 1
+            block[bucket] = (count / total_terms) * idf
+        offset += SUMMARY_DIMS
+
+        vector[offset] = math.log1p(playtime_seconds / 3600) if playtime_seconds else 0.0
+
+        for start, end, weight in (
+            (0, GENRE_DIMS, GENRE_WEIGHT),
+            (GENRE_DIMS, GENRE_DIMS + PLATFORM_DIMS, PLATFORM_WEIGHT),
+            (GENRE_DIMS + PLATFORM_DIMS, FEATURE_DIMS - PLAYTIME_DIMS, SUMMARY_WEIGHT),
+        ):
+            norm = np.linalg.norm(vector[start:end])
+            if norm:
+                vector[start:end] *= weight / norm
+        vector[-1] = PLAYTIME_WEIGHT * min(vector[-1] / 5.0, 1.0)
+
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+        return vector
+
+    def _playtime_seconds(self, appid):
+        playtime = self.db_manager.get_playtime(appid)
+        return playtime['total_seconds'] if playtime else 0
+
+    def rebuild(self):
+        if not self.available:
+            return
+        games = self.db_manager.get_all_games()
+        playtimes = self.db_manager.get_all_playtimes()
+        term_counts = [self._summary_term_counts(game.summary) for game in games]
+
+        # Everything is vectorized outside the lock; most_similar keeps serving
+        # the old matrix until the new one is swapped in below.
+        doc_freq = np.zeros(SUMMARY_DIMS + 1, dtype=np.int64)
+        for counts in term_counts:
+            for bucket in counts:
+                doc_freq[bucket] += 1
+        doc_count = sum(1 for counts in term_counts if counts)
+
+        matrix = np.zeros((max(len(games), 256), FEATURE_DIMS), dtype=np.float32)
+        for row, (game, counts) in enumerate(zip(games, term_counts)):
+            matrix[row] = self._vectorize(game, playtimes.get(game.appid, 0), counts, doc_freq, doc_count)
+        row_appids = np.array([int(game.appid) for game in games], dtype=np.int64)
+        temp_path = self._matrix_path.with_name(self._matrix_path.name + '.tmp')
+        matrix.tofile(temp_path)
+
+        with self._lock:
+            # The old mapping has to be closed before the file can be replaced on Windows.
+            self._matrix = None
+            os.replace(temp_path, self._matrix_path)
+            self._matrix = np.memmap(self._matrix_path, dtype=np.float32, mode='r+', shape=matrix.shape)
+            self._rows = {int(appid): row for row, appid in enumerate(row_appids)}
+            self._row_appids = row_appids
+            self._doc_freq = doc_freq
+            self._doc_count = doc_count
+            self._dirty = True
+        self.save()
+        print(f"Similarity index rebuilt for {len(games)} games.")
+
+    def update_game(self, appid):
+        # Called once per game during bulk enrichment; the caller saves once at the end.
+        if not self.available:
+            return
+        game = self.db_manager.get_game_by_appid(appid)
+        if not game:
+            return
+        counts = self._summary_term_counts(game.summary)
+        playtime_seconds = self._playtime_seconds(appid)
+
+        with self._lock:
+            row = self._rows.get(int(appid))
+            if row is None:
+                row = len(self._rows)
+                self._ensure_capacity(row + 1)
+                self._rows[int(appid)] = row
+                self._row_appids = np.append(
+                    self._row_appids if self._row_appids is not None else np.empty(0, dtype=np.int64), int(appid)
+                )
+                was_counted = False
+            else:
+                summary_block = self._matrix[row, GENRE_DIMS + PLATFORM_DIMS:FEATURE_DIMS - PLAYTIME_DIMS]
+                was_counted = bool(summary_block.any())
+            if counts and not was_counted:
+                # Document frequencies only ever grow here; rows written earlier
+                # keep their weights until the next full rebuild.
+                for bucket in counts:
+                    self._doc_freq[bucket] += 1
+                self._doc_count += 1
+            self._matrix[row] = self._vectorize(game, playtime_seconds, counts, self._doc_freq, self._doc_count)
+            self._dirty = True
+
+    def save(self):
+        if not self.available:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            if self._matrix is not None:
+                self._matrix.flush()
+            self._doc_freq[-1] = self._doc_count
+            _save_array(self._appids_path, self._row_appids)
+            _save_array(self._doc_freq_path, self._doc_freq)
+            self._dirty = False
+
+    def most_similar(self, appid, k=10):
+        if not self.available:
+            return []
+        with self._lock:
+            row = self._rows.get(int(appid))
+            if row is None or not self._rows:
+                return []
+            count = len(self._rows)
+            matrix = self._matrix[:count]
+            scores = matrix @ matrix[row]
+            scores[row] = -1.0
+
+            k = min(k, count - 1)
+            if k <= 0:
+                return []
+            top = np.argpartition(scores, -k)[-k:]
+            top = top[np.argsort(scores[top])[::-1]]
+            return [(int(self._row_appids[i]), float(scores[i])) for i in top if scores[i] > 0]
@@ -1,8 +1,10 @@
 import sys
+import multiprocessing
 from PyQt6.QtWidgets import QApplication
 from ui.main_window import MainWindow 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -0,0 +1,16 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Modules import each other as top-level packages (core, data, utils), the same
+# way main.py sees them when it is run from python_modules.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data.db_manager import DBManager
+
+@pytest.fixture
+def db_manager(tmp_path):
+    manager = DBManager(tmp_path / "games.db")
+    yield manager
+    manager.close()
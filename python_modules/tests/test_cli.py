@@ -0,0 +1,134 @@
+import io
+import json
+import threading
+
+import pytest
+
+import cli
+from core.cover_downloader import CoverDownloader
+from core.library_scanner import scan_library
+from core.store_scanner import StoreScanner
+from data.db_manager import DBManager
+from data.game_record import Game, STORE_STEAM
+
+Image = pytest.importorskip("PIL.Image")
+
+MISSING_APPID = 404
+
+def _jpeg_bytes():
+    buffer = io.BytesIO()
+    Image.new('RGB', (600, 900), 'navy').save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+@pytest.fixture
+def fake_downloads(monkeypatch):
+    """Serves every Steam cover from memory and records which threads asked for one."""
+    image_data = _jpeg_bytes()
+    threads = set()
+
+    def download(self, cover_config):
+        threads.add(threading.get_ident())
+        if f"/{MISSING_APPID}/" in cover_config['urls'][0]:
+            return None, 'not_found'
+        return image_data, None
+
+    monkeypatch.setattr(CoverDownloader, '_download_cover_bytes', download)
+    return threads
+
+class FixedScanner(StoreScanner):
+    store = STORE_STEAM
+
+    def __init__(self, appids):
+        self.appids = appids
+
+    def scan(self):
+        for appid in self.appids:
+            yield Game(appid=appid, name=f"Game {appid}", store=STORE_STEAM, external_id=str(appid))
+
+    def launch_url(self, game):
+        return f"steam://rungameid/{game.appid}"
+
+def _lookup_failures(db_manager):
+    return {(row['external_id'], row['lookup']): row['reason'] for row in db_manager.get_lookup_failure_rows()}
+
+def test_scan_downloads_covers_off_thread_and_stores_them(tmp_path, db_manager, fake_downloads):
+    cover_downloader = CoverDownloader(tmp_path / "covers", db_manager)
+    appids = [10, 20, 30, MISSING_APPID]
+
+    scan_library(db_manager, cover_downloader, [FixedScanner(appids)], max_workers=2)
+
+    assert threading.get_ident() not in fake_downloads
+    games = {game.appid: game for game in db_manager.get_all_games()}
+    assert sorted(games) == sorted(appids)
+    for appid in (10, 20, 30):
+        assert games[appid].cover_thumbnail_path.endswith(f"{appid}_thumbnail.jpg")
+        assert games[appid].cover_detail_path.endswith(f"{appid}_detail.jpg")
+    assert games[MISSING_APPID].cover_thumbnail_path is None
+    assert _lookup_failures(db_manager) == {
+        (str(MISSING_APPID), 'steam_thumbnail'): 'not_found',
+        (str(MISSING_APPID), 'steam_detail'): 'not_found',
+    }
+    assert not list((tmp_path / "covers").glob("*_original"))
+
+def test_covers_command_writes_results_on_the_main_thread(tmp_path, monkeypatch, fake_downloads):
+    db_path = tmp_path / "games.db"
+    db_manager = DBManager(db_path)
+    for appid in (10, 20, MISSING_APPID):
+        db_manager.add_or_update_game(Game(appid=appid, name=f"Game {appid}"))
+    db_manager.close()
+    monkeypatch.setenv('HOME', str(tmp_path))
+
+    main_thread = threading.get_ident()
+    writer_threads = set()
+    update_game_covers = DBManager.update_game_covers
+    record_lookup_failure = DBManager.record_lookup_failure
+
+    def tracked(method):
+        def wrapper(self, *args):
+            writer_threads.add(threading.get_ident())
+            return method(self, *args)
+        return wrapper
+
+    monkeypatch.setattr(DBManager, 'update_game_covers', tracked(update_game_covers))
+    monkeypatch.setattr(DBManager, 'record_lookup_failure', tracked(record_lookup_failure))
+
+    output = io.StringIO()
+    monkeypatch.setattr('sys.stdout', output)
+    assert cli.main(['--json', '--jobs', '4', '--db', str(db_path), 'covers']) == 0
+
+    assert writer_threads == {main_thread}
+    events = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert events[-1] == {'event': 'covers_finished', 'downloaded': 4, 'failed': 2}
+    db_manager = DBManager(db_path)
+    try:
+        assert db_manager.get_game_by_appid(20).cover_detail_path.endswith("20_detail.jpg")
+        assert len(_lookup_failures(db_manager)) == 2
+    finally:
+        db_manager.close()
+
+@pytest.mark.parametrize('command', [['scan'], ['covers'], ['enrich'], ['stats'], ['check']])
+def test_dry_run_creates_nothing(tmp_path, monkeypatch, command):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setattr('core.library_scanner.default_store_scanners', lambda: [FixedScanner([10])])
+
+    assert cli.main(['--dry-run', '--json', *command]) == 0
+    assert list(tmp_path.iterdir()) == []
+
+def test_dry_run_leaves_an_existing_database_untouched(tmp_path, monkeypatch):
+    db_path = tmp_path / "games.db"
+    db_manager = DBManager(db_path)
+    db_manager.add_or_update_game(Game(appid=10, name="Game 10"))
+    db_manager.close()
+    before = db_path.read_bytes()
+    monkeypatch.setattr('core.library_scanner.default_store_scanners', lambda: [FixedScanner([10, 20])])
+
+    output = io.StringIO()
+    monkeypatch.setattr('sys.stdout', output)
+    assert cli.main(['--dry-run', '--json', '--db', str(db_path), 'scan']) == 0
+    assert cli.main(['--dry-run', '--json', '--db', str(db_path), 'covers']) == 0
+
+    assert db_path.read_bytes() == before
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['games.db']
+    events = [json.loads(line)['event'] for line in output.getvalue().splitlines()]
+    assert events.count('game_found') == 2
+    assert events.count('would_download') == 2
@@ -0,0 +1,85 @@
+import sqlite3
+
+import pytest
+
+from data.cover_atlas import CoverAtlas
+from data.db_manager import DBManager
+from data.game_record import Game
+
+Image = pytest.importorskip("PIL.Image")
+
+@pytest.fixture
+def covers(tmp_path):
+    paths = {}
+    for appid, color in ((1, 'red'), (2, 'green'), (3, 'blue')):
+        path = tmp_path / f"{appid}_thumbnail.jpg"
+        Image.new('RGB', (180, 270), color).save(path)
+        paths[appid] = path
+    return paths
+
+@pytest.fixture
+def atlas(tmp_path, db_manager, covers):
+    for appid in covers:
+        db_manager.add_or_update_game(Game(appid=appid, name=f"Game {appid}"))
+    atlas = CoverAtlas(tmp_path / "thumbnails.atlas", db_manager)
+    db_manager.cover_listeners.append(atlas.discard)
+    yield atlas
+    atlas.close()
+
+def _first_pixel(atlas, appid):
+    tile = atlas.tile(appid)
+    pixel = bytes(tile[:3])
+    tile.release()
+    return pixel
+
+def test_cover_update_drops_the_packed_tile(atlas, db_manager, covers):
+    atlas.add(1, covers[1])
+    assert 1 in atlas
+    assert _first_pixel(atlas, 1)[0] > 200
+
+    db_manager.update_game_covers(1, str(covers[1]), None)
+
+    assert 1 not in atlas
+    assert atlas.tile(1) is None
+    assert db_manager.get_cover_atlas_slots('thumbnail') == {}
+
+def test_integrity_clear_drops_the_packed_tile(atlas, db_manager, covers):
+    atlas.add(2, covers[2])
+    db_manager.clear_missing_cover_paths(2, ['cover_detail_path'])
+    assert 2 in atlas
+    db_manager.clear_missing_cover_paths(2, ['cover_thumbnail_path'])
+    assert 2 not in atlas
+
+def test_discarded_slots_are_reused(atlas, db_manager, covers):
+    atlas.add(1, covers[1])
+    atlas.add(2, covers[2])
+    db_manager.update_game_covers(1, str(covers[1]), None)
+    atlas.add(3, covers[3])
+
+    slots = db_manager.get_cover_atlas_slots('thumbnail')
+    assert slots == {2: 1, 3: 0}
+    assert atlas.atlas_path.stat().st_size == 2 * atlas.tile_bytes
+    assert _first_pixel(atlas, 3)[2] > 200
+
+def test_hidpi_atlas_keeps_its_own_slots(tmp_path, db_manager, covers, atlas):
+    hidpi = CoverAtlas(tmp_path / "thumbnails@2x.atlas", db_manager, 'thumbnail@2x')
+    try:
+        hidpi.add(1, covers[1])
+        assert (hidpi.tile_width, hidpi.tile_height) == (360, 540)
+        assert 1 in hidpi and 1 not in atlas
+        assert db_manager.get_cover_atlas_slots('thumbnail@2x') == {1: 0}
+    finally:
+        hidpi.close()
+
+def test_old_atlas_index_is_migrated(tmp_path):
+    db_path = tmp_path / "games.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('CREATE TABLE cover_atlas (appid INTEGER PRIMARY KEY, slot INTEGER NOT NULL UNIQUE)')
+        conn.executemany('INSERT INTO cover_atlas VALUES (?, ?)', [(10, 0), (20, 1)])
+    conn.close()
+
+    manager = DBManager(db_path)
+    try:
+        assert manager.get_cover_atlas_slots('thumbnail') == {10: 0, 20: 1}
+    finally:
+        manager.close()
@@ -0,0 +1,49 @@
+from data.game_record import Game, split_vocabulary, join_vocabulary
+
+def test_slots_cover_every_games_column(db_manager):
+    cursor = db_manager.conn.execute('PRAGMA table_info(games)')
+    columns = {row['name'] for row in cursor.fetchall()}
+    # row_factory assigns every selected column to a slot, so a column added to
+    # the table without a matching slot breaks every SELECT * on games.
+    assert columns - set(Game.__slots__) == set()
+
+def test_row_factory_round_trip(db_manager):
+    db_manager.add_or_update_game(Game(appid=620, name="Portal 2", install_path="/games/portal2"))
+    db_manager.update_game_metadata(620, 72, "Puzzles.", "Puzzle, Platform", "PC (Microsoft Windows)", None)
+
+    game = db_manager.get_game_by_appid(620)
+    assert isinstance(game, Game)
+    assert game.name == "Portal 2"
+    assert game.install_path == "/games/portal2"
+    assert game.external_id == "620"
+    assert game.genres == ("Puzzle", "Platform")
+    assert game.platforms == ("PC (Microsoft Windows)",)
+
+def test_rescan_refreshes_store_fields_and_keeps_covers(db_manager):
+    db_manager.add_or_update_game(Game(appid=620, name="Portal 2", install_path="/old/portal2", size_on_disk=10))
+    db_manager.update_game_covers(620, "/covers/620_thumbnail.jpg", "/covers/620_detail.jpg")
+    db_manager.update_game_metadata(620, 72, "Puzzles.", "Puzzle", "PC (Microsoft Windows)", None)
+
+    db_manager.add_or_update_game(Game(appid=620, name="Portal 2 (Updated)", install_path="/new/portal2",
+                                       size_on_disk=20))
+
+    game = db_manager.get_game_by_appid(620)
+    assert (game.name, game.install_path, game.size_on_disk) == ("Portal 2 (Updated)", "/new/portal2", 20)
+    assert (game.cover_thumbnail_path, game.cover_detail_path) == ("/covers/620_thumbnail.jpg",
+                                                                   "/covers/620_detail.jpg")
+    assert (game.igdb_id, game.summary) == (72, "Puzzles.")
+
+def test_summary_rows_default_missing_columns(db_manager):
+    db_manager.add_or_update_game(Game(appid=10, name="Counter-Strike"))
+    page = db_manager.get_game_summaries_page()
+    assert [game.appid for game in page] == [10]
+    assert page[0].genres == ()
+    assert page[0].summary is None
+
+def test_vocabulary_is_shared_between_rows():
+    first = split_vocabulary("Action, RPG")
+    second = split_vocabulary("".join(["Action, ", "RPG"]))
+    assert first is second
+    assert split_vocabulary(None) == ()
+    assert join_vocabulary(first) == "Action, RPG"
+    assert join_vocabulary(()) is None
@@ -0,0 +1,47 @@
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("requests")
+
+from data.game_record import Game
+from utils import metadata_updater
+from utils.metadata_updater import resolve_igdb_matches
+
+IGDB_GAMES = {
+    1: {'id': 1, 'name': "Hades"},
+    2: {'id': 2, 'name': "The Witcher 3: Wild Hunt"},
+    3: {'id': 3, 'name': "Mega Man 10"},
+    4: {'id': 4, 'name': "Obscure Indie"},
+}
+
+@pytest.fixture
+def igdb(monkeypatch):
+    requests = []
+
+    def by_names(access_token, client_id, names):
+        requests.append(('names', tuple(names)))
+        return [info for info in IGDB_GAMES.values() if info['name'] in names]
+
+    def search(access_token, client_id, name, limit=10):
+        requests.append(('search', name))
+        return [info for info in IGDB_GAMES.values() if name.split()[0] in info['name']]
+
+    monkeypatch.setattr(metadata_updater, 'get_igdb_games_by_names', by_names)
+    monkeypatch.setattr(metadata_updater, 'search_igdb_games', search)
+    return requests
+
+def _store_game(appid, name):
+    return Game(appid=appid, name=name, store='gog', external_id=str(-appid))
+
+def test_store_titles_are_resolved_by_one_batched_name_query(db_manager, igdb):
+    games = [_store_game(-1, "Hades"), _store_game(-2, "The Witcher® 3: Wild Hunt - Game of the Year Edition"),
+             _store_game(-3, "Mega Man X"), _store_game(-4, "Obscure Indie Deluxe Edition")]
+
+    matches, failures = resolve_igdb_matches(db_manager, 'token', 'client', games)
+
+    assert {appid: info['id'] for appid, info in matches.items()} == {-1: 1, -2: 2, -4: 4}
+    assert failures == {-3: 'no_igdb_match'}
+    # One name query for the batch; only the title without a confident match is searched.
+    assert [kind for kind, _ in igdb] == ['names', 'search']
+    assert igdb[1] == ('search', "Mega Man X")
+    assert sorted(igdb_id for igdb_id, _ in db_manager.iter_igdb_responses()) == [1, 2, 3, 4]
@@ -0,0 +1,64 @@
+import threading
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from core.job_scheduler import JobScheduler
+from core.library_scanner import scan_library
+from core.store_scanner import StoreScanner
+from data.game_record import Game, STORE_STEAM
+
+GAME_COUNT = 300
+
+class FixedScanner(StoreScanner):
+    store = STORE_STEAM
+
+    def __init__(self, appids, started):
+        self.appids = appids
+        self.started = started
+
+    def scan(self):
+        self.started.wait(timeout=10)
+        for appid in self.appids:
+            yield Game(appid=appid, name=f"Game {appid}", store=STORE_STEAM, external_id=str(appid))
+
+    def launch_url(self, game):
+        return f"steam://rungameid/{game.appid}"
+
+def test_job_and_scan_write_through_their_own_connections(db_manager, capsys):
+    started = threading.Barrier(2)
+    recorded = threading.Event()
+    connections = {'gui': db_manager.conn}
+
+    def record_sessions():
+        connections['job'] = db_manager.conn
+        started.wait(timeout=10)
+        for appid in range(1, GAME_COUNT + 1):
+            db_manager.add_play_sessions([(appid, 0.0, float(appid))])
+        recorded.set()
+
+    def scan():
+        connections['scan'] = db_manager.conn
+        scan_library(db_manager, None, [FixedScanner(range(1, GAME_COUNT + 1), started)], download_covers=False)
+        db_manager.release_thread_connection()
+
+    scheduler = JobScheduler(db_manager, idle_delay=0)
+    scheduler.register('record_sessions', record_sessions)
+    scheduler.start()
+    try:
+        scan_thread = threading.Thread(target=scan)
+        scan_thread.start()
+        scheduler.schedule('record_sessions', key='sessions')
+
+        assert recorded.wait(timeout=30)
+        scan_thread.join(timeout=30)
+    finally:
+        # Lets the running job mark itself done before the worker exits.
+        scheduler.stop()
+
+    assert len({id(conn) for conn in connections.values()}) == 3
+    assert "Error" not in capsys.readouterr().out
+    assert len(db_manager.get_all_games()) == GAME_COUNT
+    assert db_manager.get_all_playtimes() == {appid: float(appid) for appid in range(1, GAME_COUNT + 1)}
+    assert db_manager.get_pending_jobs() == []
@@ -0,0 +1,38 @@
+from core.library_snapshot import export_snapshot, import_snapshot
+from data.db_manager import DBManager
+from data.game_record import Game
+from utils.igdb_cache import encode_response, decode_response
+
+def _enriched_library(db_manager):
+    db_manager.add_or_update_game(Game(appid=10, name="Portal"))
+    db_manager.update_game_metadata(10, 71, "Think with portals.", "Puzzle", "PC", None)
+    db_manager.save_igdb_responses([(71, encode_response({'id': 71, 'name': "Portal"}))])
+
+def test_snapshot_carries_the_igdb_cache(tmp_path, db_manager):
+    _enriched_library(db_manager)
+    archive = tmp_path / "library.tar.gz"
+    export_snapshot(db_manager, tmp_path / "covers", archive)
+
+    restored = DBManager(tmp_path / "restored.db")
+    try:
+        stats = import_snapshot(restored, tmp_path / "restored_covers", archive)
+
+        assert stats['games_written'] == 1
+        assert stats['igdb_cache_records'] == 1
+        # The fetch time survives, so the restored game is not treated as stale.
+        assert restored.get_igdb_fetch_times() == db_manager.get_igdb_fetch_times()
+        payload, _ = restored.get_igdb_response(71)
+        assert decode_response(payload) == {'id': 71, 'name': "Portal"}
+    finally:
+        restored.close()
+
+def test_newer_local_igdb_record_is_kept_on_restore(tmp_path, db_manager):
+    _enriched_library(db_manager)
+    archive = tmp_path / "library.tar.gz"
+    export_snapshot(db_manager, tmp_path / "covers", archive)
+    db_manager.save_igdb_responses([(71, encode_response({'id': 71, 'name': "Portal (refreshed)"}))])
+
+    import_snapshot(db_manager, tmp_path / "covers", archive)
+
+    payload, _ = db_manager.get_igdb_response(71)
+    assert decode_response(payload)['name'] == "Portal (refreshed)"
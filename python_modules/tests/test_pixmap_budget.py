@@ -0,0 +1,101 @@
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from core.pixmap_budget import PixmapBudget
+
+FULL_BYTES = 1000
+LOW_BYTES = 100
+
+class _Signal:
+    def __init__(self):
+        self.slots = []
+
+    def connect(self, slot):
+        self.slots.append(slot)
+
+class _Region:
+    def __init__(self, empty):
+        self.empty = empty
+
+    def isEmpty(self):
+        return self.empty
+
+class FakeCover:
+    """Stands in for a gallery tile: full-res, low-res or evicted, and counts state checks."""
+    state_checks = 0
+
+    def __init__(self, on_screen=False):
+        self.destroyed = _Signal()
+        self.on_screen = on_screen
+        self.state = 'full'
+
+    def isVisible(self):
+        return self.on_screen
+
+    def visibleRegion(self):
+        return _Region(not self.on_screen)
+
+    def pixmap_state(self):
+        FakeCover.state_checks += 1
+        return self.state
+
+    def pixmap_bytes(self):
+        return {'full': FULL_BYTES, 'low': LOW_BYTES}.get(self.state, 0)
+
+    def downgrade_pixmap(self, placeholder=False):
+        self.state = 'evicted' if placeholder else 'low'
+
+def test_least_recently_shown_covers_are_downgraded_first():
+    budget = PixmapBudget(3 * FULL_BYTES + 2 * LOW_BYTES)
+    covers = [FakeCover() for _ in range(4)]
+    for cover in covers:
+        budget.track(cover)
+
+    assert [cover.state for cover in covers] == ['low', 'full', 'full', 'full']
+
+    budget.touch(covers[1])
+    budget.track(FakeCover())
+    assert [cover.state for cover in covers] == ['low', 'full', 'low', 'full']
+
+def test_placeholders_only_once_everything_is_low_res():
+    budget = PixmapBudget(2 * LOW_BYTES)
+    covers = [FakeCover() for _ in range(3)]
+    for cover in covers:
+        budget.track(cover)
+
+    assert [cover.state for cover in covers] == ['evicted', 'low', 'low']
+    usage = budget.usage()
+    assert usage['bytes'] == 2 * LOW_BYTES
+    assert (usage['full_res'], usage['low_res'], usage['evicted']) == (0, 2, 1)
+
+def test_on_screen_covers_are_never_downgraded():
+    budget = PixmapBudget(FULL_BYTES)
+    visible = FakeCover(on_screen=True)
+    budget.track(visible)
+    for _ in range(3):
+        budget.track(FakeCover())
+
+    assert visible.state == 'full'
+
+def test_retracking_a_reloaded_cover_restores_it_to_full_res():
+    budget = PixmapBudget(FULL_BYTES + LOW_BYTES)
+    first, second = FakeCover(), FakeCover()
+    budget.track(first)
+    budget.track(second)
+    assert first.state == 'low'
+
+    first.state = 'full'
+    budget.track(first)
+    assert (first.state, second.state) == ('full', 'low')
+    assert budget.usage()['bytes'] == FULL_BYTES + LOW_BYTES
+
+def test_enforcing_the_cap_does_not_rescan_downgraded_covers():
+    budget = PixmapBudget(96 * FULL_BYTES)
+    FakeCover.state_checks = 0
+    for _ in range(5000):
+        budget.track(FakeCover())
+
+    # A rescan of the downgraded prefix on every track() would be ~12.5M checks.
+    assert FakeCover.state_checks < 5 * 5000
+    assert budget.usage()['bytes'] <= 96 * FULL_BYTES
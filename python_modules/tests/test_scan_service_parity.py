@@ -0,0 +1,42 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from benchmarks.steam_scan_throughput import (
+    make_steam_library, build_scan_service, start_scan_service, game_key,
+)
+from core.scan_service_client import iter_service_scanned_games
+from core.steam_scanner import scan_steam_games
+
+@pytest.fixture(scope='module')
+def scan_service_url(tmp_path_factory):
+    prebuilt = os.environ.get('ECHOGL_SCAN_SERVICE_BINARY')
+    if prebuilt:
+        binary, error = Path(prebuilt), None
+    else:
+        binary, error = build_scan_service(tmp_path_factory.mktemp("service") / "scan_service")
+    if binary is None:
+        pytest.skip(f"scan service cannot be built here: {error}")
+    process, url = start_scan_service(binary)
+    yield url
+    process.terminate()
+    process.wait()
+
+def test_service_matches_builtin_scanner(tmp_path, scan_service_url):
+    folders = make_steam_library(tmp_path, games=300)
+
+    builtin = sorted(map(game_key, scan_steam_games(folders)))
+    service = sorted(map(game_key, iter_service_scanned_games(scan_service_url, steamapps_folders=folders)))
+
+    assert len(builtin) == 300
+    assert service == builtin
+
+def test_builtin_scanner_reads_fixture_library(tmp_path):
+    folders = make_steam_library(tmp_path, games=6, libraries=1)
+    games = {game.appid: game for game in scan_steam_games(folders)}
+
+    assert sorted(games, key=int) == ['10', '20', '30', '40', '50', '60']
+    assert games['10'].install_path == 'N/A - Not Found'
+    assert games['20'].install_path == str(folders[0] / "common" / "Game Dir 20")
+    assert all(game.size_on_disk for game in games.values())
@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from core.session_monitor import SessionMonitor, find_game_processes
+from data.db_manager import DBManager
+
+pytestmark = pytest.mark.skipif(not os.path.isdir('/proc'), reason="needs /proc")
+
+SLEEPER = [sys.executable, '-c', 'import time; time.sleep(30)']
+
+@pytest.fixture
+def spawn():
+    processes = []
+
+    def start(args, **kwargs):
+        process = subprocess.Popen(args, **kwargs)
+        processes.append(process)
+        return process.pid
+
+    yield start
+    for process in processes:
+        process.kill()
+        process.wait()
+
+def test_matches_process_running_in_install_dir(tmp_path, spawn):
+    install_dir = tmp_path / "Game"
+    install_dir.mkdir()
+    pid = spawn(SLEEPER, cwd=install_dir)
+
+    assert pid in find_game_processes(install_dir)
+    assert pid not in find_game_processes(tmp_path / "Other")
+
+def test_matches_wine_style_command_line(tmp_path, spawn):
+    install_dir = tmp_path / "Game"
+    install_dir.mkdir()
+    windows_path = 'Z:' + str(install_dir / "bin" / "game.exe").replace('/', '\\')
+    unix_pid = spawn([*SLEEPER, str(install_dir / "game.exe")])
+    wine_pid = spawn([*SLEEPER, windows_path])
+
+    found = find_game_processes(install_dir)
+    assert {unix_pid, wine_pid} <= found
+
+def test_sibling_directory_with_same_prefix_does_not_match(tmp_path, spawn):
+    (tmp_path / "Game").mkdir()
+    (tmp_path / "Game 2").mkdir()
+    pid = spawn(SLEEPER, cwd=tmp_path / "Game 2")
+
+    assert pid not in find_game_processes(tmp_path / "Game")
+
+def test_sessions_are_written_through_the_worker_connection(db_manager, monkeypatch):
+    writers = []
+    written = threading.Event()
+    add_play_sessions = DBManager.add_play_sessions
+
+    def tracked(self, sessions):
+        writers.append((self, threading.current_thread().name))
+        add_play_sessions(self, sessions)
+        written.set()
+
+    monkeypatch.setattr(DBManager, 'add_play_sessions', tracked)
+    monitor = SessionMonitor(db_manager)
+    try:
+        with monitor._condition:
+            monitor._pending_sessions.append((10, 0.0, 90.0))
+        # Keep waking the worker until it flushes; the first wake-up can land before it waits.
+        for _ in range(200):
+            with monitor._condition:
+                monitor._condition.notify_all()
+            if written.wait(timeout=0.05):
+                break
+        assert written.is_set()
+    finally:
+        monitor.stop()
+
+    (writer, thread_name), = writers
+    assert writer is not db_manager
+    assert thread_name == "SessionMonitor"
+    assert db_manager.get_all_playtimes() == {10: 90.0}
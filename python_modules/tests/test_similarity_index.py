@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from data.game_record import Game
+from data.similarity_index import SimilarityIndex
+
+LIBRARY = (
+    (1, "Doom", "Shooter", "PC", "Fight demons on Mars with shotguns and rockets."),
+    (2, "Quake", "Shooter", "PC", "Fight monsters across dark dimensions with rockets."),
+    (3, "Stardew Valley", "Simulator, Role-playing (RPG)", "PC, Switch", "Grow crops and raise animals on a farm."),
+    (4, "Harvest Moon", "Simulator", "Switch", "Raise animals and grow crops on your farm."),
+)
+
+@pytest.fixture
+def library(db_manager):
+    for appid, name, genres, platforms, summary in LIBRARY:
+        db_manager.add_or_update_game(Game(appid=appid, name=name))
+        db_manager.update_game_metadata(appid, appid * 100, summary, genres, platforms, None)
+    return db_manager
+
+def _top(index, appid):
+    return [similar_appid for similar_appid, _ in index.most_similar(appid, k=1)]
+
+def test_rebuild_finds_neighbours_and_survives_reload(tmp_path, library):
+    index = SimilarityIndex(tmp_path / "similarity", library)
+    index.rebuild()
+
+    assert len(index) == 4
+    assert _top(index, 1) == [2]
+    assert _top(index, 3) == [4]
+    assert not list((tmp_path / "similarity").glob("*.tmp"))
+
+    reloaded = SimilarityIndex(tmp_path / "similarity", library)
+    assert len(reloaded) == 4
+    assert reloaded.most_similar(3) == index.most_similar(3)
+
+def test_updates_are_written_on_save(tmp_path, library):
+    index = SimilarityIndex(tmp_path / "similarity", library)
+    index.rebuild()
+    library.add_or_update_game(Game(appid=5, name="Doom Eternal"))
+    library.update_game_metadata(5, 500, "Fight demons with shotguns.", "Shooter", "PC", None)
+
+    index.update_game(5)
+    assert _top(index, 5) == [1]
+    assert len(SimilarityIndex(tmp_path / "similarity", library)) == 4
+
+    index.save()
+    assert len(SimilarityIndex(tmp_path / "similarity", library)) == 5
+
+def test_queries_are_served_while_rebuilding(tmp_path, library):
+    index = SimilarityIndex(tmp_path / "similarity", library)
+    index.rebuild()
+
+    vectorizing = threading.Event()
+    release = threading.Event()
+    vectorize = index._vectorize
+
+    def slow_vectorize(*args):
+        vectorizing.set()
+        release.wait(10)
+        return vectorize(*args)
+
+    index._vectorize = slow_vectorize
+    rebuild = threading.Thread(target=index.rebuild)
+    rebuild.start()
+    try:
+        assert vectorizing.wait(10)
+        answered = []
+        query = threading.Thread(target=lambda: answered.append(_top(index, 1)))
+        query.start()
+        query.join(2)
+        assert answered == [[2]]
+    finally:
+        release.set()
+        rebuild.join()
+    assert _top(index, 3) == [4]
@@ -0,0 +1,12 @@
+import pytest
+
+from benchmarks.startup_imports import profile_imports, loaded_deferred_modules
+
+def test_main_window_import_defers_heavy_modules():
+    pytest.importorskip("PyQt6.QtWidgets")
+    timings = profile_imports('ui.main_window')
+    assert loaded_deferred_modules(timings) == []
+
+def test_cli_import_defers_heavy_modules():
+    timings = profile_imports('cli')
+    assert loaded_deferred_modules(timings) == []
@@ -0,0 +1,139 @@
+import shutil
+import threading
+from pathlib import Path
+
+import pytest
+
+from core.epic_scanner import EpicScanner
+from core.gog_scanner import GOGScanner
+from core.store_scanner import StoreScanner, scan_all_stores
+from data.game_record import Game
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+class CountingScanner(StoreScanner):
+    store = 'counting'
+
+    def __init__(self, count):
+        self.count = count
+        self.finished = threading.Event()
+
+    def scan(self):
+        try:
+            for index in range(self.count):
+                yield Game(name=f"Game {index}", store=self.store, external_id=str(index))
+        finally:
+            self.finished.set()
+
+    def launch_url(self, game):
+        return f"counting://{game.external_id}"
+
+class FailingScanner(CountingScanner):
+    store = 'failing'
+
+    def scan(self):
+        yield from super().scan()
+        raise OSError("library folder vanished")
+
+def test_scanners_must_implement_the_interface():
+    class Incomplete(StoreScanner):
+        def scan(self):
+            return iter(())
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+def test_epic_scanner_reads_installed_games():
+    games = {game.external_id: game for game in EpicScanner(FIXTURES / "epic").scan()}
+
+    # Incomplete installs, non-game apps and unreadable manifests are skipped.
+    assert sorted(games) == ['Fortnite', 'Min']
+    assert games['Min'].name == 'Hades'
+    assert games['Min'].store == 'epic'
+    assert games['Min'].install_path == 'N/A - Not Found'
+
+def test_epic_scanner_resolves_existing_install_location(tmp_path):
+    manifests = tmp_path / "Manifests"
+    shutil.copytree(FIXTURES / "epic", manifests)
+    install_dir = tmp_path / "Hades"
+    install_dir.mkdir()
+    item = (manifests / "Hades.item").read_text(encoding='utf-8')
+    (manifests / "Hades.item").write_text(
+        item.replace('C:\\\\Program Files\\\\Epic Games\\\\Hades', str(install_dir).replace('\\', '\\\\')),
+        encoding='utf-8')
+
+    game = next(game for game in EpicScanner(manifests).scan() if game.external_id == 'Min')
+
+    assert game.install_path == str(install_dir)
+    assert game.installdir == 'Hades'
+    assert EpicScanner(manifests).launch_url(game) == \
+        "com.epicgames.launcher://apps/Min?action=launch&silent=true"
+
+def test_epic_scanner_without_manifests_dir(tmp_path):
+    assert list(EpicScanner(tmp_path / "missing").scan()) == []
+
+def test_gog_scanner_reads_root_games_only():
+    install_dirs = sorted((FIXTURES / "gog").iterdir())
+    games = list(GOGScanner(install_dirs).scan())
+
+    assert [(game.external_id, game.name) for game in games] == [('1456460669', "Baldur's Gate 3")]
+    assert games[0].install_path == str(FIXTURES / "gog" / "Baldurs Gate 3")
+    assert games[0].installdir == "Baldurs Gate 3"
+
+def test_gog_launch_url_prefers_primary_executable(tmp_path):
+    install_dir = FIXTURES / "gog" / "Baldurs Gate 3"
+    scanner = GOGScanner([install_dir])
+    game = next(scanner.scan())
+
+    launch_url = scanner.launch_url(game)
+    assert launch_url.startswith('file:')
+    assert launch_url.endswith('/bin/bg3.exe')
+
+    game.install_path = str(tmp_path / "uninstalled")
+    assert scanner.launch_url(game) == "goggalaxy://openGameView/1456460669"
+
+def _consume_in_thread(consume):
+    done = threading.Event()
+    errors = []
+
+    def run():
+        try:
+            consume()
+        except Exception as e:
+            errors.append(e)
+        finally:
+            done.set()
+
+    threading.Thread(target=run, daemon=True).start()
+    assert done.wait(10), "scan_all_stores did not return"
+    return errors
+
+def test_scan_all_stores_merges_every_scanner():
+    scanners = [CountingScanner(300), FailingScanner(5)]
+    games = []
+    assert _consume_in_thread(lambda: games.extend(scan_all_stores(scanners))) == []
+
+    assert len(games) == 305
+    assert {game.store for game in games} == {'counting', 'failing'}
+
+def test_scan_all_stores_returns_when_consumer_stops_early():
+    # More games than the result queue holds, so producers are blocked when the consumer leaves.
+    scanners = [CountingScanner(5000), CountingScanner(5000)]
+
+    def consume():
+        for index, _ in enumerate(scan_all_stores(scanners)):
+            if index == 10:
+                break
+
+    assert _consume_in_thread(consume) == []
+    assert all(scanner.finished.is_set() for scanner in scanners)
+
+def test_scan_all_stores_returns_when_consumer_raises():
+    scanners = [CountingScanner(5000)]
+
+    def consume():
+        for _ in scan_all_stores(scanners):
+            raise ValueError("consumer failed")
+
+    errors = _consume_in_thread(consume)
+    assert [str(e) for e in errors] == ["consumer failed"]
@@ -0,0 +1,62 @@
+import pytest
+
+from utils.title_matcher import TitleMatcher, lookup_names, normalize_title
+
+@pytest.mark.parametrize('title, normalized', [
+    ("The Witcher® 3: Wild Hunt – Game of the Year Edition", "witcher 3 wild hunt"),
+    ("DOOM Eternal Deluxe Edition", "doom eternal"),
+    ("Baldur's Gate: Enhanced Edition", "baldurs gate"),
+    ("Grand Theft Auto V", "grand theft auto 5"),
+    ("Final Fantasy VII", "final fantasy 7"),
+    ("Mega Man X", "mega man x"),
+    ("Final Fantasy X/X-2 HD Remaster", "final fantasy x x 2"),
+    ("Pokémon™ Ranger", "pokemon ranger"),
+    ("The Game", "game"),
+    ("Deluxe", "deluxe"),
+    ("", ""),
+])
+def test_normalize_title(title, normalized):
+    assert normalize_title(title) == normalized
+
+def test_exact_title_is_a_confident_match():
+    match = TitleMatcher([(1, "The Witcher 3: Wild Hunt"), (2, "The Witcher 2")]).match(
+        "The Witcher® 3: Wild Hunt – Game of the Year Edition")
+    assert (match.igdb_id, match.score, match.confident) == (1, 1.0, True)
+
+def test_roman_and_arabic_numerals_match():
+    match = TitleMatcher([(1, "Grand Theft Auto V"), (2, "Grand Theft Auto IV")]).match("Grand Theft Auto 5")
+    assert (match.igdb_id, match.confident) == (1, True)
+
+def test_lone_x_is_not_ten():
+    match = TitleMatcher([(1, "Mega Man 10")]).match("Mega Man X")
+    assert not match.confident
+    assert match.score < 0.75
+
+    match = TitleMatcher([(1, "Mega Man 10"), (2, "Mega Man X")]).match("Mega Man X")
+    assert (match.igdb_id, match.confident) == (2, True)
+
+def test_bundle_does_not_claim_one_of_its_games():
+    candidates = [(1, "Final Fantasy X-2"), (2, "Final Fantasy X")]
+    match = TitleMatcher(candidates).match("Final Fantasy X/X-2 HD Remaster")
+    assert not match.confident
+    assert match.score < 0.75
+
+    match = TitleMatcher(candidates + [(3, "Final Fantasy X/X-2 HD Remaster")]).match(
+        "FINAL FANTASY X/X-2 HD Remaster")
+    assert (match.igdb_id, match.confident) == (3, True)
+
+def test_sequels_are_not_confused():
+    match = TitleMatcher([(1, "Dark Souls II"), (2, "Dark Souls III")]).match("DARK SOULS™ III")
+    assert (match.igdb_id, match.confident) == (2, True)
+
+def test_excluded_ids_are_skipped():
+    matcher = TitleMatcher([(1, "Hades"), (2, "Hades II")])
+    assert matcher.match("Hades", exclude={1}).igdb_id == 2
+
+def test_no_shared_trigrams_is_no_match():
+    assert TitleMatcher([(1, "Portal")]).match("Zzyzx") is None
+
+def test_lookup_names():
+    assert lookup_names("DOOM Eternal™ Deluxe Edition") == ["DOOM Eternal Deluxe Edition", "DOOM Eternal"]
+    assert lookup_names("Hades") == ["Hades"]
+    assert lookup_names(None) == []
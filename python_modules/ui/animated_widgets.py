@@ -8,6 +8,11 @@ from PyQt6.QtCore import (
 )
 from PyQt6.QtGui import QPixmap, QColor, QPainter
 
+from core.pixmap_budget import pixmap_bytes
+
+HOVER_SCALE = 1.2
+LOW_RES_SCALE = 0.25
+
 class AnimatedStackedWidget(QStackedWidget):
     animation_finished = pyqtSignal()
 
@@ -129,6 +134,8 @@ class AnimatedStackedWidget(QStackedWidget):
 
 
 class AnimatedCoverLabel(QLabel):
+    hovered = pyqtSignal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.original_size = QSize(180, 270)
@@ -138,6 +145,7 @@ class AnimatedCoverLabel(QLabel):
         self.setContentsMargins(0, 0, 0, 0)
 
         self._original_pixmap = QPixmap()
+        self._pixmap_state = 'empty'
 
         self.shadow_effect = QGraphicsDropShadowEffect(self)
         self.shadow_effect.setBlurRadius(0)
@@ -162,13 +170,14 @@ class AnimatedCoverLabel(QLabel):
     @animatedSize.setter
     def animatedSize(self, size: QSize):
         self.setFixedSize(size)
-        if not self._original_pixmap.isNull():
+        if self._pixmap_state == 'full':
             self._update_displayed_pixmap()
 
     def eventFilter(self, obj, event):
         if obj == self:
             if event.type() == QEvent.Type.Enter:
-                self.animate_tile_scale(1.2)
+                self.hovered.emit()
+                self.animate_tile_scale(HOVER_SCALE)
                 self.animate_glow(20)
             elif event.type() == QEvent.Type.Leave:
                 self.animate_tile_scale(1.0)
@@ -210,9 +219,40 @@ class AnimatedCoverLabel(QLabel):
         self.glow_animation.start()
 
     def setOriginalPixmap(self, pixmap: QPixmap):
+        # Keep no more source pixels than the hover-scaled tile can show.
+        max_size = self.original_size * (HOVER_SCALE * self.devicePixelRatioF())
+        if pixmap.width() > max_size.width() or pixmap.height() > max_size.height():
+            pixmap = pixmap.scaled(max_size, Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                                   Qt.TransformationMode.SmoothTransformation)
         self._original_pixmap = pixmap
+        self._pixmap_state = 'full'
+        self.setScaledContents(False)
         self._update_displayed_pixmap()
 
+    def pixmap_state(self):
+        return self._pixmap_state
+
+    def pixmap_bytes(self):
+        if self._pixmap_state == 'low':
+            # The low-res copy is both the source and what the label paints.
+            return pixmap_bytes(self._original_pixmap)
+        return pixmap_bytes(self._original_pixmap) + pixmap_bytes(self.pixmap())
+
+    def downgrade_pixmap(self, placeholder=False):
+        if placeholder or self._original_pixmap.isNull():
+            self._original_pixmap = QPixmap()
+            self._pixmap_state = 'evicted'
+            self.setScaledContents(False)
+            super().setPixmap(QPixmap())
+            return
+        low_res = self._original_pixmap.scaled(self.original_size * LOW_RES_SCALE,
+                                               Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                                               Qt.TransformationMode.FastTransformation)
+        self._original_pixmap = low_res
+        self._pixmap_state = 'low'
+        self.setScaledContents(True)
+        super().setPixmap(low_res)
+
     def _update_displayed_pixmap(self):
         if self._original_pixmap.isNull():
             super().setPixmap(QPixmap())
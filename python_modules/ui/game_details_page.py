@@ -3,6 +3,8 @@ from PyQt6.QtCore import Qt, pyqtSignal, QObject
 from pathlib import Path
 from PyQt6.QtGui import QPixmap
 
+from data.game_record import Game, join_vocabulary
+
 class GameDetailsPage(QWidget):
     launch_game_requested = pyqtSignal(str) 
 
@@ -44,34 +46,69 @@ class GameDetailsPage(QWidget):
 
         self._current_appid = None 
 
-    def set_game_info(self, game_info: dict):
+    def set_game_info(self, game: Game):
+        prefetched = self.game_manager.take_prefetched_details(game.appid)
+        if prefetched:
+            game_row, detail_image = prefetched
+        else:
+            game_row = self.game_manager.get_game_by_appid(game.appid)
+        if game_row:
+            game = game_row
 
-        self._current_appid = game_info.get('appid')
+        self._current_appid = str(game.appid) if game.appid else None
         
-        self.detail_game_name_label.setText(game_info.get('name', 'N/A'))
+        self.detail_game_name_label.setText(game.name or 'N/A')
 
-        self.detail_info_label.setText(f"AppID: {game_info.get('appid', 'N/A')}<br>"
-                                         f"Install Path: {game_info.get('install_path', 'N/A')}<br><br>"
-                                         f"<b>Genres</b> {game_info.get('genres', 'N/A')}<br>"
-                                         f"<b>Platforms</b> {game_info.get('platforms', 'N/A')}<br><br>"
-                                         f"<b>Summary</b> {game_info.get('summary', 'N/A')}")
+        self.detail_info_label.setText(f"Store: {game.store or 'N/A'}<br>"
+                                         f"AppID: {game.external_id or game.appid or 'N/A'}<br>"
+                                         f"Install Path: {game.install_path or 'N/A'}<br>"
+                                         f"Size on disk: {self._format_size(game)}<br><br>"
+                                         f"<b>Genres</b> {join_vocabulary(game.genres) or 'N/A'}<br>"
+                                         f"<b>Platforms</b> {join_vocabulary(game.platforms) or 'N/A'}<br><br>"
+                                         f"<b>Playtime</b> {self._format_playtime(game.appid)}<br><br>"
+                                         f"<b>Summary</b> {game.summary or 'N/A'}"
+                                         f"{self._format_similar_games(game.appid)}")
         
         self.detail_launch_button.setEnabled(bool(self._current_appid)) 
 
-        cover_path = game_info.get('cover_path')
+        if prefetched and not detail_image.isNull():
+            self.game_manager.set_label_pixmap(self.detail_cover_label, QPixmap.fromImage(detail_image))
+            return
+
+        cover_path = game.cover_path
         if cover_path and Path(cover_path).exists():
             pixmap = QPixmap(cover_path)
             if not pixmap.isNull():
-                self.detail_cover_label.setPixmap(pixmap)
+                self.game_manager.set_label_pixmap(self.detail_cover_label, pixmap)
             else:
                 self.detail_cover_label.clear()
         else:
             self.detail_cover_label.clear()
         
         self.game_manager.request_display_cover.emit(
-            str(game_info.get('appid')), self.detail_cover_label, 'detail', True
+            str(game.appid), self.detail_cover_label, 'detail', True
         )
 
+    def _format_size(self, game):
+        size = game.verified_size if game.verified_size is not None else game.size_on_disk
+        if not size:
+            return "N/A"
+        return f"{size / 1024 ** 3:.1f} GB"
+
+    def _format_playtime(self, appid):
+        playtime = self.game_manager.get_playtime(appid)
+        if not playtime or not playtime['total_seconds']:
+            return "Never played"
+        minutes = int(playtime['total_seconds'] // 60)
+        return f"{minutes // 60}h {minutes % 60}m over {playtime['session_count']} sessions"
+
+    def _format_similar_games(self, appid):
+        similar = self.game_manager.get_similar_games(appid, k=10)
+        if not similar:
+            return ""
+        names = ", ".join(game.name for game, _ in similar)
+        return f"<br><br><b>More like this</b> {names}"
+
     def clear_info(self):
         self._current_appid = None
         self.detail_cover_label.clear()
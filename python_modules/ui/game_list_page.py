@@ -1,10 +1,17 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QScrollArea, QHBoxLayout, QLabel
-from PyQt6.QtCore import Qt, QEvent, pyqtSignal, QObject # Добавил QObject для сигналов
+from PyQt6.QtCore import Qt, QEvent, pyqtSignal, QObject, QRect, QTimer # Добавил QObject для сигналов
+
+import bisect
 
 from ui.animated_widgets import AnimatedCoverLabel
+from ui.kinetic_scroller import KineticScroller
+from utils.constants import GALLERY_DIFF_COALESCE_MS, SCROLL_WHEEL_PIXELS_PER_NOTCH
+
+def _tile_signature(game):
+    return (game.name, game.cover_thumbnail_path) if game is not None else None
 
 class GameListPage(QWidget):
-    game_selected = pyqtSignal(dict)
+    game_selected = pyqtSignal(object)
 
     def __init__(self, game_manager, parent=None):
         super().__init__(parent)
@@ -22,52 +29,181 @@ class GameListPage(QWidget):
         self.scroll_layout.setContentsMargins(0, 0, 0, 0)
         self.scroll_layout.setSpacing(20)
 
+        self._empty_label = QLabel("No games found.")
+        self._empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self._empty_label.hide()
+        self.scroll_layout.addWidget(self._empty_label)
+        self.scroll_layout.addStretch()
+
+        self._tiles = {}
+        self._tile_order = []
+        self._pending = {}
+        self._streamed_appids = set()
+        self._diff_timer = QTimer(self)
+        self._diff_timer.setSingleShot(True)
+        self._diff_timer.setInterval(GALLERY_DIFF_COALESCE_MS)
+        self._diff_timer.timeout.connect(self._flush_pending_diff)
+
         self.scroll_area.setWidget(self.scroll_content_widget)
         self.page_layout.addWidget(self.scroll_area)
 
+        self.scroller = KineticScroller(self.scroll_area.horizontalScrollBar(), self)
+        self.scroller.settled.connect(self._prefetch_visible_tiles)
+
+        self.scroll_area.installEventFilter(self)
         self.scroll_area.viewport().installEventFilter(self)
+        self.scroll_area.horizontalScrollBar().valueChanged.connect(self._prefetch_visible_tiles)
 
     def display_games(self, games_list: list):
-        for i in range(self.scroll_layout.count()):
-            item = self.scroll_layout.itemAt(i)
-            if item and hasattr(item.widget(), 'setEnabled'):
-                item.widget().setEnabled(False)
-
-        while self.scroll_layout.count():
-            item = self.scroll_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        if not games_list:
-            no_games_label = QLabel("No Steam games found.")
-            no_games_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.scroll_layout.addWidget(no_games_label)
+        self.begin_games_stream()
+        self.add_games_page(games_list)
+        self.finish_games_stream()
+
+    def begin_games_stream(self):
+        self._streamed_appids = set()
+
+    def add_games_page(self, games_page: list):
+        added, updated = [], []
+        for game in games_page:
+            self._streamed_appids.add(game.appid)
+            tile = self._tiles.get(game.appid)
+            if tile is None:
+                added.append(game)
+            elif _tile_signature(tile.property("game_info")) != _tile_signature(game):
+                updated.append(game)
+        self.apply_diff(added, updated)
+
+    def finish_games_stream(self):
+        known = set(self._tiles) | {appid for appid, game in self._pending.items() if game is not None}
+        self.apply_diff(removed=known - self._streamed_appids)
+        if not self._pending:
+            self._empty_label.setVisible(not self._tiles)
+
+    def apply_diff(self, added=(), updated=(), removed=()):
+        for game in added:
+            self._pending[game.appid] = game
+        for game in updated:
+            self._pending[game.appid] = game
+        for appid in removed:
+            self._pending[appid] = None
+        if self._pending and not self._diff_timer.isActive():
+            self._diff_timer.start()
+
+    def _flush_pending_diff(self):
+        pending, self._pending = self._pending, {}
+        if not pending:
             return
 
-        for game in games_list:
-            cover_label = AnimatedCoverLabel()
-            cover_label.setProperty("game_info", game) 
-
-            cover_label.mousePressEvent = lambda event, info=game: self.game_selected.emit(info)
-
-            self.scroll_layout.addWidget(cover_label)
-            self.game_manager.request_display_cover.emit(
-                str(game.get('appid')), cover_label, 'thumbnail', True
-            )
-
-        self.scroll_layout.addStretch()
+        for appid, game in pending.items():
+            tile = self._tiles.get(appid)
+            if game is None:
+                if tile is not None:
+                    self._remove_tile(appid, tile)
+            elif tile is None:
+                self._insert_tile(game)
+            else:
+                self._update_tile(tile, game)
 
+        self._empty_label.setVisible(not self._tiles)
         self.scroll_content_widget.adjustSize()
-        self.scroll_layout.update()
-        self.scroll_area.viewport().update()
+        QTimer.singleShot(0, self._prefetch_visible_tiles)
+
+    def _insert_tile(self, game):
+        cover_label = AnimatedCoverLabel()
+        cover_label.setProperty("game_info", game)
+
+        cover_label.mousePressEvent = lambda event, label=cover_label: self.game_selected.emit(label.property("game_info"))
+        cover_label.hovered.connect(lambda appid=game.appid: self.game_manager.prefetch_game_details(appid))
+
+        # Tiles stay in appid order, the same order get_game_summaries pages in.
+        index = bisect.bisect_left(self._tile_order, game.appid)
+        self._tile_order.insert(index, game.appid)
+        self._tiles[game.appid] = cover_label
+        self.scroll_layout.insertWidget(index, cover_label)
+        self.game_manager.request_display_cover.emit(str(game.appid), cover_label, 'thumbnail', True)
+
+    def _update_tile(self, tile, game):
+        previous = tile.property("game_info")
+        tile.setProperty("game_info", game)
+        if previous is None or previous.cover_thumbnail_path != game.cover_thumbnail_path:
+            self.game_manager.request_display_cover.emit(str(game.appid), tile, 'thumbnail', True)
+
+    def _remove_tile(self, appid, tile):
+        del self._tiles[appid]
+        self._tile_order.pop(bisect.bisect_left(self._tile_order, appid))
+        tile.setEnabled(False)
+        self.game_manager.pixmap_budget.untrack(tile)
+        self.scroll_layout.removeWidget(tile)
+        tile.deleteLater()
+
+    def _tile_stride(self):
+        tile = self._tiles[self._tile_order[0]]
+        return tile.original_size.width() + self.scroll_layout.spacing()
+
+    def _visible_tiles(self):
+        if not self._tile_order:
+            return []
+        viewport = self.scroll_area.viewport()
+        left = -self.scroll_content_widget.x()
+        visible_rect = QRect(left, 0, viewport.width(), viewport.height())
+
+        # Tiles share one width, so the visible slice of _tile_order follows from the
+        # scroll offset; one extra tile on each side absorbs a hover-enlarged neighbour.
+        stride = self._tile_stride()
+        first = max(0, left // stride - 1)
+        last = min(len(self._tile_order), (left + viewport.width()) // stride + 2)
+        tiles = (self._tiles[appid] for appid in self._tile_order[first:last])
+        return [tile for tile in tiles if tile.geometry().intersects(visible_rect)]
+
+    def _prefetch_visible_tiles(self, *args):
+        # During a fast glide covers would be decoded for tiles that are gone a frame
+        # later; only keep them warm in the budget and catch up once the scroller settles.
+        loading = not self.scroller.is_fast()
+        for widget in self._visible_tiles():
+            game = widget.property("game_info")
+            if not game:
+                continue
+            self.game_manager.pixmap_budget.touch(widget)
+            if not loading:
+                continue
+            if widget.pixmap_state() in ('low', 'evicted'):
+                self.game_manager.request_display_cover.emit(str(game.appid), widget, 'thumbnail', True)
+            self.game_manager.prefetch_game_details(game.appid)
+
+    def _wheel_delta(self, event):
+        # Touchpads report exact pixels; mouse wheels report eighths of a degree.
+        pixels = event.pixelDelta()
+        if not pixels.isNull():
+            return -(pixels.y() or pixels.x())
+        angle = event.angleDelta()
+        return -(angle.y() or angle.x()) * SCROLL_WHEEL_PIXELS_PER_NOTCH / 120
+
+    def _handle_key(self, key):
+        if not self._tile_order:
+            return False
+        page = self.scroll_area.viewport().width()
+        h_bar = self.scroll_area.horizontalScrollBar()
+        if key == Qt.Key.Key_Left:
+            self.scroller.scroll_by(-self._tile_stride())
+        elif key == Qt.Key.Key_Right:
+            self.scroller.scroll_by(self._tile_stride())
+        elif key == Qt.Key.Key_PageUp:
+            self.scroller.scroll_by(-page)
+        elif key == Qt.Key.Key_PageDown:
+            self.scroller.scroll_by(page)
+        elif key == Qt.Key.Key_Home:
+            self.scroller.scroll_to(h_bar.minimum())
+        elif key == Qt.Key.Key_End:
+            self.scroller.scroll_to(h_bar.maximum())
+        else:
+            return False
+        return True
 
     def eventFilter(self, obj, event):
         if obj == self.scroll_area.viewport() and event.type() == QEvent.Type.Wheel:
-            h_bar = self.scroll_area.horizontalScrollBar()
-            scroll_amount = 50
-            if event.angleDelta().y() > 0:
-                h_bar.setValue(h_bar.value() - scroll_amount)
-            else:
-                h_bar.setValue(h_bar.value() + scroll_amount)
+            self.scroller.scroll_by(self._wheel_delta(event))
             return True
+        if obj == self.scroll_area and event.type() == QEvent.Type.KeyPress:
+            if self._handle_key(event.key()):
+                return True
         return super().eventFilter(obj, event)
\ No newline at end of file
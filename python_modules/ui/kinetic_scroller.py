@@ -0,0 +1,89 @@
+from PyQt6.QtCore import QObject, QTimer, QElapsedTimer, Qt, pyqtSignal
+from PyQt6.QtGui import QGuiApplication
+
+from utils.constants import (
+    SCROLL_EASING, SCROLL_FAST_PIXELS_PER_FRAME, SCROLL_DEFAULT_REFRESH_HZ,
+)
+
+def frame_interval_ms(widget=None):
+    screen = widget.screen() if widget is not None else QGuiApplication.primaryScreen()
+    refresh_rate = screen.refreshRate() if screen is not None else 0
+    return max(1, round(1000 / (refresh_rate or SCROLL_DEFAULT_REFRESH_HZ)))
+
+class KineticScroller(QObject):
+    """Moves a scroll bar towards an accumulated target once per display frame.
+
+    Input only moves the target, so a burst of wheel or touchpad events costs one
+    scroll bar update per frame. Each frame covers a fixed share of the remaining
+    distance, which gives the glide an ease-out curve.
+    """
+    settled = pyqtSignal()
+
+    def __init__(self, scroll_bar, parent=None):
+        super().__init__(parent)
+        self._bar = scroll_bar
+        self._position = float(scroll_bar.value())
+        self._target = self._position
+        self._velocity = 0.0
+        self._applying = False
+
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(frame_interval_ms(scroll_bar))
+        self._timer.timeout.connect(self._step)
+        self._frame_clock = QElapsedTimer()
+
+        scroll_bar.valueChanged.connect(self._on_value_changed)
+
+    def scroll_by(self, delta):
+        if not self._timer.isActive():
+            self._position = self._target = float(self._bar.value())
+        self.scroll_to(self._target + delta)
+
+    def scroll_to(self, value):
+        self._target = float(min(max(value, self._bar.minimum()), self._bar.maximum()))
+        if not self._timer.isActive():
+            self._timer.setInterval(frame_interval_ms(self._bar))
+            self._frame_clock.start()
+            self._timer.start()
+
+    def is_scrolling(self):
+        return self._timer.isActive()
+
+    def is_fast(self):
+        return abs(self._velocity) >= SCROLL_FAST_PIXELS_PER_FRAME
+
+    def _on_value_changed(self, value):
+        # Dragging the bar or a programmatic jump takes over from any glide in progress.
+        if not self._applying:
+            self._position = self._target = float(value)
+            self._velocity = 0.0
+
+    def _step(self):
+        elapsed = self._frame_clock.restart()
+
+        # The range can shrink while gliding, e.g. when tiles are removed.
+        self._target = min(max(self._target, self._bar.minimum()), self._bar.maximum())
+        remaining = self._target - self._position
+        if abs(remaining) < 0.5:
+            self._position = self._target
+            self._velocity = 0.0
+            self._set_bar_value()
+            self._timer.stop()
+            self.settled.emit()
+            return
+
+        # Scale the step by how many frames actually passed so a late frame
+        # catches up instead of slowing the glide down.
+        frames = max(1.0, elapsed / self._timer.interval())
+        step = remaining * (1 - (1 - SCROLL_EASING) ** frames)
+        self._velocity = step / frames
+        self._position += step
+        self._set_bar_value()
+
+    def _set_bar_value(self):
+        self._applying = True
+        try:
+            self._bar.setValue(round(self._position))
+        finally:
+            self._applying = False
@@ -1,8 +1,8 @@
 # python_modules/ui/main_window.py
 from PyQt6.QtWidgets import (
-    QMainWindow, QVBoxLayout, QPushButton, QWidget, QLabel
+    QApplication, QMainWindow, QVBoxLayout, QPushButton, QWidget, QLabel
 )
-from PyQt6.QtCore import Qt, QUrl, QTimer 
+from PyQt6.QtCore import Qt, QUrl, QTimer, QEvent
 from PyQt6.QtGui import QDesktopServices
 
 from pathlib import Path
@@ -11,6 +11,7 @@ from ui.animated_widgets import AnimatedStackedWidget
 from ui.game_list_page import GameListPage
 from ui.game_details_page import GameDetailsPage
 from core.game_manager import GameManager 
+from data.game_record import Game
 
 class MainWindow(QMainWindow):
     def __init__(self, parent=None):
@@ -35,6 +36,8 @@ class MainWindow(QMainWindow):
         self.game_manager.scan_started.connect(self._on_scan_started)
         self.game_manager.scan_finished.connect(self._on_scan_finished)
         self.game_manager.game_launched.connect(self._on_game_launched)
+        self.game_manager.library_stale.connect(self._on_library_stale)
+        self.game_manager.ready.connect(self._on_game_manager_ready)
 
         self.game_manager.request_display_cover.connect(self.game_manager.display_cover_on_label)
 
@@ -44,8 +47,9 @@ class MainWindow(QMainWindow):
         self.title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.main_layout.addWidget(self.title_label)
 
-        self.scan_button = QPushButton("Scan Steam Games")
+        self.scan_button = QPushButton("Scan Games")
         self.scan_button.clicked.connect(self.game_manager.scan_for_games)
+        self.scan_button.setEnabled(False)
         self.main_layout.addWidget(self.scan_button)
 
         self.stacked_widget = AnimatedStackedWidget()
@@ -55,6 +59,9 @@ class MainWindow(QMainWindow):
         self.game_list_page = GameListPage(self.game_manager)
         self.stacked_widget.addWidget(self.game_list_page)
         self.game_list_page.game_selected.connect(self._show_game_details)
+        self.game_manager.library_load_started.connect(self.game_list_page.begin_games_stream)
+        self.game_manager.library_page_loaded.connect(self.game_list_page.add_games_page)
+        self.game_manager.library_loaded.connect(self.game_list_page.finish_games_stream)
 
         self.game_details_page = GameDetailsPage(self.game_manager)
         self.stacked_widget.addWidget(self.game_details_page)
@@ -68,14 +75,38 @@ class MainWindow(QMainWindow):
         self.back_button.hide()
         self.main_layout.addWidget(self.back_button)
 
+        QApplication.instance().installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseMove,
+                            QEvent.Type.Wheel, QEvent.Type.KeyPress):
+            self.game_manager.notify_user_activity()
+        return super().eventFilter(obj, event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not event.spontaneous():
+            QTimer.singleShot(0, self.game_manager.initialize)
+
+    def _on_game_manager_ready(self):
+        self.scan_button.setEnabled(True)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.ActivationChange and self.isActiveWindow():
+            self.game_manager.on_launcher_activated()
+        super().changeEvent(event)
+
     def _on_scan_started(self):
         self.scan_button.setEnabled(False)
         self.title_label.setText("Scanning games... Please wait.")
 
-    def _on_scan_finished(self, games_list: list):
+    def _on_library_stale(self):
+        self.scan_button.setText("Scan Games (new games found)")
+
+    def _on_scan_finished(self):
         self.scan_button.setEnabled(True)
+        self.scan_button.setText("Scan Games")
         self.title_label.setText("Echo Game Launcher")
-        self.game_list_page.display_games(games_list)
         
         if self.stacked_widget.currentWidget() != self.game_list_page:
             self.stacked_widget.setCurrentWidget(self.game_list_page)
@@ -85,8 +116,8 @@ class MainWindow(QMainWindow):
     def _on_game_launched(self, appid: str):
         print(f"UI подтверждает: Игра {appid} была запущена.")
 
-    def _show_game_details(self, game_info: dict):
-        self.game_details_page.set_game_info(game_info)
+    def _show_game_details(self, game: Game):
+        self.game_details_page.set_game_info(game)
         self.stacked_widget.setCurrentWidget(self.game_details_page)
         self.back_button.show()
 
@@ -107,6 +138,7 @@ class MainWindow(QMainWindow):
         self.game_list_page.scroll_area.updateGeometry()
 
     def closeEvent(self, event):
+        QApplication.instance().removeEventFilter(self)
         self.game_manager.close_db()
         super().closeEvent(event)
         event.accept()
\ No newline at end of file
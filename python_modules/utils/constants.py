@@ -0,0 +1,47 @@
+import os
+
+SCHEDULER_IDLE_DELAY_SECONDS = 30
+MAINTENANCE_INTERVAL_MS = 60 * 60 * 1000
+
+LOOKUP_RETRY_BASE_SECONDS = 60 * 60
+LOOKUP_RETRY_MAX_SECONDS = 30 * 24 * 60 * 60
+
+IGDB_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+IGDB_BATCH_SIZE = 500
+IGDB_NAME_BATCH_SIZE = 100
+
+SCAN_SERVICE_URL = "http://127.0.0.1:8080/scan"
+SCAN_SERVICE_CONNECT_TIMEOUT_SECONDS = 0.5
+SCAN_SERVICE_READ_TIMEOUT_SECONDS = 30
+SCAN_CHECKPOINT_INTERVAL = 50
+COVER_DOWNLOAD_WORKERS = 8
+
+THUMBNAIL_TILE_SIZES = {
+    'thumbnail': (180, 270),
+    'thumbnail@2x': (360, 540),
+}
+
+COVER_ATLAS_ENABLED = True
+
+SESSION_START_TIMEOUT_SECONDS = 120
+SESSION_START_POLL_SECONDS = 2
+SESSION_MIN_POLL_SECONDS = 5
+SESSION_MAX_POLL_SECONDS = 30
+SESSION_FLUSH_INTERVAL_SECONDS = 60
+SESSION_FLUSH_BATCH_SIZE = 16
+
+GALLERY_DIFF_COALESCE_MS = 100
+
+SCROLL_WHEEL_PIXELS_PER_NOTCH = 120
+SCROLL_EASING = 0.25
+SCROLL_DEFAULT_REFRESH_HZ = 60
+# Cover loads are held back while the gallery moves faster than this.
+SCROLL_FAST_PIXELS_PER_FRAME = 40
+
+# Cap for decoded cover pixmaps held by the gallery and details page; override
+# with ECHOGL_PIXMAP_BUDGET_MB on machines with more or less memory to spare.
+PIXMAP_BUDGET_BYTES = int(os.getenv("ECHOGL_PIXMAP_BUDGET_MB", "96")) * 1024 * 1024
+
+TITLE_MATCH_CONFIDENT_SCORE = 0.9
+TITLE_MATCH_MIN_MARGIN = 0.08
+TITLE_MATCH_ACCEPT_SCORE = 0.75
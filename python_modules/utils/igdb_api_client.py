@@ -13,26 +13,62 @@ def get_twitch_access_token(client_id, client_secret):
         print("Getting token error:", response.text)
         return None
     
-def get_igdb_game_info(access_token, client_id, appid):
-    headers = {
+IGDB_GAME_FIELDS = (
+    "fields *, cover.url, genres.name, platforms.name, themes.name, game_modes.name, "
+    "player_perspectives.name, alternative_names.name, involved_companies.company.name, "
+    "involved_companies.developer, involved_companies.publisher;"
+)
+
+def _igdb_headers(access_token, client_id):
+    return {
         'Client-ID': client_id,
         'Authorization': f'Bearer {access_token}'
     }
 
-    query_body = f'fields name,cover.url,genres.name,platforms.name,summary,game.id; where uid = "{appid}" & category = 1;'
+def get_igdb_games_by_ids(access_token, client_id, igdb_ids):
+    if not igdb_ids:
+        return []
+    ids = ",".join(str(int(igdb_id)) for igdb_id in igdb_ids)
+    query_body = f'{IGDB_GAME_FIELDS} where id = ({ids}); limit {len(igdb_ids)};'
+    response = requests.post("https://api.igdb.com/v4/games", headers=_igdb_headers(access_token, client_id),
+                             data=query_body)
+    if response.status_code == 200:
+        return response.json()
+    print("Getting games by id error:", response.text)
+    return None
 
-    response = requests.post("https://api.igdb.com/v4/external_games", headers=headers, data=query_body)
+def get_igdb_ids_by_steam_appids(access_token, client_id, appids):
+    """Maps Steam appids to IGDB game ids through external_games, one request per batch."""
+    if not appids:
+        return {}
+    uids = ",".join(f'"{int(appid)}"' for appid in appids)
+    query_body = f'fields uid,game; where uid = ({uids}) & category = 1; limit {len(appids)};'
+    response = requests.post("https://api.igdb.com/v4/external_games", headers=_igdb_headers(access_token, client_id),
+                             data=query_body)
+    if response.status_code == 200:
+        return {int(entry['uid']): entry['game'] for entry in response.json() if entry.get('game')}
+    print("Getting external games error:", response.text)
+    return None
 
+def get_igdb_games_by_names(access_token, client_id, names):
+    # Exact (case-sensitive) name matches; several games can share a name, hence the wide limit.
+    if not names:
+        return []
+    quoted = ",".join('"' + name.replace('"', '').replace('\\', '') + '"' for name in names)
+    query_body = f'{IGDB_GAME_FIELDS} where name = ({quoted}); limit 500;'
+    response = requests.post("https://api.igdb.com/v4/games", headers=_igdb_headers(access_token, client_id),
+                             data=query_body)
     if response.status_code == 200:
-        external_games = response.json()
-        if external_games and external_games[0].get('game'):
-            return external_games[0]['game']
-        
-    query_body = f'fields name,cover.url,genres.name,platforms.name,summary; search "{appid}"; limit 1;'
-    response = requests.post("https://api.igdb.com/v4/games", headers=headers, data=query_body)
+        return response.json()
+    print("Getting games by name error:", response.text)
+    return None
 
+def search_igdb_games(access_token, client_id, name, limit=10):
+    search_term = name.replace('"', '').replace('\\', '')
+    query_body = f'{IGDB_GAME_FIELDS} search "{search_term}"; limit {limit};'
+    response = requests.post("https://api.igdb.com/v4/games", headers=_igdb_headers(access_token, client_id),
+                             data=query_body)
     if response.status_code == 200:
         return response.json()
-    else:
-        print("Getting game info error:", response.text)
-        return None
+    print("Searching games error:", response.text)
+    return None
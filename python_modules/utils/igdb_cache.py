@@ -0,0 +1,20 @@
+import json
+import zlib
+
+from data.game_record import join_vocabulary
+
+def encode_response(game_info):
+    return zlib.compress(json.dumps(game_info, separators=(',', ':')).encode('utf-8'), 6)
+
+def decode_response(payload):
+    return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+def derive_metadata(game_info):
+    # Every metadata column comes from here, so a new field only needs this and a recompute.
+    return {
+        'igdb_id': game_info.get('id'),
+        'summary': game_info.get('summary'),
+        'genres': join_vocabulary([g['name'] for g in game_info.get('genres', []) if 'name' in g]),
+        'platforms': join_vocabulary([p['name'] for p in game_info.get('platforms', []) if 'name' in p]),
+        'cover_url': (game_info.get('cover') or {}).get('url'),
+    }
@@ -3,83 +3,250 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-from .igdb_api_client import get_twitch_access_token, get_igdb_game_info
+import time
+
+from .igdb_api_client import (
+    get_twitch_access_token, get_igdb_games_by_ids, get_igdb_ids_by_steam_appids, get_igdb_games_by_names,
+    search_igdb_games,
+)
+from .igdb_cache import encode_response, decode_response, derive_metadata
+from .title_matcher import TitleMatcher, lookup_names
+from .constants import IGDB_CACHE_TTL_SECONDS, IGDB_BATCH_SIZE, IGDB_NAME_BATCH_SIZE, TITLE_MATCH_ACCEPT_SCORE
 from data.db_manager import DBManager, get_db_manager
 from core.cover_downloader import CoverDownloader
+from data.game_record import STORE_STEAM
 
-def update_all_games_with_metadata():
-    client_id = os.getenv("TWITCH_CLIENT_ID")
-    client_secret = os.getenv("TWITCH_CLIENT_SECRET")
+def apply_igdb_game_info(db_manager, game, igdb_info, download_cover=True):
+    derived = derive_metadata(igdb_info)
 
-    if not client_id or not client_secret:
-        print("Client ID or Client Secret not found. Check your .env file.")
-        return
+    new_cover_path = game.cover_path
+    if download_cover and derived['cover_url'] and not game.cover_path:
+        print(f"Starting cover download for '{game.name}'...")
+        cover_downloader = CoverDownloader(db_manager=db_manager)
+        new_cover_path = cover_downloader.download_igdb_cover(derived['cover_url'], game.name)
+        print(f"Finished cover download for '{game.name}'.")
 
-    access_token = get_twitch_access_token(client_id, client_secret)
-    if not access_token:
-        print("Cannot get access token. Imposible to update metadata.")
-        return
-    
-    db_manager = get_db_manager()
+    db_manager.update_game_metadata(
+        appid=game.appid,
+        igdb_id=derived['igdb_id'],
+        summary=derived['summary'],
+        genres=derived['genres'],
+        platforms=derived['platforms'],
+        cover_path=new_cover_path,
+    )
 
+def recompute_metadata_from_cache(db_manager=None):
+    # No network calls: every enriched game is re-derived from the local IGDB cache.
+    owns_db_manager = db_manager is None
+    if owns_db_manager:
+        db_manager = get_db_manager()
     try:
+        updated = 0
+        for game in db_manager.get_all_games():
+            if game.igdb_id is None:
+                continue
+            cached = db_manager.get_igdb_response(game.igdb_id)
+            if cached is None:
+                continue
+            apply_igdb_game_info(db_manager, game, decode_response(cached[0]), download_cover=False)
+            updated += 1
+        print(f"Recomputed metadata for {updated} games from the IGDB cache.")
+        return updated
+    finally:
+        if owns_db_manager and db_manager:
+            db_manager.close()
 
-        all_games = db_manager.get_all_games()
+def refresh_stale_igdb_cache(db_manager, access_token, client_id, games):
+    fetch_times = db_manager.get_igdb_fetch_times()
+    cutoff = time.time() - IGDB_CACHE_TTL_SECONDS
+    stale = {game.igdb_id: game for game in games
+             if game.igdb_id is not None and fetch_times.get(game.igdb_id, 0) < cutoff}
+    if not stale:
+        return 0
 
-        for game in all_games:
-            print(f"Game: {game['name']}, IGDB ID from DB: {game.get('igdb_id')}")
-            if game.get('igdb_id') is None:
-                game_name = game['name']
-                print(f"Updating metadata for game '{game_name}'...")
+    print(f"Refreshing {len(stale)} cached IGDB records...")
+    refreshed = 0
+    igdb_ids = list(stale)
+    for start in range(0, len(igdb_ids), IGDB_BATCH_SIZE):
+        batch = igdb_ids[start:start + IGDB_BATCH_SIZE]
+        igdb_infos = get_igdb_games_by_ids(access_token, client_id, batch)
+        if igdb_infos is None:
+            print("Stopping IGDB cache refresh after an API error.")
+            break
+        db_manager.save_igdb_responses([(info['id'], encode_response(info)) for info in igdb_infos])
+        for igdb_info in igdb_infos:
+            game = stale.get(igdb_info['id'])
+            if game is not None:
+                apply_igdb_game_info(db_manager, game, igdb_info)
+                refreshed += 1
+    return refreshed
 
-                print(f"Fetching IGDB info for '{game_name}'...")
+def _candidate_names(igdb_info):
+    yield igdb_info.get('name')
+    for alternative in igdb_info.get('alternative_names', []):
+        if isinstance(alternative, dict):
+            yield alternative.get('name')
 
-                igdb_data_list = get_igdb_game_info(access_token, client_id, game['appid'] )
+def _cached_igdb_records(db_manager):
+    return {igdb_id: decode_response(payload) for igdb_id, payload in db_manager.iter_igdb_responses()}
 
-                print(f"Finished fetching IGDB info for '{game_name}'.")
+def _fetch_and_cache(db_manager, access_token, client_id, igdb_ids, records):
+    """Fetches records missing from the cache; returns the request count, or None on an API error."""
+    missing = [igdb_id for igdb_id in igdb_ids if igdb_id not in records]
+    requests_made = 0
+    for start in range(0, len(missing), IGDB_BATCH_SIZE):
+        requests_made += 1
+        igdb_infos = get_igdb_games_by_ids(access_token, client_id, missing[start:start + IGDB_BATCH_SIZE])
+        if igdb_infos is None:
+            return None
+        db_manager.save_igdb_responses([(info['id'], encode_response(info)) for info in igdb_infos])
+        records.update((info['id'], info) for info in igdb_infos)
+    return requests_made
 
-                if igdb_data_list:
-                    igdb_info = igdb_data_list[0]
+def resolve_igdb_matches(db_manager, access_token, client_id, games, assigned_igdb_ids=(), on_result=None):
+    # Steam appids go through batched external_games lookups. Other titles are
+    # matched against the IGDB cache, then against batched exact-name queries, and
+    # only what is still unmatched costs one search request per game.
+    records = _cached_igdb_records(db_manager)
+    assigned = set(assigned_igdb_ids)
+    matches, failures = {}, {}
+    api_calls = 0
 
-                    igdb_id = igdb_info.get('id')
-                    summary = igdb_info.get('summary')
+    def claim(game, igdb_info):
+        matches[game.appid] = igdb_info
+        assigned.add(igdb_info['id'])
+        if on_result:
+            on_result(game, igdb_info, None)
 
-                    genres_list = [g['name'] for g in igdb_info.get('genres', [])]
-                    platform_list = [p['name'] for p in igdb_info.get('platforms', [])]
+    def fail(game, reason):
+        failures[game.appid] = reason
+        if on_result:
+            on_result(game, None, reason)
 
-                    genres_str = ", ".join(genres_list)
-                    platform_str = ", ".join(platform_list)
+    unresolved = []
+    steam_games = [game for game in games if game.store == STORE_STEAM]
+    for start in range(0, len(steam_games), IGDB_BATCH_SIZE):
+        batch = steam_games[start:start + IGDB_BATCH_SIZE]
+        api_calls += 1
+        igdb_ids = get_igdb_ids_by_steam_appids(access_token, client_id, [game.appid for game in batch])
+        if igdb_ids is None:
+            for game in batch:
+                fail(game, 'api_error')
+            continue
+        fetched = _fetch_and_cache(db_manager, access_token, client_id, list(igdb_ids.values()), records)
+        if fetched is None:
+            for game in batch:
+                fail(game, 'api_error')
+            continue
+        api_calls += fetched
+        for game in batch:
+            igdb_info = records.get(igdb_ids.get(int(game.appid)))
+            if igdb_info and igdb_info['id'] not in assigned:
+                claim(game, igdb_info)
+            else:
+                unresolved.append(game)
+    unresolved.extend(game for game in games if game.store != STORE_STEAM)
 
-                    cover_url = igdb_info.get('cover', {}).get('url')
+    matcher = TitleMatcher((igdb_id, name) for igdb_id, info in records.items() for name in _candidate_names(info))
 
-                    new_cover_path = None
-                    if cover_url and not game.get('cover_path'):
+    def match_locally(pending):
+        local_matches = matcher.match_batch([game.name for game in pending], exclude=assigned)
+        unmatched = []
+        for game in pending:
+            match = local_matches.get(game.name)
+            if match and match.confident and match.igdb_id not in assigned:
+                claim(game, records[match.igdb_id])
+            else:
+                unmatched.append(game)
+        return unmatched
 
-                        print(f"Starting cover download for '{game_name}'...")
+    ambiguous = match_locally(unresolved)
 
-                        cover_downloader = CoverDownloader()
-                        new_cover_path = cover_downloader.download_igdb_cover(cover_url, game['name'])
+    # The cache mostly holds games that are already matched, so it rarely answers
+    # an Epic or GOG title; seed the matcher with exact-name hits for the whole batch.
+    names = list(dict.fromkeys(name for game in ambiguous for name in lookup_names(game.name)))
+    for start in range(0, len(names), IGDB_NAME_BATCH_SIZE):
+        api_calls += 1
+        igdb_infos = get_igdb_games_by_names(access_token, client_id, names[start:start + IGDB_NAME_BATCH_SIZE])
+        if igdb_infos is None:
+            break
+        db_manager.save_igdb_responses([(info['id'], encode_response(info)) for info in igdb_infos])
+        for info in igdb_infos:
+            if info['id'] not in records:
+                records[info['id']] = info
+                for name in _candidate_names(info):
+                    matcher.add(info['id'], name)
+    if names:
+        ambiguous = match_locally(ambiguous)
+    print(f"IGDB matching: {len(matches)} resolved without search, {len(ambiguous)} sent to IGDB search.")
 
-                        print(f"Finished cover download for '{game_name}'.")
+    for game in ambiguous:
+        api_calls += 1
+        results = search_igdb_games(access_token, client_id, game.name)
+        if results is None:
+            fail(game, 'api_error')
+            continue
+        db_manager.save_igdb_responses([(info['id'], encode_response(info)) for info in results])
+        records.update((info['id'], info) for info in results)
+        search_matcher = TitleMatcher((info['id'], name) for info in results for name in _candidate_names(info))
+        match = search_matcher.match(game.name, exclude=assigned)
+        if match and match.score >= TITLE_MATCH_ACCEPT_SCORE:
+            claim(game, records[match.igdb_id])
+        else:
+            fail(game, 'no_igdb_match')
 
-                    db_manager.update_game_metadata(
-                        appid=game['appid'],
-                        igdb_id=igdb_id,
-                        summary=summary,
-                        genres=genres_str,
-                        platforms=platform_str,
-                        cover_path=new_cover_path,
-                    )
+    print(f"IGDB matching finished: {len(matches)} matched, {len(failures)} unmatched, {api_calls} API requests.")
+    return matches, failures
 
-                    updated_game = db_manager.get_game_by_appid(game['appid'])
-                    print(f"After update, {updated_game['name']} has IGDB ID: {updated_game.get('igdb_id')}")
+def update_all_games_with_metadata(db_manager=None):
+    client_id = os.getenv("TWITCH_CLIENT_ID")
+    client_secret = os.getenv("TWITCH_CLIENT_SECRET")
 
-                else:
-                    print(f"Metadata for game '{game_name}' not found.")
+    if not client_id or not client_secret:
+        print("Client ID or Client Secret not found. Check your .env file.")
+        return
+
+    access_token = get_twitch_access_token(client_id, client_secret)
+    if not access_token:
+        print("Cannot get access token. Imposible to update metadata.")
+        return
+    
+    owns_db_manager = db_manager is None
+    if owns_db_manager:
+        db_manager = get_db_manager()
+
+    try:
+
+        all_games = db_manager.get_all_games()
+
+        pending = []
+        for game in all_games:
+            if game.igdb_id is not None:
+                continue
+            if not db_manager.is_lookup_due(game.appid, 'igdb_metadata'):
+                print(f"Skipping '{game.name}': previous IGDB lookup failed, retry is not due yet.")
+                continue
+            pending.append(game)
+        print(f"Updating metadata for {len(pending)} games...")
+
+        # Each result is written as soon as it is known: an interrupted run leaves
+        # matched games enriched and failed ones backed off, so the next run only
+        # looks at what was never decided.
+        def store_result(game, igdb_info, failure_reason):
+            if igdb_info:
+                apply_igdb_game_info(db_manager, game, igdb_info)
+                db_manager.clear_lookup_failure(game.appid, 'igdb_metadata')
+                print(f"After update, {game.name} has IGDB ID: {igdb_info['id']}")
             else:
-                print(f"Metadata for game '{game['name']}'already exists.")
+                db_manager.record_lookup_failure(game.appid, 'igdb_metadata', failure_reason)
+                print(f"Metadata for game '{game.name}' not found.")
+
+        assigned = {game.igdb_id for game in all_games if game.igdb_id is not None}
+        resolve_igdb_matches(db_manager, access_token, client_id, pending, assigned, on_result=store_result)
+
+        refresh_stale_igdb_cache(db_manager, access_token, client_id, db_manager.get_all_games())
     finally:
-        if db_manager:
+        if owns_db_manager and db_manager:
             db_manager.close()
 
 if __name__ == "__main__":
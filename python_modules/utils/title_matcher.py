@@ -0,0 +1,137 @@
+import re
+import unicodedata
+
+from utils.constants import TITLE_MATCH_CONFIDENT_SCORE, TITLE_MATCH_MIN_MARGIN
+
+_TRADEMARKS = re.compile(r"[™®©]|\((?:tm|r|c)\)", re.IGNORECASE)
+_APOSTROPHES = re.compile(r"['\u2019`]")
+_EDITION_KEYWORDS = (
+    r"game of the year|goty|definitive|deluxe|digital deluxe|complete|ultimate|enhanced|special|"
+    r"anniversary|legendary|gold|premium|standard|collector'?s|remastered|remaster|redux|hd"
+)
+_EDITION_SUFFIX = re.compile(
+    r"(?:\s*[-:\u2013\u2014(]?\s*(?:" + _EDITION_KEYWORDS + r")(?:\s+edition)?"
+    r"|\s*[-:\u2013\u2014(]?\s*(?:director'?s|final)\s+cut)\)?\s*$"
+)
+_EDITION_SUFFIX_ANY_CASE = re.compile(_EDITION_SUFFIX.pattern, re.IGNORECASE)
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+# A lone "x" is left alone: "Mega Man X" is not "Mega Man 10", and "X-2" is not "10-2".
+_NUMBER_WORDS = {
+    'ii': '2', 'iii': '3', 'iv': '4', 'v': '5', 'vi': '6', 'vii': '7', 'viii': '8', 'ix': '9',
+    'one': '1', 'two': '2', 'three': '3', 'four': '4', 'five': '5',
+    'six': '6', 'seven': '7', 'eight': '8', 'nine': '9', 'ten': '10',
+}
+
+def normalize_title(title):
+    # "The Witcher® 3: Wild Hunt – Game of the Year Edition" becomes "witcher 3 wild hunt".
+    if not title:
+        return ""
+    text = unicodedata.normalize('NFKD', _TRADEMARKS.sub("", title))
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = _APOSTROPHES.sub("", text).replace("&", " and ")
+    while True:
+        stripped = _EDITION_SUFFIX.sub("", text)
+        if stripped == text or not stripped.strip():
+            break
+        text = stripped
+    words = [_NUMBER_WORDS.get(word, word) for word in _NON_ALNUM.sub(" ", text).split()]
+    if len(words) > 1 and words[0] == 'the':
+        words = words[1:]
+    return " ".join(words)
+
+def lookup_names(title):
+    # Spellings worth an exact-name query on IGDB: the store title without trademark
+    # signs, and the same title with its edition suffix cut off.
+    name = " ".join(_TRADEMARKS.sub("", title or "").split())
+    names = [name] if name else []
+    while name:
+        stripped = _EDITION_SUFFIX_ANY_CASE.sub("", name).rstrip(" -:\u2013\u2014")
+        if stripped == name or not stripped:
+            break
+        name = stripped
+        names.append(name)
+    return names
+
+def _trigrams(normalized):
+    padded = f"  {normalized} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+def _numbers(normalized):
+    # Kept in order and with repeats, so "x x 2" (X/X-2) differs from "x 2" (X-2).
+    return tuple(word for word in normalized.split() if word.isdigit() or word == 'x')
+
+class TitleMatch:
+    __slots__ = ('igdb_id', 'score', 'confident')
+
+    def __init__(self, igdb_id, score, confident):
+        self.igdb_id = igdb_id
+        self.score = score
+        self.confident = confident
+
+class TitleMatcher:
+    """Matches titles against a candidate set through a trigram inverted index."""
+
+    def __init__(self, candidates=()):
+        self._names = []
+        self._trigram_sets = []
+        self._numbers = []
+        self._igdb_ids = []
+        self._index = {}
+        for igdb_id, name in candidates:
+            self.add(igdb_id, name)
+
+    def __len__(self):
+        return len(self._igdb_ids)
+
+    def add(self, igdb_id, name):
+        normalized = normalize_title(name)
+        if not normalized:
+            return
+        position = len(self._igdb_ids)
+        trigrams = _trigrams(normalized)
+        self._igdb_ids.append(igdb_id)
+        self._names.append(normalized)
+        self._trigram_sets.append(trigrams)
+        self._numbers.append(_numbers(normalized))
+        for trigram in trigrams:
+            self._index.setdefault(trigram, []).append(position)
+
+    def candidates(self, title, limit=5):
+        """Returns (igdb_id, score) pairs for the best candidates, highest score first."""
+        normalized = normalize_title(title)
+        if not normalized:
+            return []
+        query = _trigrams(normalized)
+        query_numbers = _numbers(normalized)
+
+        shared = {}
+        for trigram in query:
+            for position in self._index.get(trigram, ()):
+                shared[position] = shared.get(position, 0) + 1
+
+        best = {}
+        for position, count in shared.items():
+            score = 2 * count / (len(query) + len(self._trigram_sets[position]))
+            if self._names[position] == normalized:
+                score = 1.0
+            elif self._numbers[position] != query_numbers:
+                # "Dark Souls 2" and "Dark Souls 3" share almost every trigram.
+                score *= 0.5
+            igdb_id = self._igdb_ids[position]
+            if score > best.get(igdb_id, 0):
+                best[igdb_id] = score
+        return sorted(best.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def match(self, title, exclude=()):
+        ranked = [(igdb_id, score) for igdb_id, score in self.candidates(title, limit=5 + len(exclude))
+                  if igdb_id not in exclude]
+        if not ranked:
+            return None
+        igdb_id, score = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        confident = score >= TITLE_MATCH_CONFIDENT_SCORE and score - runner_up >= TITLE_MATCH_MIN_MARGIN
+        return TitleMatch(igdb_id, score, confident)
+
+    def match_batch(self, titles, exclude=()):
+        """Matches many titles in memory; returns {title: TitleMatch or None}."""
+        return {title: self.match(title, exclude) for title in titles}